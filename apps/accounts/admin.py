@@ -43,6 +43,9 @@ class StudentProfileAdmin(admin.ModelAdmin):
     
     # Use raw_id_fields for related user field for performance when many users exist
     raw_id_fields = ('user', 'verified_by')
+    list_select_related = ('user',)
+    # Skip the unfiltered COUNT(*) shown next to filtered results
+    show_full_result_count = False
 
     # Organize the detail page layout using fieldsets
     fieldsets = (
@@ -103,6 +106,7 @@ class ElectionAdminAdmin(admin.ModelAdmin):
         'employee_id',
     )
     raw_id_fields = ('user',)
+    list_select_related = ('user',)
     
     fieldsets = (
         ('User Account', {
@@ -0,0 +1,85 @@
+"""
+Voter demographics.
+
+Registration counts by course and year level - total, per verification
+status and eligible to vote - come from one grouped query with conditional
+aggregates; the summary and the per-course and per-year breakdowns are
+rolled up from its rows in Python. The result is cached until a voter
+changes and is shared by the demographics PDF, the dashboard and the
+demographics export.
+"""
+from django.db.models import Count, Q
+
+from apps.core.cache import VOTERS, versioned_key
+from apps.core.services.single_flight import single_flight
+
+from .models import Course, StudentProfile, YearLevel
+
+DEMOGRAPHICS_TTL = 300
+
+# Counted for every (course, year level) group
+MEASURES = ('total', 'verified', 'pending', 'rejected', 'eligible')
+
+# Columns of the CSV export, in order
+EXPORT_FIELDS = ('course', 'course_label', 'year_level', 'year_level_label') + MEASURES
+
+NOT_SET = 'Not set'
+
+
+def _measures():
+    Status = StudentProfile.VerificationStatus
+    return {
+        'total': Count('id'),
+        'verified': Count('id', filter=Q(verification_status=Status.VERIFIED)),
+        'pending': Count('id', filter=Q(verification_status=Status.PENDING)),
+        'rejected': Count('id', filter=Q(verification_status=Status.REJECTED)),
+        'eligible': Count('id', filter=Q(is_eligible_to_vote=True)),
+    }
+
+
+def _rollup(rows, field, choices):
+    """Sum ``rows`` by ``field``: every choice (zero if absent), then any other value found."""
+    labels = dict(choices.choices)
+    totals = {value: dict.fromkeys(MEASURES, 0) for value in labels}
+    for row in rows:
+        counts = totals.setdefault(row[field], dict.fromkeys(MEASURES, 0))
+        for measure in MEASURES:
+            counts[measure] += row[measure]
+    return [
+        {field: value, 'label': labels.get(value, NOT_SET if value in (None, '') else str(value)), **counts}
+        for value, counts in totals.items()
+    ]
+
+
+def _compute():
+    rows = list(
+        StudentProfile.objects
+        .values('course', 'year_level')
+        .annotate(**_measures())
+        .order_by('course', 'year_level')
+    )
+    course_labels = dict(Course.choices)
+    year_labels = dict(YearLevel.choices)
+    for row in rows:
+        row['course_label'] = course_labels.get(row['course'], NOT_SET)
+        row['year_level_label'] = year_labels.get(row['year_level'], NOT_SET)
+
+    return {
+        'summary': {measure: sum(row[measure] for row in rows) for measure in MEASURES},
+        'by_course': _rollup(rows, 'course', Course),
+        'by_year_level': _rollup(rows, 'year_level', YearLevel),
+        'rows': rows,
+    }
+
+
+def voter_demographics():
+    """
+    Registration counts of all students::
+
+        {'summary': {total, verified, pending, rejected, eligible},
+         'by_course': [{course, label, <measures>}, ...],
+         'by_year_level': [{year_level, label, <measures>}, ...],
+         'rows': [{course, course_label, year_level, year_level_label, <measures>}, ...]}
+    """
+    key, _ = versioned_key('voters:demographics', [VOTERS])
+    return single_flight(key, _compute, DEMOGRAPHICS_TTL)
@@ -0,0 +1,413 @@
+"""
+Bulk voter import from registrar CSV/XLSX files.
+
+An import runs in two passes:
+
+1. :func:`validate_file` streams the file, validates every row and checks
+   ``student_id``/username/email against the file itself and, in bulk,
+   against the existing indexes (one query per chunk and key, not per row).
+2. :func:`import_voters` inserts the valid rows chunk by chunk: users and
+   profiles are written with ``bulk_create`` (or ``COPY`` on PostgreSQL)
+   in one transaction per chunk, together with their search index rows;
+   the voter caches are invalidated as each chunk commits.
+
+Passwords are either taken from a ``password`` column and hashed in a
+process pool, or left unusable so students set their own through the
+account setup email.
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from apps.core.cache import VOTERS, bump_version_on_commit
+from .models import Course, Section, StudentProfile
+from .search import index_profiles
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+REQUIRED_COLUMNS = ('student_id', 'first_name', 'last_name', 'email', 'course', 'year_level')
+OPTIONAL_COLUMNS = ('username', 'middle_name', 'section', 'is_eligible_to_vote', 'password')
+
+DEFAULT_CHUNK_SIZE = 1000
+
+PASSWORD_UNUSABLE = 'unusable'
+PASSWORD_COLUMN = 'column'
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+
+class VoterImportError(Exception):
+    """Raised when an import file cannot be read at all."""
+
+
+class ImportReport:
+    """Outcome of the validation pass (and, after importing, the insert)."""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.rows = []
+        self.errors = []
+        self.created = 0
+
+    @property
+    def valid_count(self):
+        return len(self.rows)
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+# ----------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------
+
+def read_rows(fileobj, filename):
+    """
+    Yield ``(line_number, row_dict)`` from a CSV or XLSX upload without
+    loading the whole file. Header names are normalised to lowercase
+    snake_case.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.xlsx':
+        yield from _read_xlsx(fileobj)
+    elif extension in ('.csv', '.txt'):
+        yield from _read_csv(fileobj)
+    else:
+        raise VoterImportError(f"Unsupported file type '{extension}'. Upload a .csv or .xlsx file.")
+
+
+def _normalise_header(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def _check_header(header):
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise VoterImportError(f"Missing required column(s): {', '.join(missing)}")
+
+
+def _read_csv(fileobj):
+    if 'b' in getattr(fileobj, 'mode', 'rb'):
+        fileobj = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(fileobj)
+    try:
+        header = [_normalise_header(name) for name in next(reader)]
+    except StopIteration:
+        raise VoterImportError('The file is empty.')
+    _check_header(header)
+    for line, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, dict(zip(header, values))
+
+
+def _read_xlsx(fileobj):
+    if not OPENPYXL_AVAILABLE:
+        raise VoterImportError('XLSX import requires openpyxl. Upload a CSV file instead.')
+    workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        try:
+            header = [_normalise_header(name) for name in next(rows)]
+        except StopIteration:
+            raise VoterImportError('The file is empty.')
+        _check_header(header)
+        for line, values in enumerate(rows, start=2):
+            values = ['' if value is None else str(value) for value in values]
+            if not any(value.strip() for value in values):
+                continue
+            yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+# ----------------------------------------------------------------------
+# Validation (first pass)
+# ----------------------------------------------------------------------
+
+_username_validator = UnicodeUsernameValidator()
+_courses = set(Course.values)
+_sections = set(Section.values)
+
+
+def _clean_row(raw):
+    """Return ``(row, errors)`` for one raw row."""
+    def value(name):
+        return str(raw.get(name) or '').strip()
+
+    errors = []
+
+    row = {
+        'student_id': value('student_id'),
+        'first_name': value('first_name'),
+        'last_name': value('last_name'),
+        'middle_name': value('middle_name') or None,
+        'email': value('email').lower(),
+        'course': value('course').upper(),
+        'section': value('section').upper() or None,
+        'password': value('password'),
+    }
+    row['username'] = value('username') or row['student_id']
+
+    for name in REQUIRED_COLUMNS:
+        if name != 'year_level' and not row[name]:
+            errors.append(f'{name} is required')
+
+    if len(row['student_id']) > 30:
+        errors.append('student_id is longer than 30 characters')
+    if row['username']:
+        try:
+            _username_validator(row['username'])
+        except ValidationError:
+            errors.append(f"invalid username '{row['username']}'")
+    if row['email']:
+        try:
+            validate_email(row['email'])
+        except ValidationError:
+            errors.append(f"invalid email '{row['email']}'")
+    if row['course'] and row['course'] not in _courses:
+        errors.append(f"unknown course '{row['course']}'")
+    if row['section'] and row['section'] not in _sections:
+        errors.append(f"unknown section '{row['section']}'")
+    if row['middle_name'] and len(row['middle_name']) > 50:
+        errors.append('middle_name is longer than 50 characters')
+    for name in ('first_name', 'last_name'):
+        if len(row[name]) > 150:
+            errors.append(f'{name} is longer than 150 characters')
+
+    try:
+        row['year_level'] = int(float(value('year_level')))
+        if not 1 <= row['year_level'] <= 5:
+            raise ValueError
+    except ValueError:
+        errors.append(f"year_level must be 1-5, got '{value('year_level')}'")
+
+    eligible = value('is_eligible_to_vote').lower()
+    if not eligible or eligible in TRUE_VALUES:
+        row['is_eligible_to_vote'] = True
+    elif eligible in FALSE_VALUES:
+        row['is_eligible_to_vote'] = False
+    else:
+        errors.append(f"is_eligible_to_vote must be yes/no, got '{eligible}'")
+
+    return row, errors
+
+
+def validate_file(fileobj, filename, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    First pass: validate every row and detect duplicates, both within the
+    file and against existing accounts. Returns an :class:`ImportReport`.
+    """
+    report = ImportReport()
+    seen = {'student_id': {}, 'username': {}, 'email': {}}
+
+    for line, raw in read_rows(fileobj, filename):
+        report.total_rows += 1
+        row, errors = _clean_row(raw)
+        for key, lines in seen.items():
+            value = row[key].lower() if row[key] else ''
+            if not value:
+                continue
+            if value in lines:
+                errors.append(f"duplicate {key} '{row[key]}' (also on line {lines[value]})")
+            else:
+                lines[value] = line
+        if errors:
+            report.add_error(line, '; '.join(errors))
+        else:
+            row['line'] = line
+            report.rows.append(row)
+        if progress and report.total_rows % chunk_size == 0:
+            progress('validate', report.total_rows, None)
+
+    _find_existing(report, chunk_size)
+    report.errors.sort()
+    return report
+
+
+def _find_existing(report, chunk_size):
+    """Flag rows whose student_id, username or email is already registered."""
+    clashes = {}
+    for start in range(0, len(report.rows), chunk_size):
+        chunk = report.rows[start:start + chunk_size]
+        student_ids = StudentProfile.objects.filter(
+            student_id__in=[row['student_id'] for row in chunk]
+        ).values_list('student_id', flat=True)
+        usernames = User.objects.filter(
+            username__in=[row['username'] for row in chunk]
+        ).values_list('username', flat=True)
+        # Served by the Lower('email') index of accounts migration 0005
+        emails = User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=[row['email'] for row in chunk]
+        ).values_list('email_lower', flat=True)
+
+        taken = {
+            'student_id': set(student_ids),
+            'username': set(usernames),
+            'email': set(emails),
+        }
+        for row in chunk:
+            for key, values in taken.items():
+                if row[key] in values:
+                    clashes.setdefault(row['line'], []).append(f"{key} '{row[key]}' is already registered")
+
+    if clashes:
+        for line, messages in clashes.items():
+            report.add_error(line, '; '.join(messages))
+        report.rows = [row for row in report.rows if row['line'] not in clashes]
+
+
+# ----------------------------------------------------------------------
+# Insert (second pass)
+# ----------------------------------------------------------------------
+
+def _hash_passwords(passwords):
+    return [make_password(password) if password else make_password(None) for password in passwords]
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    Hash initial passwords, spreading the work over ``workers`` processes.
+    Each hash is deliberately slow, so this dominates imports that carry
+    passwords.
+    """
+    if workers <= 1 or len(passwords) < 2:
+        return _hash_passwords(passwords)
+    batch = max(1, len(passwords) // (workers * 4))
+    batches = [passwords[i:i + batch] for i in range(0, len(passwords), batch)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return [hashed for result in pool.map(_hash_passwords, batches) for hashed in result]
+
+
+def import_voters(report, chunk_size=DEFAULT_CHUNK_SIZE, password_mode=PASSWORD_UNUSABLE,
+                  workers=1, imported_by=None, use_copy=None, progress=None):
+    """
+    Insert the valid rows of ``report`` in chunks. Each chunk commits on its
+    own, so an interrupted import can be resumed by re-running it with
+    invalid (already imported) rows skipped.
+
+    Returns the list of created ``User`` ids.
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == 'postgresql'
+    now = timezone.now()
+    total = len(report.rows)
+    user_ids = []
+
+    for start in range(0, total, chunk_size):
+        chunk = report.rows[start:start + chunk_size]
+        if password_mode == PASSWORD_COLUMN:
+            passwords = hash_passwords([row['password'] for row in chunk], workers)
+        else:
+            passwords = [make_password(None) for _ in chunk]
+
+        with transaction.atomic():
+            ids = _insert_users(chunk, passwords, now, use_copy)
+            _insert_profiles(chunk, ids, now, imported_by, use_copy)
+            profiles = StudentProfile.objects.filter(user_id__in=ids.values())
+            index_profiles(profiles, batch_size=chunk_size)
+            bump_version_on_commit(VOTERS)
+
+        user_ids.extend(ids.values())
+        report.created += len(chunk)
+        if progress:
+            progress('import', report.created, total)
+
+    return user_ids
+
+
+def _insert_users(chunk, passwords, now, use_copy):
+    """Insert one chunk of users; returns ``{username: user_id}``."""
+    if use_copy:
+        columns = ('password', 'is_superuser', 'username', 'first_name', 'last_name',
+                   'email', 'is_staff', 'is_active', 'date_joined')
+        _copy(User._meta.db_table, columns, (
+            (password, False, row['username'], row['first_name'], row['last_name'],
+             row['email'], False, True, now)
+            for row, password in zip(chunk, passwords)
+        ), not_null=('password', 'username', 'first_name', 'last_name', 'email'))
+    else:
+        User.objects.bulk_create([
+            User(username=row['username'], first_name=row['first_name'], last_name=row['last_name'],
+                 email=row['email'], password=password, date_joined=now)
+            for row, password in zip(chunk, passwords)
+        ])
+    return dict(
+        User.objects.filter(username__in=[row['username'] for row in chunk]).values_list('username', 'pk'))
+
+
+def _insert_profiles(chunk, user_ids, now, imported_by, use_copy):
+    verified_by_id = imported_by.pk if imported_by else None
+    if use_copy:
+        columns = ('user_id', 'year_level', 'course', 'section', 'is_eligible_to_vote',
+                   'verification_status', 'verified_at', 'verified_by_id', 'student_id',
+                   'middle_name', 'date_enrolled', 'created_at', 'updated_at')
+        _copy(StudentProfile._meta.db_table, columns, (
+            (user_ids[row['username']], row['year_level'], row['course'], row['section'],
+             row['is_eligible_to_vote'], StudentProfile.VerificationStatus.VERIFIED, now,
+             verified_by_id, row['student_id'], row['middle_name'], None, now, now)
+            for row in chunk
+        ), not_null=('course', 'verification_status'))
+    else:
+        StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user_id=user_ids[row['username']], student_id=row['student_id'],
+                year_level=row['year_level'], course=row['course'], section=row['section'],
+                middle_name=row['middle_name'], is_eligible_to_vote=row['is_eligible_to_vote'],
+                verification_status=StudentProfile.VerificationStatus.VERIFIED,
+                verified_at=now, verified_by_id=verified_by_id,
+            )
+            for row in chunk
+        ])
+
+
+def _copy(table, columns, rows, not_null=()):
+    """Stream rows into ``table`` with PostgreSQL ``COPY ... FROM STDIN``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            '' if value is None else ('t' if value is True else 'f' if value is False else value)
+            for value in row
+        ])
+    buffer.seek(0)
+
+    options = 'FORMAT csv'
+    if not_null:
+        # Unquoted empty fields are NULL in CSV COPY; keep them '' for text columns
+        options += f", FORCE_NOT_NULL ({', '.join(not_null)})"
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH ({options})"
+
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):
+            # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:
+            # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
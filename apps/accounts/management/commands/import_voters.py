@@ -0,0 +1,109 @@
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts import importer
+from apps.administration import audit
+from apps.core.services.email_service import EmailService
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import voters from a registrar CSV/XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with one student per row')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file and report problems without importing anything'
+        )
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help='Import the valid rows even if some rows fail validation '
+                 '(also resumes an interrupted import)'
+        )
+        parser.add_argument(
+            '--passwords',
+            choices=[importer.PASSWORD_UNUSABLE, importer.PASSWORD_COLUMN],
+            default=importer.PASSWORD_UNUSABLE,
+            help='"unusable": students set a password via the setup email (default); '
+                 '"column": hash the password column'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes used to hash passwords with --passwords=column'
+        )
+        parser.add_argument(
+            '--send-emails',
+            action='store_true',
+            help='Email every imported student a link to set their password'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=importer.DEFAULT_CHUNK_SIZE,
+            help='Rows inserted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Use bulk_create even on PostgreSQL instead of COPY'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        self.stdout.write(f'Validating {path}...')
+        try:
+            with open(path, 'rb') as fileobj:
+                report = importer.validate_file(
+                    fileobj, path, chunk_size=options['chunk_size'], progress=self.progress)
+        except importer.VoterImportError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'{report.total_rows} rows read, {report.valid_count} valid, {len(report.errors)} invalid.')
+        for line, message in report.errors[:50]:
+            self.stdout.write(self.style.WARNING(f'  line {line}: {message}'))
+        if len(report.errors) > 50:
+            self.stdout.write(self.style.WARNING(f'  ... and {len(report.errors) - 50} more'))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('Dry run: nothing was imported.'))
+            return
+        if report.errors and not options['skip_invalid']:
+            raise CommandError('Fix the rows above or re-run with --skip-invalid.')
+        if not report.rows:
+            self.stdout.write('Nothing to import.')
+            return
+
+        user_ids = importer.import_voters(
+            report,
+            chunk_size=options['chunk_size'],
+            password_mode=options['passwords'],
+            workers=options['workers'],
+            use_copy=False if options['no_copy'] else None,
+            progress=self.progress,
+        )
+
+        audit.record(
+            'VOTERS_IMPORTED',
+            f'Imported {report.created} voters from {os.path.basename(path)} (command line)',
+        )
+        self.stdout.write(self.style.SUCCESS(f'Imported {report.created} voters.'))
+
+        if options['send_emails']:
+            sent = EmailService.send_account_setup_emails(
+                User.objects.filter(pk__in=user_ids).iterator(), async_send=False)
+            self.stdout.write(f'Queued {sent} account setup emails.')
+
+    def progress(self, phase, done, total):
+        if total:
+            self.stdout.write(f'  {phase}: {done}/{total} ({done * 100 // total}%)')
+        else:
+            self.stdout.write(f'  {phase}: {done} rows')
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.search import index_profiles, search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized voter search index (e.g. after bulk imports or raw SQL edits)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Profiles indexed per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Rebuilding voter search index ({search_backend()} backend)...')
+        count = index_profiles(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} student profiles.'))
@@ -0,0 +1,92 @@
+# Generated by Django 5.1.3 on 2026-10-19 06:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = 'accounts_studentsearchindex_fts'
+INDEX_TABLE = 'accounts_studentsearchindex'
+TRIGRAM_INDEX = 'accounts_search_document_trgm'
+
+
+def create_search_indexes(apps, schema_editor):
+    """Backend-specific full-text indexes over the search document."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX {TRIGRAM_INDEX} ON {INDEX_TABLE} USING gin (document gin_trgm_ops)')
+    elif vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    f"document, content='{INDEX_TABLE}', content_rowid='student_profile_id')")
+            except Exception:
+                # SQLite built without FTS5: search falls back to substring matching
+                return
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {INDEX_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.student_profile_id, new.document); END")
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {INDEX_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+            f"VALUES ('delete', old.student_profile_id, old.document); END")
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {INDEX_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+            f"VALUES ('delete', old.student_profile_id, old.document); "
+            f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.student_profile_id, new.document); END")
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def populate_search_index(apps, schema_editor):
+    StudentProfile = apps.get_model('accounts', 'StudentProfile')
+    StudentSearchIndex = apps.get_model('accounts', 'StudentSearchIndex')
+
+    batch = []
+    for profile in StudentProfile.objects.select_related('user').order_by('pk').iterator(chunk_size=1000):
+        user = profile.user
+        parts = [
+            user.username, user.first_name, profile.middle_name, user.last_name,
+            user.email, profile.student_id, profile.course,
+        ]
+        batch.append(StudentSearchIndex(
+            student_profile_id=profile.pk,
+            document=' '.join(str(part) for part in parts if part).lower()))
+        if len(batch) >= 1000:
+            StudentSearchIndex.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        StudentSearchIndex.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_studentprofile_verification_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchIndex',
+            fields=[
+                ('student_profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_index', serialize=False, to='accounts.studentprofile')),
+                ('document', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Student Search Index',
+                'verbose_name_plural': 'Student Search Index',
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# Duplicate checks of voter imports look emails up case-insensitively
+# (apps.accounts.importer); auth.User is not ours, so the index is added here
+EMAIL_LOWER_INDEX = models.Index(Lower('email'), name='auth_user_email_lower_idx')
+
+
+def add_email_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('auth', 'User'), EMAIL_LOWER_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('auth', 'User'), EMAIL_LOWER_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_studentsearchindex'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
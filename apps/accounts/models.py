@@ -101,6 +101,31 @@ class StudentProfile(models.Model):
         return f"{self.user.get_full_name()} ({self.get_course_display()} {self.get_year_level_display()} {section_display})".strip()
 
 
+# ----------------------------------------------------------------------
+# 1a. Student Search Index (Denormalized)
+# ----------------------------------------------------------------------
+class StudentSearchIndex(models.Model):
+    """
+    One lowercased text document per student (username, names, email,
+    student ID, course) so searches hit a single indexed column instead of
+    scanning ``auth_user`` and ``StudentProfile``. Kept in sync by signals;
+    see ``apps.accounts.search`` for the backend-specific indexes.
+    """
+    student_profile = models.OneToOneField(
+        StudentProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index'
+    )
+    document = models.TextField(blank=True, default='')
+
+    class Meta:
+        verbose_name = 'Student Search Index'
+        verbose_name_plural = 'Student Search Index'
+
+    def __str__(self):
+        return f"Search index for profile {self.student_profile_id}"
+
 # ----------------------------------------------------------------------
 # 2. Election Administrator Model (Combined Definition)
 # ----------------------------------------------------------------------
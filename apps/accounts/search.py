@@ -0,0 +1,170 @@
+"""
+Indexed voter search.
+
+Every student has a denormalized ``StudentSearchIndex`` row holding one
+lowercased document (username, names, email, student ID, course). Searches
+run against that single column through the best index the database offers:
+
+* PostgreSQL - a ``pg_trgm`` GIN index on the document; matches are
+  ``LIKE`` substring tests (served by the trigram index) ranked by trigram
+  similarity.
+* SQLite - an FTS5 external-content table mirroring the document (kept in
+  step by triggers); matches are token-prefix queries ranked by BM25.
+* Anything else - substring matches on the document, ordered by student ID.
+
+The indexes are created by migration ``accounts.0004``. Index rows are
+maintained by the signals in ``apps.accounts.signals``; bulk writes that
+bypass signals should call :func:`index_profiles` afterwards.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import StudentProfile, StudentSearchIndex
+
+FTS_TABLE = 'accounts_studentsearchindex_fts'
+
+DEFAULT_LIMIT = 10
+
+_fts_available = None
+
+
+def build_document(profile):
+    """Return the search document for a profile (its user must be loaded)."""
+    user = profile.user
+    parts = [
+        user.username, user.first_name, profile.middle_name, user.last_name,
+        user.email, profile.student_id, profile.course,
+    ]
+    return ' '.join(str(part) for part in parts if part).lower()
+
+
+def index_profile(profile):
+    """Create or refresh the search index row for one profile."""
+    StudentSearchIndex.objects.update_or_create(
+        student_profile_id=profile.pk, defaults={'document': build_document(profile)})
+
+
+def index_profiles(queryset=None, batch_size=1000):
+    """
+    (Re)build index rows for ``queryset`` (all profiles by default) in
+    batches. Returns the number of profiles indexed.
+    """
+    if queryset is None:
+        queryset = StudentProfile.objects.all()
+    queryset = queryset.select_related('user').order_by('pk')
+
+    count = 0
+    batch = []
+    for profile in queryset.iterator(chunk_size=batch_size):
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            count += _write_batch(batch)
+            batch = []
+    if batch:
+        count += _write_batch(batch)
+    return count
+
+
+def _write_batch(profiles):
+    # Delete + insert keeps the FTS triggers and the trigram index in step
+    # without one UPDATE per row
+    ids = [profile.pk for profile in profiles]
+    StudentSearchIndex.objects.filter(student_profile_id__in=ids).delete()
+    StudentSearchIndex.objects.bulk_create([
+        StudentSearchIndex(student_profile_id=profile.pk, document=build_document(profile))
+        for profile in profiles
+    ])
+    return len(profiles)
+
+
+def search_backend():
+    """Name of the search strategy in use: 'postgresql', 'fts5' or 'basic'."""
+    global _fts_available
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        if _fts_available is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                _fts_available = cursor.fetchone() is not None
+        if _fts_available:
+            return 'fts5'
+    return 'basic'
+
+
+def _terms(query):
+    return [term.lower() for term in query.split()]
+
+
+def _fts_match(terms):
+    """
+    Build an FTS5 MATCH expression: every whitespace-separated term must
+    appear as a token prefix. Punctuation inside a term ("2024-0001",
+    "jane@school.edu") becomes a phrase of its word tokens.
+    """
+    phrases = []
+    for term in terms:
+        words = re.findall(r'\w+', term)
+        if words:
+            phrases.append('"%s"*' % ' '.join(words))
+    return ' '.join(phrases)
+
+
+def filter_profiles(queryset, query):
+    """
+    Restrict a ``StudentProfile`` queryset to rows matching ``query``
+    without changing its ordering, so it composes with other filters and
+    pagination.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset
+
+    if search_backend() == 'fts5':
+        match = _fts_match(terms)
+        if not match:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_index__document__contains=term)
+    return queryset.filter(condition)
+
+
+def search_profiles(query, limit=DEFAULT_LIMIT, queryset=None):
+    """
+    Return up to ``limit`` profiles matching ``query``, best match first.
+
+    ``queryset`` narrows the candidates (e.g. only eligible students).
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    if queryset is None:
+        queryset = StudentProfile.objects.all()
+    queryset = filter_profiles(queryset.select_related('user'), query)
+
+    backend = search_backend()
+    if backend == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        queryset = queryset.annotate(
+            rank=TrigramSimilarity('search_index__document', query.lower())
+        ).order_by('-rank', 'student_id', 'pk')
+    elif backend == 'fts5':
+        # BM25 rank of this row for the same MATCH (lower is better)
+        rank = RawSQL(
+            f'SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = {StudentProfile._meta.db_table}.id',
+            [_fts_match(terms)],
+        )
+        queryset = queryset.annotate(rank=rank).order_by('rank', 'student_id', 'pk')
+    else:
+        queryset = queryset.order_by('student_id', 'pk')
+    return list(queryset[:limit])
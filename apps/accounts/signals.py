@@ -0,0 +1,35 @@
+"""
+Cache invalidation and search indexing for voter data.
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.cache import VOTERS, bump_version_on_commit
+from .models import StudentProfile
+from .search import index_profile
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+def student_profile_changed(sender, instance, **kwargs):
+    bump_version_on_commit(VOTERS)
+
+
+@receiver(post_save, sender=StudentProfile)
+def index_student_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_profile(instance)
+
+
+@receiver(post_save, sender=User)
+def index_student_user(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    # A new user has no profile yet; logins only touch last_login, which is
+    # not part of the document
+    if raw or created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    try:
+        profile = instance.student_profile
+    except StudentProfile.DoesNotExist:
+        return
+    index_profile(profile)
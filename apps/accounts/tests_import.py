@@ -0,0 +1,126 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from apps.accounts import importer
+from apps.accounts.models import StudentProfile
+from apps.accounts.search import search_profiles
+from apps.administration.models import AuditLog
+
+HEADER = 'student_id,first_name,last_name,email,course,year_level,section,password\n'
+
+
+def csv_file(*rows):
+    return io.BytesIO((HEADER + ''.join(row + '\n' for row in rows)).encode())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class VoterImportTests(TestCase):
+    def setUp(self):
+        existing = User.objects.create_user(username='2023-0001', email='taken@school.edu')
+        StudentProfile.objects.create(user=existing, student_id='2023-0001', year_level=2, course='BSIT')
+
+    def test_validation_reports_row_errors(self):
+        report = importer.validate_file(csv_file(
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1,A,',
+            '2024-0002,,Smith,not-an-email,BSXX,9,,',
+        ), 'voters.csv')
+        self.assertEqual(report.total_rows, 2)
+        self.assertEqual(report.valid_count, 1)
+        line, message = report.errors[0]
+        self.assertEqual(line, 3)
+        for fragment in ('first_name is required', 'invalid email', "unknown course 'BSXX'", 'year_level'):
+            self.assertIn(fragment, message)
+
+    def test_duplicates_in_file_and_database(self):
+        report = importer.validate_file(csv_file(
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1,,',
+            '2024-0001,Janet,Doe,janet@school.edu,BSIT,1,,',
+            '2023-0001,Old,Student,old@school.edu,BSIT,2,,',
+            '2024-0003,New,Student,TAKEN@school.edu,BSCS,1,,',
+        ), 'voters.csv')
+        self.assertEqual([row['student_id'] for row in report.rows], ['2024-0001'])
+        errors = dict(report.errors)
+        self.assertIn("duplicate student_id '2024-0001' (also on line 2)", errors[3])
+        self.assertIn("student_id '2023-0001' is already registered", errors[4])
+        self.assertIn("email 'taken@school.edu' is already registered", errors[5])
+
+    def test_email_lookup_uses_index(self):
+        from django.db.models.functions import Lower
+        emails = User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=['taken@school.edu'])
+        self.assertIn('auth_user_email_lower_idx', emails.explain())
+
+    def test_missing_columns(self):
+        with self.assertRaises(importer.VoterImportError):
+            list(importer.read_rows(io.BytesIO(b'student_id,email\n1,a@b.c\n'), 'voters.csv'))
+
+    def test_import_creates_users_profiles_and_index(self):
+        rows = [f'2024-{i:04d},First{i},Last{i},s{i}@school.edu,BSCS,{1 + i % 4},,' for i in range(25)]
+        report = importer.validate_file(csv_file(*rows), 'voters.csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            user_ids = importer.import_voters(report, chunk_size=10)
+
+        self.assertEqual(len(user_ids), 25)
+        self.assertEqual(StudentProfile.objects.filter(student_id__startswith='2024-').count(), 25)
+        user = User.objects.get(username='2024-0007')
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(user.student_profile.year_level, 4)
+        self.assertEqual([p.student_id for p in search_profiles('last7')], ['2024-0007'])
+
+    def test_password_column(self):
+        report = importer.validate_file(csv_file(
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1,,s3cret-pass',
+            '2024-0002,John,Roe,john@school.edu,BSIT,1,,',
+        ), 'voters.csv')
+        importer.import_voters(report, password_mode=importer.PASSWORD_COLUMN)
+        self.assertTrue(User.objects.get(username='2024-0001').check_password('s3cret-pass'))
+        self.assertFalse(User.objects.get(username='2024-0002').has_usable_password())
+
+    def test_parallel_hashing_matches_serial(self):
+        hashed = importer.hash_passwords(['a', 'b', 'c', ''], workers=2)
+        self.assertEqual(len(hashed), 4)
+        self.assertTrue(hashed[0].startswith('md5$'))
+        self.assertTrue(hashed[3].startswith('!'))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportVotersCommandTests(TestCase):
+    def write_file(self, *rows):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            f.write(HEADER + ''.join(row + '\n' for row in rows))
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('import_voters', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_imports_nothing(self):
+        path = self.write_file('2024-0001,Jane,Doe,jane@school.edu,BSIT,1,,')
+        output = self.run_command(path, '--dry-run')
+        self.assertIn('1 valid', output)
+        self.assertFalse(User.objects.filter(username='2024-0001').exists())
+
+    def test_invalid_rows_abort_unless_skipped(self):
+        path = self.write_file(
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1,,',
+            '2024-0002,John,Roe,bad,BSIT,1,,',
+        )
+        with self.assertRaises(CommandError):
+            self.run_command(path)
+        self.assertFalse(User.objects.filter(username='2024-0001').exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            output = self.run_command(path, '--skip-invalid', '--send-emails')
+        self.assertIn('Imported 1 voters', output)
+        self.assertTrue(User.objects.filter(username='2024-0001').exists())
+        self.assertTrue(AuditLog.objects.filter(action='VOTERS_IMPORTED').exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('/auth/password-reset-confirm/', mail.outbox[0].body)
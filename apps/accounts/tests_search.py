@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from apps.accounts.models import ElectionAdmin, StudentProfile, StudentSearchIndex
+from apps.accounts.search import filter_profiles, search_profiles
+
+
+class VoterSearchTests(TestCase):
+    def setUp(self):
+        self.students = {}
+        for username, first, last, student_id, course in [
+            ('jdoe', 'Jane', 'Doe', '2024-0001', 'BSIT'),
+            ('jsmith', 'John', 'Smith', '2024-0002', 'BSCS'),
+            ('adoe', 'Alan', 'Doering', '2023-0150', 'BSBA'),
+        ]:
+            user = User.objects.create_user(
+                username=username, first_name=first, last_name=last,
+                email=f'{username}@school.edu')
+            self.students[username] = StudentProfile.objects.create(
+                user=user, student_id=student_id, year_level=1, course=course)
+
+    def search_usernames(self, query):
+        return [profile.user.username for profile in search_profiles(query)]
+
+    def test_profiles_are_indexed(self):
+        document = StudentSearchIndex.objects.get(student_profile=self.students['jdoe']).document
+        self.assertEqual(document, 'jdoe jane doe jdoe@school.edu 2024-0001 bsit')
+
+    def test_search_matches_names_ids_and_email(self):
+        self.assertEqual(self.search_usernames('smith'), ['jsmith'])
+        self.assertEqual(self.search_usernames('2024-0001'), ['jdoe'])
+        self.assertEqual(self.search_usernames('jsmith@school.edu'), ['jsmith'])
+        self.assertEqual(self.search_usernames('JANE doe'), ['jdoe'])
+
+    def test_prefix_search(self):
+        self.assertEqual(set(self.search_usernames('doe')), {'jdoe', 'adoe'})
+
+    def test_user_changes_refresh_index(self):
+        user = self.students['jsmith'].user
+        user.last_name = 'Rivera'
+        user.save()
+        self.assertEqual(self.search_usernames('rivera'), ['jsmith'])
+        self.assertEqual(self.search_usernames('smith'), [])
+
+    def test_deleted_profile_leaves_index(self):
+        self.students['jdoe'].delete()
+        self.assertEqual(self.search_usernames('jane'), [])
+
+    def test_filter_composes_with_queryset(self):
+        qs = filter_profiles(StudentProfile.objects.filter(course='BSBA'), 'doe')
+        self.assertEqual([p.student_id for p in qs], ['2023-0150'])
+
+    def test_rebuild_command(self):
+        StudentSearchIndex.objects.all().delete()
+        self.assertEqual(self.search_usernames('jane'), [])
+        call_command('rebuild_voter_search', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.search_usernames('jane'), ['jdoe'])
+
+
+class VoterSearchEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=admin_user, admin_type='EMP')
+        self.client.force_login(admin_user)
+        for i in range(30):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'student{i}', first_name='Maria', last_name=f'Cruz{i}'),
+                student_id=f'S{i:03d}', year_level=2, course='BSIT')
+
+    def test_typeahead_results(self):
+        response = self.client.get(reverse('administration:api_voter_search'), {'q': 'cruz1', 'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r['name'].startswith('Maria Cruz1') for r in results))
+
+    def test_limit_is_capped(self):
+        response = self.client.get(reverse('administration:api_voter_search'), {'q': 'maria', 'limit': 500})
+        self.assertEqual(len(response.json()['results']), 20)
+
+    def test_empty_query(self):
+        response = self.client.get(reverse('administration:api_voter_search'))
+        self.assertEqual(response.json()['results'], [])
+
+    def test_voter_list_uses_index(self):
+        response = self.client.get(reverse('administration:voters'), {'search': 'cruz7'})
+        self.assertEqual([v.student_id for v in response.context['voters']], ['S007'])
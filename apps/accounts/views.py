@@ -30,7 +30,10 @@ def register(request):
             face_image = request.POST.get('face_image')
             if face_image:
                 try:
-                    from deepface import DeepFace
+                    from apps.biometrics import face
+                    DeepFace = face.load()
+                    if DeepFace is None:
+                        raise ImportError("DeepFace is not installed")
                     import numpy as np
                     import base64
                     import io
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AuditLog
+from .models import AuditLog, AuditLogArchive, BackgroundJob
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
@@ -7,6 +7,8 @@ class AuditLogAdmin(admin.ModelAdmin):
     list_filter = ('action', 'timestamp')
     search_fields = ('user__username', 'action', 'details')
     readonly_fields = ('timestamp', 'user', 'action', 'details', 'ip_address')
+    list_select_related = ('user',)
+    show_full_result_count = False
     
     fieldsets = (
         ('Action Information', {
@@ -22,3 +24,37 @@ class AuditLogAdmin(admin.ModelAdmin):
         
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'user', 'action', 'ip_address', 'archived_at')
+    list_filter = ('action',)
+    search_fields = ('user__username', 'action')
+    readonly_fields = ('id', 'timestamp', 'user', 'action', 'details', 'ip_address', 'archived_at')
+    list_select_related = ('user',)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'phase', 'progress_done', 'progress_total', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    list_select_related = ('created_by',)
+    show_full_result_count = False
+    readonly_fields = (
+        'kind', 'status', 'params', 'state', 'phase', 'progress_done', 'progress_total',
+        'error', 'created_by', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,223 @@
+"""
+Audit trail API.
+
+Call :func:`record` instead of ``AuditLog.objects.create``::
+
+    audit.record('ELECTION_CREATED', f"Created election: {election.name}", request=request)
+
+An entry is queued when the surrounding transaction commits (immediately
+outside a transaction), so rolled-back actions are not audited. With
+``AUDIT_LOG_ASYNC`` enabled, queued entries are written by a background
+thread with one ``bulk_create`` per batch - when ``AUDIT_LOG_BATCH_SIZE``
+entries are waiting or every ``AUDIT_LOG_FLUSH_INTERVAL`` seconds - so
+requests never wait on the audit table. Otherwise (development and tests)
+each entry is written straight away.
+
+Nothing is dropped when a write fails or the worker exits: the queue is
+flushed at interpreter exit, and any batch that cannot be inserted is
+appended to a JSON-lines file in ``AUDIT_LOG_SPOOL_DIR``. Spooled entries
+are loaded back by ``manage.py flush_audit_log`` (and whenever a writer
+thread starts).
+
+Entries older than ``AUDIT_LOG_RETENTION_DAYS`` are moved to
+:class:`~.models.AuditLogArchive` by ``manage.py prune_audit_log`` so the
+live table stays small.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.core.cache import AUDIT, bump_version
+from apps.core.logging import logger
+from .models import AuditLog, AuditLogArchive
+
+
+def record(action, details='', user=None, request=None, ip_address=None):
+    """
+    Add an entry to the audit trail. ``request`` supplies the user and IP
+    address when they are not given explicitly.
+    """
+    if request is not None:
+        if user is None and request.user.is_authenticated:
+            user = request.user
+        if ip_address is None:
+            ip_address = request.META.get('REMOTE_ADDR')
+
+    entry = {
+        'user_id': getattr(user, 'pk', user),
+        'action': action,
+        'details': details,
+        'ip_address': ip_address,
+        # Stamped now, not when the batch is written
+        'timestamp': timezone.now(),
+    }
+    transaction.on_commit(lambda: writer.add(entry))
+
+
+def flush():
+    """Write every queued entry now. Returns the number written."""
+    return writer.flush()
+
+
+class AuditWriter:
+    """Per-process queue of audit entries and the thread that drains it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, entry):
+        if not getattr(settings, 'AUDIT_LOG_ASYNC', False):
+            self._write([entry])
+            return
+        with self._lock:
+            self._pending.append(entry)
+            backlog = len(self._pending)
+        self._ensure_thread()
+        if backlog >= settings.AUDIT_LOG_BATCH_SIZE:
+            self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+    def _write(self, batch):
+        try:
+            AuditLog.objects.bulk_create(AuditLog(**entry) for entry in batch)
+        except Exception as e:
+            logger.error(f"Audit log write failed, spooling {len(batch)} entries: {e}", category="ADMIN")
+            spool(batch)
+        else:
+            # bulk_create sends no post_save, which normally bumps this
+            bump_version(AUDIT)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        close_old_connections()
+        try:
+            replay_spool()
+        except Exception as e:
+            logger.error(f"Audit spool replay failed: {e}", category="ADMIN")
+        while True:
+            self._wake.wait(settings.AUDIT_LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+writer = AuditWriter()
+
+
+# The writer thread is a daemon and dies with the interpreter, so drain
+# the queue on the way out (gunicorn workers exit through sys.exit)
+atexit.register(writer.flush)
+
+
+# ----------------------------------------------------------------------
+# Durable fallback
+# ----------------------------------------------------------------------
+
+def _spool_dir():
+    return Path(settings.AUDIT_LOG_SPOOL_DIR)
+
+
+def spool(batch):
+    """Append entries that could not be inserted to a spool file."""
+    directory = _spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{os.getpid()}-{time.time_ns()}.jsonl'
+    with open(path, 'a', encoding='utf-8') as handle:
+        for entry in batch:
+            handle.write(json.dumps({**entry, 'timestamp': entry['timestamp'].isoformat()}) + '\n')
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def replay_spool():
+    """Insert spooled entries into the audit table. Returns the number loaded."""
+    directory = _spool_dir()
+    if not directory.is_dir():
+        return 0
+
+    loaded = 0
+    for path in sorted(directory.glob('*.jsonl')):
+        # Renaming claims the file, so concurrent workers never load it twice
+        claimed = path.with_suffix(f'.replaying-{os.getpid()}')
+        try:
+            path.rename(claimed)
+        except OSError:
+            continue
+        with open(claimed, encoding='utf-8') as handle:
+            entries = [json.loads(line) for line in handle if line.strip()]
+        for entry in entries:
+            entry['timestamp'] = parse_datetime(entry['timestamp'])
+        try:
+            AuditLog.objects.bulk_create(AuditLog(**entry) for entry in entries)
+        except Exception:
+            claimed.rename(path)
+            raise
+        claimed.unlink()
+        loaded += len(entries)
+
+    if loaded:
+        bump_version(AUDIT)
+    return loaded
+
+
+# ----------------------------------------------------------------------
+# Retention
+# ----------------------------------------------------------------------
+
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVE_FIELDS = ('id', 'user_id', 'action', 'details', 'ip_address', 'timestamp')
+
+
+def archive_before(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move entries older than ``cutoff`` to the archive table, oldest first,
+    one transaction per batch. Returns the number moved.
+    """
+    moved = 0
+    while True:
+        rows = list(
+            AuditLog.objects.filter(timestamp__lt=cutoff)
+            .order_by('timestamp', 'pk').values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic():
+            # ignore_conflicts makes a batch repeated after a crash harmless
+            AuditLogArchive.objects.bulk_create(
+                (AuditLogArchive(**row) for row in rows), ignore_conflicts=True)
+            AuditLog.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+
+    if moved:
+        bump_version(AUDIT)
+    return moved
+
+
+def purge_archive_before(cutoff):
+    """Delete archived entries older than ``cutoff``. Returns the number deleted."""
+    deleted, _ = AuditLogArchive.objects.filter(timestamp__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,383 @@
+"""
+Dashboard data sections.
+
+The admin dashboard is split into independent sections (summary, positions,
+turnout, demographics, activity). Each section is cached on its own with a
+TTL and a version key derived from the data it depends on, so the JSON
+endpoint can answer "unchanged" without recomputing anything and a refresh
+only pays for the sections that actually changed.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractHour, TruncHour
+from django.utils import timezone
+
+from apps.accounts.demographics import voter_demographics
+from apps.accounts.models import StudentProfile
+from apps.administration.models import AuditLog
+from apps.core.cache import AUDIT, CANDIDATES, VOTERS, election_tally, versioned_key
+from apps.core.services.single_flight import single_flight
+from apps.elections.models import Candidate, Election, Position, Vote, VoterReceipt
+from apps.elections.services import get_comparative_stats, get_position_results
+
+CACHE_PREFIX = 'dashboard'
+
+# Seconds each section may be served from cache. Version bumps invalidate
+# earlier; the TTL bounds staleness for time-dependent values (status, hourly
+# buckets) and for caches that are not shared between workers.
+SECTION_TTLS = {
+    'summary': 30,
+    'positions': 30,
+    'turnout': 60,
+    'demographics': 300,
+    'activity': 15,
+}
+
+SECTIONS = tuple(SECTION_TTLS)
+
+COMPARISON_TTL = 120
+
+
+def _section_namespaces(name, election_id):
+    tally = election_tally(election_id)
+    return {
+        'summary': [VOTERS, CANDIDATES, tally],
+        'positions': [CANDIDATES, tally],
+        'turnout': [tally],
+        'demographics': [VOTERS, tally],
+        'activity': [AUDIT],
+    }[name]
+
+
+def section_version(name, election):
+    """Return ``(cache_key, version_tag)`` for a section without computing it."""
+    election_id = election.pk if election else 0
+    return versioned_key(
+        f'{CACHE_PREFIX}:{name}', _section_namespaces(name, election_id), election_id)
+
+
+def section_etag(name, election_id, version):
+    """
+    ETag of a section: its version tag and the current TTL period. The period
+    expires tags of time-dependent sections, and of versions bumped in another
+    worker's (unshared) cache, as their cached data would expire.
+    """
+    period = int(time.time() // SECTION_TTLS[name])
+    return f'"{name}-{election_id or 0}-{version}-{period}"'
+
+
+def get_section(name, election):
+    """
+    Return ``(data, version_tag)`` for a dashboard section, computing and
+    caching it on a miss. Concurrent misses for the same section and version
+    are coalesced into a single computation.
+    """
+    if name not in SECTION_TTLS:
+        raise KeyError(name)
+    key, version = section_version(name, election)
+    data = single_flight(key, lambda: _BUILDERS[name](election), SECTION_TTLS[name])
+    return data, version
+
+
+def comparison_version():
+    """
+    Version tag of the multi-election comparison.
+
+    It covers the tallies of every election, so a vote or candidate change
+    anywhere invalidates the comparison.
+    """
+    election_ids = Election.objects.order_by('pk').values_list('pk', flat=True)
+    namespaces = [VOTERS, CANDIDATES] + [election_tally(pk) for pk in election_ids]
+    _, tag = versioned_key(f'{CACHE_PREFIX}:compare', namespaces)
+    # One counter per election makes the raw tag unbounded; hash it for the key
+    return hashlib.sha1(tag.encode()).hexdigest()[:16]
+
+
+def comparison_etag(version):
+    """ETag of the comparison, expiring every COMPARISON_TTL like :func:`section_etag`."""
+    return f'"compare-{version}-{int(time.time() // COMPARISON_TTL)}"'
+
+
+def get_comparison():
+    """Return ``(rows, version_tag)`` comparing every election."""
+    version = comparison_version()
+    rows = single_flight(f'{CACHE_PREFIX}:compare:{version}', get_comparative_stats, COMPARISON_TTL)
+    return rows, version
+
+
+def get_election_status(election, now=None):
+    """Return ``(status, status_label)`` for the dashboard badge."""
+    now = now or timezone.now()
+    if now < election.start_time:
+        return 'pending', 'Upcoming'
+    if now > election.end_time:
+        return 'closed', 'Closed'
+    if election.is_active:
+        return 'active', 'Active'
+    return 'paused', 'Paused'
+
+
+def get_time_remaining(election, now=None):
+    """Days/hours/minutes until the election ends, or None if it has ended."""
+    now = now or timezone.now()
+    if election.end_time <= now:
+        return None
+    delta = election.end_time - now
+    return {
+        'days': delta.days,
+        'hours': delta.seconds // 3600,
+        'minutes': (delta.seconds % 3600) // 60,
+        'total_seconds': delta.total_seconds(),
+    }
+
+
+def collect_alerts(sections):
+    """Merge the alerts contributed by each section in display order."""
+    alerts = []
+    for name in ('summary', 'positions', 'turnout'):
+        alerts.extend(sections.get(name, {}).get('alerts', []))
+    return alerts
+
+
+# ----------------------------------------------------------------------
+# Section builders
+# ----------------------------------------------------------------------
+
+def _format_hour(hour_int):
+    """Convert a 24h hour into a 12h label (e.g. 13 -> '1 PM')."""
+    if hour_int == 0:
+        return "12 AM"
+    if hour_int < 12:
+        return f"{hour_int} AM"
+    if hour_int == 12:
+        return "12 PM"
+    return f"{hour_int - 12} PM"
+
+
+def build_summary(election):
+    voter_counts = StudentProfile.objects.aggregate(
+        total=Count('id'),
+        eligible=Count('id', filter=Q(is_eligible_to_vote=True)),
+    )
+    total_voters = voter_counts['total']
+    eligible_voters = voter_counts['eligible']
+
+    data = {
+        'total_voters': total_voters,
+        'eligible_voters': eligible_voters,
+        'total_votes_cast': 0,
+        'overall_turnout_percentage': 0,
+        'election_status_label': None,
+        'total_active_candidates': 0,
+        'total_positions': 0,
+        'peak_voting_hour': None,
+        'peak_voting_count': 0,
+        'abstention_rate': 0,
+        'election': None,
+        'alerts': [],
+    }
+    if not election:
+        return data
+
+    ballots_cast = VoterReceipt.objects.filter(election=election).count()
+    total_individual_votes = Vote.objects.filter(election=election).count()
+    turnout_percentage = (ballots_cast / eligible_voters * 100) if eligible_voters > 0 else 0
+
+    election_positions = list(
+        Position.objects.filter(candidates__election=election)
+        .distinct().values_list('number_of_winners', flat=True)
+    )
+    total_positions = len(election_positions)
+    total_candidates = Candidate.objects.filter(election=election).count()
+    status, status_label = get_election_status(election)
+
+    # Abstention: votes a full ballot could have cast versus votes actually cast
+    abstention_rate = 0
+    total_possible_votes = ballots_cast * sum(election_positions)
+    if total_possible_votes > 0:
+        abstention_count = total_possible_votes - total_individual_votes
+        abstention_rate = round(max(0, abstention_count / total_possible_votes * 100), 1)
+
+    peak_hour_data = (
+        Vote.objects.filter(election=election)
+        .annotate(hour=ExtractHour('timestamp'))
+        .values('hour').annotate(count=Count('id')).order_by('-count').first()
+    )
+    if peak_hour_data:
+        data['peak_voting_hour'] = _format_hour(peak_hour_data['hour'])
+        data['peak_voting_count'] = peak_hour_data['count']
+
+    data.update({
+        'total_votes_cast': ballots_cast,
+        'overall_turnout_percentage': round(
+            (ballots_cast / total_voters * 100) if total_voters > 0 else 0, 1),
+        'election_status_label': status_label,
+        'total_active_candidates': total_candidates,
+        'total_positions': total_positions,
+        'abstention_rate': abstention_rate,
+        'election': {
+            'id': election.id,
+            'name': election.name,
+            'status': status,
+            'status_label': status_label,
+            'start_time': election.start_time,
+            'end_time': election.end_time,
+            'votes_cast': ballots_cast,
+            'turnout_percentage': round(turnout_percentage, 2),
+            'total_candidates': total_candidates,
+        },
+    })
+
+    if round(turnout_percentage, 2) < 10 and status == 'active':
+        data['alerts'].append({
+            'type': 'warning',
+            'icon': 'exclamation-triangle',
+            'message': f"Low turnout alert: {election.name} has only {round(turnout_percentage, 2)}% participation"
+        })
+    return data
+
+
+def build_positions(election):
+    data = {
+        'positions_data': [],
+        'position_labels': [],
+        'position_counts': [],
+        'alerts': [],
+    }
+    if not election:
+        return data
+
+    is_election_closed = timezone.now() > election.end_time
+    for result in get_position_results(election, mark_winners=is_election_closed):
+        position = result['position']
+        position_total_votes = result['total_votes']
+        candidates_list = []
+        for entry in result['candidates']:
+            candidate = entry['candidate']
+            vote_percentage = (entry['votes'] / position_total_votes * 100) if position_total_votes > 0 else 0
+            candidates_list.append({
+                'name': candidate.student_profile.user.get_full_name(),
+                'partylist': candidate.partylist.name if candidate.partylist else 'Independent',
+                'votes': entry['votes'],
+                'percentage': round(vote_percentage, 1),
+                'photo': candidate.photo.url if candidate.photo else None,
+                'is_winner': entry['is_winner'],
+            })
+
+        data['positions_data'].append({
+            'name': position.name,
+            'candidates': candidates_list,
+            'total_votes': position_total_votes,
+            'number_of_winners': position.number_of_winners,
+        })
+
+        if len(candidates_list) >= 2:
+            top_votes = candidates_list[0]['votes']
+            if candidates_list[1]['votes'] == top_votes and top_votes > 0:
+                data['alerts'].append({
+                    'type': 'info',
+                    'icon': 'info-circle',
+                    'message': f"Tie detected in {election.name} for {position.name}: Multiple candidates with {top_votes} votes"
+                })
+
+    # Votes by position chart, busiest first
+    by_votes = sorted(
+        (p for p in data['positions_data'] if p['total_votes'] > 0),
+        key=lambda p: p['total_votes'], reverse=True)
+    data['position_labels'] = [p['name'] for p in by_votes]
+    data['position_counts'] = [p['total_votes'] for p in by_votes]
+    return data
+
+
+def build_turnout(election):
+    data = {
+        'turnout_hours': [],
+        'turnout_counts': [],
+        'recent_votes': 0,
+        'alerts': [],
+    }
+    if not election:
+        return data
+
+    # Hourly buckets for the last 24 hours, aligned to the local clock hour
+    now = timezone.localtime()
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    window_start = current_hour - timedelta(hours=23)
+    hourly = {
+        row['hour']: row['count']
+        for row in Vote.objects.filter(election=election, timestamp__gte=window_start)
+        .annotate(hour=TruncHour('timestamp'))
+        .values('hour').annotate(count=Count('id')).order_by()
+    }
+    for i in range(24):
+        hour_start = window_start + timedelta(hours=i)
+        data['turnout_hours'].append(hour_start.strftime('%H:%M'))
+        data['turnout_counts'].append(hourly.get(hour_start, 0))
+
+    # Check for voting spikes (more than 50 votes in last hour)
+    recent_votes = Vote.objects.filter(
+        election=election,
+        timestamp__gte=now - timedelta(hours=1)
+    ).count()
+    data['recent_votes'] = recent_votes
+    if recent_votes > 50:
+        data['alerts'].append({
+            'type': 'success',
+            'icon': 'chart-line',
+            'message': f"High activity: {recent_votes} votes cast in the last hour"
+        })
+    return data
+
+
+def build_demographics(election):
+    demographics = voter_demographics()
+    course_data = sorted(
+        (item for item in demographics['by_course'] if item['total']), key=lambda item: -item['total'])
+    year_data = [item for item in demographics['by_year_level'] if item['total']]
+
+    participation_by_course = []
+    participation_by_year = []
+    if election:
+        receipts = VoterReceipt.objects.filter(election=election)
+        participation_by_course = receipts.values(course=F('voter__course')).annotate(
+            count=Count('id')).order_by('-count')
+        participation_by_year = receipts.values(year_level=F('voter__year_level')).annotate(
+            count=Count('id')).order_by('year_level')
+
+    return {
+        'course_labels': [item['course'] for item in course_data],
+        'course_counts': [item['total'] for item in course_data],
+        'year_labels': [f"{item['year_level']} Year" for item in year_data],
+        'year_counts': [item['total'] for item in year_data],
+        'participation_course_labels': [item['course'] for item in participation_by_course],
+        'participation_course_counts': [item['count'] for item in participation_by_course],
+        'participation_year_labels': [f"Year {item['year_level']}" for item in participation_by_year],
+        'participation_year_counts': [item['count'] for item in participation_by_year],
+    }
+
+
+def build_activity(election=None):
+    logs = AuditLog.objects.select_related('user').order_by('-timestamp')[:5]
+    return {
+        'recent_activity': [
+            {
+                'username': log.user.username if log.user else None,
+                'action': log.action,
+                'details': log.details,
+                'timestamp': log.timestamp,
+            }
+            for log in logs
+        ],
+    }
+
+
+_BUILDERS = {
+    'summary': build_summary,
+    'positions': build_positions,
+    'turnout': build_turnout,
+    'demographics': build_demographics,
+    'activity': build_activity,
+}
@@ -0,0 +1,88 @@
+"""
+Queryset filters shared by admin list views and background jobs.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.accounts.search import filter_profiles
+
+VOTER_FILTER_KEYS = ('search', 'status', 'course', 'year_level', 'eligibility')
+
+
+def filter_voters(voter_qs, params):
+    """
+    Apply the voter list filters (search, status, course, year level,
+    eligibility) from a GET/POST mapping. Returns ``(queryset, filters)``.
+    """
+    filters = {
+        'search': params.get('search', ''),
+        'status': params.get('status'),
+        'course': params.get('course'),
+        'year_level': params.get('year_level'),
+        'eligibility': params.get('eligibility'),
+    }
+
+    # Search runs against the indexed search document (works across all pages)
+    if filters['search']:
+        voter_qs = filter_profiles(voter_qs, filters['search'])
+
+    if filters['status']:
+        voter_qs = voter_qs.filter(verification_status=filters['status'])
+    if filters['course']:
+        voter_qs = voter_qs.filter(course=filters['course'])
+    if filters['year_level']:
+        try:
+            voter_qs = voter_qs.filter(year_level=int(filters['year_level']))
+        except ValueError:
+            voter_qs = voter_qs.none()
+    if filters['eligibility'] == 'eligible':
+        voter_qs = voter_qs.filter(is_eligible_to_vote=True)
+    elif filters['eligibility'] == 'not_eligible':
+        voter_qs = voter_qs.filter(is_eligible_to_vote=False)
+
+    return voter_qs, filters
+
+
+AUDIT_FILTER_KEYS = ('action', 'user', 'date_from', 'date_to')
+
+
+def filter_audit_logs(log_qs, params):
+    """
+    Apply the audit log filters (exact action, username, inclusive date
+    range) from a GET mapping. Each one maps onto an index leading with
+    ``action``, ``user`` or ``timestamp``. Returns ``(queryset, filters)``.
+    """
+    filters = {key: (params.get(key) or '').strip() for key in AUDIT_FILTER_KEYS}
+
+    if filters['action']:
+        log_qs = log_qs.filter(action=filters['action'])
+    if filters['user']:
+        log_qs = log_qs.filter(user__username=filters['user'])
+
+    try:
+        date_from = _parse_day(filters['date_from'])
+        date_to = _parse_day(filters['date_to'])
+    except ValueError:
+        return log_qs.none(), filters
+    # Bounds are local midnights so the range covers whole days
+    if date_from:
+        log_qs = log_qs.filter(timestamp__gte=_start_of_day(date_from))
+    if date_to:
+        log_qs = log_qs.filter(timestamp__lt=_start_of_day(date_to + timedelta(days=1)))
+
+    return log_qs, filters
+
+
+def _parse_day(value):
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Invalid date: {value}")
+    return day
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
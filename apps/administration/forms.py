@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.models import User
 from apps.accounts.models import StudentProfile, ElectionAdmin, AdminType
 from apps.elections.models import Election, Position, Partylist, Candidate, ElectionTimeline
+from .widgets import StudentAutocompleteWidget
 
 class ElectionForm(forms.ModelForm):
     class Meta:
@@ -69,7 +70,7 @@ class CandidateForm(forms.ModelForm):
         model = Candidate
         fields = ['student_profile', 'election', 'position', 'partylist', 'biography', 'photo', 'is_approved']
         widgets = {
-            'student_profile': forms.Select(attrs={'class': 'form-control'}),
+            'student_profile': StudentAutocompleteWidget(attrs={'class': 'form-control'}, search_input='studentSearch'),
             'election': forms.Select(attrs={'class': 'form-control'}),
             'position': forms.Select(attrs={'class': 'form-control'}),
             'partylist': forms.Select(attrs={'class': 'form-control'}),
@@ -143,6 +144,38 @@ class VoterForm(forms.ModelForm):
         return profile
 
 
+class VoterImportForm(forms.Form):
+    """Upload of a registrar CSV/XLSX file for bulk voter import"""
+    file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'}),
+        help_text='Columns: student_id, first_name, last_name, email, course, year_level '
+                  '(optional: username, middle_name, section, is_eligible_to_vote)'
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        label='Validate only (dry run)'
+    )
+    skip_invalid = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        label='Import valid rows even if some rows have errors'
+    )
+    send_emails = forms.BooleanField(
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        label='Email students a link to set their password'
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError('Upload a .csv or .xlsx file.')
+        return upload
+
+
 # ----------------------------------------------------------------------
 # Admin Profile Management Forms
 # ----------------------------------------------------------------------
@@ -243,12 +276,12 @@ class ElectionAdminForm(forms.ModelForm):
     """Form for creating and editing election administrators"""
     # Student profile selection (for auto-filling from existing students)
     student_profile = forms.ModelChoiceField(
-        queryset=StudentProfile.objects.all(),
+        queryset=StudentProfile.objects.select_related('user'),
         required=False,
-        widget=forms.Select(attrs={
+        widget=StudentAutocompleteWidget(attrs={
             'class': 'form-control',
             'id': 'id_student_profile'
-        }),
+        }, search_input='studentSearch'),
         label='Select Student (Optional)',
         help_text='Select a student to link their existing account as administrator'
     )
@@ -0,0 +1,366 @@
+"""
+Background jobs for long-running admin operations.
+
+A ``BackgroundJob`` row is created in the request, and the work runs in a
+daemon thread once that transaction commits (the same approach the email
+service uses), so the request returns immediately. Handlers work in bounded
+batches and persist a resume point in ``job.state`` after each batch: if
+the process dies, ``manage.py run_background_jobs`` picks the job up where
+it stopped.
+
+Each handler is a function ``handler(job)`` registered in ``HANDLERS``; it
+reports progress through :func:`set_progress`.
+
+A job is claimed with a conditional update before it runs, so the thread
+started by the request and ``run_background_jobs`` never run the same job
+at once: only a pending job, or a running one whose runner has not reported
+progress for ``STALE_AFTER`` seconds (it died), can be claimed.
+"""
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile
+from apps.core.cache import VOTERS, bump_version_on_commit, election_tally
+from apps.elections.models import Election, Vote, VoterReceipt
+from apps.elections.services import invalidate_election_results
+from apps.core.logging import logger
+from .filters import VOTER_FILTER_KEYS, filter_voters
+from . import audit
+from .models import BackgroundJob
+
+BULK_VERIFY_BATCH_SIZE = 2000
+VOTE_RESET_BATCH_SIZE = 5000
+VOTER_IMPORT_CHUNK_SIZE = 1000
+# Problems of a voter import kept for its report page
+VOTER_IMPORT_REPORTED_ERRORS = 200
+
+# Set to False (e.g. in tests) to run jobs inline instead of in a thread
+RUN_IN_THREAD = True
+
+# Seconds without progress after which a running job is assumed interrupted
+STALE_AFTER = 300
+
+
+def start_job(kind, params, user=None):
+    """Create a job and run it in the background after the current transaction commits."""
+    job = BackgroundJob.objects.create(kind=kind, params=params, created_by=user)
+    transaction.on_commit(lambda: _dispatch(job.pk))
+    return job
+
+
+def _dispatch(job_id):
+    if not RUN_IN_THREAD:
+        run_job(job_id)
+        return
+    thread = threading.Thread(target=_run_in_thread, args=(job_id,), name=f'background-job-{job_id}')
+    thread.daemon = True
+    thread.start()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        # The thread has its own database connection; do not leak it
+        connection.close()
+
+
+def claim(job_id, stale_after=STALE_AFTER, retry_failed=False):
+    """
+    Mark a job as running. False if it is running elsewhere, finished, or
+    (unless ``retry_failed``) failed.
+    """
+    now = timezone.now()
+    claimable = Q(status=BackgroundJob.Status.PENDING) | Q(
+        status=BackgroundJob.Status.RUNNING, updated_at__lt=now - timedelta(seconds=stale_after))
+    if retry_failed:
+        claimable |= Q(status=BackgroundJob.Status.FAILED)
+    return bool(BackgroundJob.objects.filter(claimable, pk=job_id).update(
+        status=BackgroundJob.Status.RUNNING, error='', finished_at=None,
+        started_at=Coalesce('started_at', now), updated_at=now))
+
+
+def run_job(job_id, stale_after=STALE_AFTER, retry_failed=False):
+    """
+    Claim a job and run it to completion, resuming from its saved state if
+    it was interrupted (or, with ``retry_failed``, failed) earlier. Returns
+    the job, or None if it could not be claimed.
+    """
+    close_old_connections()
+    if not claim(job_id, stale_after, retry_failed):
+        return None
+    job = BackgroundJob.objects.get(pk=job_id)
+    handler = HANDLERS[job.kind]
+
+    try:
+        handler(job)
+    except Exception as e:
+        logger.error(f"Background job {job.pk} ({job.kind}) failed: {e}", category="JOBS")
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.Status.FAILED, error=str(e), finished_at=timezone.now())
+    else:
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.Status.COMPLETED, finished_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def set_progress(job, done=None, total=None, phase=None, **state):
+    """Persist progress (and any resume state) for a running job."""
+    if done is not None:
+        job.progress_done = done
+    if total is not None:
+        job.progress_total = total
+    if phase is not None:
+        job.phase = phase
+    job.state.update(state)
+    BackgroundJob.objects.filter(pk=job.pk).update(
+        progress_done=job.progress_done, progress_total=job.progress_total,
+        phase=job.phase, state=job.state, updated_at=timezone.now())
+
+
+def job_payload(job):
+    """JSON-serialisable status of a job for polling clients."""
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'phase': job.phase,
+        'done': job.progress_done,
+        'total': job.progress_total,
+        'percent': job.percent,
+        'finished': job.is_finished,
+        'error': job.error,
+        'result': job.state.get('result'),
+    }
+
+
+# ----------------------------------------------------------------------
+# Handlers
+# ----------------------------------------------------------------------
+
+def bulk_verify_voters(job):
+    """
+    Verify every pending/rejected voter matching the voter list filters in
+    ``job.params['filters']``, a few thousand rows per transaction.
+    """
+    filters = {key: job.params.get('filters', {}).get(key) or '' for key in VOTER_FILTER_KEYS}
+    voter_qs, _ = filter_voters(StudentProfile.objects.all(), filters)
+    voter_qs = voter_qs.exclude(verification_status=StudentProfile.VerificationStatus.VERIFIED)
+
+    verified = job.state.get('verified', 0)
+    last_pk = job.state.get('last_pk', 0)
+    if not job.progress_total:
+        set_progress(job, done=0, total=voter_qs.count(), phase='verifying')
+
+    now = timezone.now()
+    while True:
+        ids = list(voter_qs.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:BULK_VERIFY_BATCH_SIZE])
+        if not ids:
+            break
+        with transaction.atomic():
+            verified += StudentProfile.objects.filter(pk__in=ids).exclude(
+                verification_status=StudentProfile.VerificationStatus.VERIFIED
+            ).update(
+                verification_status=StudentProfile.VerificationStatus.VERIFIED,
+                is_eligible_to_vote=True,
+                verified_at=now,
+                verified_by_id=job.created_by_id,
+            )
+            # QuerySet.update() sends no signals; refresh cached voter counts
+            bump_version_on_commit(VOTERS)
+        last_pk = ids[-1]
+        set_progress(job, done=verified, verified=verified, last_pk=last_pk)
+
+    active = {key: value for key, value in filters.items() if value}
+    audit.record(
+        'VOTERS_BULK_VERIFIED',
+        f"Bulk verified {verified} voters (job #{job.pk}, filters: {active or 'none'})",
+        user=job.created_by_id,
+        ip_address=job.params.get('ip_address'),
+    )
+    logger.voter_mgmt(f"Bulk verified {verified} voters (job #{job.pk})")
+    set_progress(job, phase='done', result={
+        'verified': verified, 'summary': f'{verified} voter(s) verified.'})
+
+
+# Deleted in this order: while votes remain, receipts must stay so nobody
+# can vote again and be counted twice
+VOTE_RESET_PHASES = (
+    ('votes', Vote, 'ELECTION_RESET_VOTES_DELETED'),
+    ('receipts', VoterReceipt, 'ELECTION_RESET_RECEIPTS_DELETED'),
+)
+
+
+def accepts_ballots(election, now=None):
+    """
+    Whether voters can still cast ballots in ``election`` (it is activated
+    and not closed). Its votes cannot be reset then: a ballot cast between
+    the two phases would keep its votes but lose its receipt, letting the
+    voter vote again.
+    """
+    return election.is_active and election.end_time >= (now or timezone.now())
+
+
+def reset_election_votes(job):
+    """
+    Delete every Vote and then every VoterReceipt of ``job.params['election_id']``
+    in short transactions, so the vote tables are never locked for long,
+    then invalidate all cached and frozen results for the election. Refused
+    while the election accepts ballots (see :func:`accepts_ballots`).
+
+    Each completed phase is recorded in the audit log and in ``job.state``,
+    so a resumed job skips it.
+    """
+    election = Election.objects.get(pk=job.params['election_id'])
+    completed = job.state.get('completed_phases', [])
+    deleted = job.state.get('deleted', {})
+
+    if not job.progress_total:
+        total = sum(model.objects.filter(election=election).count() for _, model, _ in VOTE_RESET_PHASES)
+        set_progress(job, done=0, total=total)
+
+    for phase, model, action in VOTE_RESET_PHASES:
+        if phase in completed:
+            continue
+        # Checked again per phase in case the election was activated meanwhile
+        election.refresh_from_db()
+        if accepts_ballots(election):
+            raise ValueError(f'{election.name} is accepting ballots; deactivate or close it before resetting votes.')
+        set_progress(job, phase=phase)
+        queryset = model.objects.filter(election=election)
+        while True:
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:VOTE_RESET_BATCH_SIZE])
+            if not ids:
+                break
+            with transaction.atomic():
+                count, _ = model.objects.filter(pk__in=ids).delete()
+                # Bulk deletes skip signals; keep cached tallies in step per batch
+                bump_version_on_commit(election_tally(election.pk))
+            deleted[phase] = deleted.get(phase, 0) + count
+            set_progress(job, done=sum(deleted.values()), deleted=deleted)
+
+        audit.record(
+            action,
+            f"Reset of election {election.name} (job #{job.pk}): deleted {deleted.get(phase, 0)} {phase}",
+            user=job.created_by_id,
+            ip_address=job.params.get('ip_address'),
+        )
+        completed.append(phase)
+        set_progress(job, completed_phases=completed)
+
+    set_progress(job, phase='invalidating')
+    with transaction.atomic():
+        invalidate_election_results(election.pk)
+
+    votes, receipts = deleted.get('votes', 0), deleted.get('receipts', 0)
+    audit.record(
+        'ELECTION_RESET',
+        f"Reset votes for election: {election.name}. Deleted {votes} votes and {receipts} receipts.",
+        user=job.created_by_id,
+        ip_address=job.params.get('ip_address'),
+    )
+    logger.election(f"Reset votes for election: {election.name}", extra_data={'votes_deleted': votes, 'job_id': job.pk})
+    set_progress(job, phase='done', result={
+        'votes': votes, 'receipts': receipts,
+        'summary': f'Deleted {votes} votes and {receipts} receipts from {election.name}.'})
+
+
+def save_import_file(upload):
+    """Store an uploaded registrar file for a voter import job; returns its name in VOTER_IMPORT_DIR."""
+    os.makedirs(settings.VOTER_IMPORT_DIR, exist_ok=True)
+    name = uuid.uuid4().hex + os.path.splitext(upload.name)[1].lower()
+    with open(os.path.join(settings.VOTER_IMPORT_DIR, name), 'wb') as f:
+        for chunk in upload.chunks():
+            f.write(chunk)
+    return name
+
+
+def import_voters_file(job):
+    """
+    Validate the registrar file ``job.params['file']`` and, unless this is a
+    dry run or some rows are invalid (and ``skip_invalid`` is off), import
+    its valid rows a chunk per transaction, emailing each chunk's students
+    a password setup link if ``send_emails`` is set. The file is deleted
+    once the job completes.
+
+    A resumed import validates the file again: rows imported before the
+    interruption are then already registered and are skipped, while the
+    report keeps the problems found by the first validation.
+    """
+    from apps.accounts import importer
+    from apps.core.services.email_service import EmailService
+
+    params = job.params
+    path = os.path.join(settings.VOTER_IMPORT_DIR, params['file'])
+    set_progress(job, phase='validating')
+    try:
+        with open(path, 'rb') as fileobj:
+            report = importer.validate_file(
+                fileobj, params['filename'], chunk_size=VOTER_IMPORT_CHUNK_SIZE,
+                progress=lambda phase, done, total: set_progress(job, done=done))
+    except importer.VoterImportError:
+        # Retrying cannot fix an unreadable file
+        os.remove(path)
+        raise
+
+    validation = job.state.get('validation')
+    if validation is None:
+        validation = {
+            'total_rows': report.total_rows,
+            'valid_count': report.valid_count,
+            'error_count': len(report.errors),
+            'errors': report.errors[:VOTER_IMPORT_REPORTED_ERRORS],
+        }
+        set_progress(job, validation=validation)
+
+    skipped = validation['error_count']
+    imported = not params['dry_run'] and validation['valid_count'] > 0 \
+        and (not skipped or params['skip_invalid'])
+    created = job.state.get('created', 0)
+    if imported:
+        set_progress(job, done=created, total=created + report.valid_count, phase='importing')
+        for start in range(0, report.valid_count, VOTER_IMPORT_CHUNK_SIZE):
+            chunk = importer.ImportReport()
+            chunk.rows = report.rows[start:start + VOTER_IMPORT_CHUNK_SIZE]
+            user_ids = importer.import_voters(
+                chunk, chunk_size=VOTER_IMPORT_CHUNK_SIZE, imported_by=job.created_by)
+            if params['send_emails']:
+                EmailService.send_account_setup_emails(User.objects.filter(pk__in=user_ids), async_send=False)
+            created += chunk.created
+            set_progress(job, done=created, created=created)
+
+        audit.record(
+            'VOTERS_IMPORTED',
+            f"Imported {created} voters from {params['filename']} ({skipped} rows skipped, job #{job.pk})",
+            user=job.created_by_id,
+            ip_address=params.get('ip_address'),
+        )
+        logger.voter_mgmt(f"Imported {created} voters from {params['filename']} (job #{job.pk})")
+        summary = f'Imported {created} voter(s).'
+        if skipped:
+            summary += f' {skipped} invalid row(s) were skipped.'
+    elif params['dry_run']:
+        summary = (f"Validated {validation['total_rows']} row(s): {validation['valid_count']} ready to "
+                   f"import, {skipped} with errors.")
+    else:
+        summary = f'Nothing imported: {skipped} row(s) have errors.' if skipped else 'Nothing to import.'
+
+    set_progress(job, phase='done', result={**validation, 'imported': imported, 'created': created, 'summary': summary})
+    os.remove(path)
+
+
+HANDLERS = {
+    BackgroundJob.Kind.VOTER_BULK_VERIFY: bulk_verify_voters,
+    BackgroundJob.Kind.VOTE_RESET: reset_election_votes,
+    BackgroundJob.Kind.VOTER_IMPORT: import_voters_file,
+}
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.administration import audit
+
+
+class Command(BaseCommand):
+    help = 'Load audit entries spooled to disk after failed writes into the audit log'
+
+    def handle(self, *args, **options):
+        loaded = audit.replay_spool()
+        self.stdout.write(self.style.SUCCESS(f'Loaded {loaded} spooled audit entries.'))
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.administration import audit
+from apps.administration.models import AuditLog, AuditLogArchive
+
+
+class Command(BaseCommand):
+    help = 'Move audit entries past the retention window to the archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=settings.AUDIT_LOG_RETENTION_DAYS,
+            help='Days of entries kept in the live audit log (default: AUDIT_LOG_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--purge-archive-after-days',
+            type=int,
+            default=settings.AUDIT_LOG_ARCHIVE_RETENTION_DAYS,
+            help='Delete archived entries older than this many days (default: keep them)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=audit.ARCHIVE_BATCH_SIZE,
+            help=f'Entries moved per transaction (default: {audit.ARCHIVE_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many entries would be moved or deleted'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(days=options['keep_days'])
+        purge_days = options['purge_archive_after_days']
+        purge_cutoff = now - timedelta(days=purge_days) if purge_days is not None else None
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'{AuditLog.objects.filter(timestamp__lt=cutoff).count()} entries older than '
+                f'{cutoff:%Y-%m-%d} would be archived.')
+            if purge_cutoff:
+                self.stdout.write(
+                    f'{AuditLogArchive.objects.filter(timestamp__lt=purge_cutoff).count()} archived entries '
+                    f'older than {purge_cutoff:%Y-%m-%d} would be deleted.')
+            return
+
+        moved = audit.archive_before(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} entries older than {cutoff:%Y-%m-%d}.'))
+        if purge_cutoff:
+            deleted = audit.purge_archive_before(purge_cutoff)
+            self.stdout.write(self.style.SUCCESS(
+                f'Deleted {deleted} archived entries older than {purge_cutoff:%Y-%m-%d}.'))
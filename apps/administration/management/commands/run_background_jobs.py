@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.administration import jobs
+from apps.administration.models import BackgroundJob
+
+
+class Command(BaseCommand):
+    help = 'Run pending background jobs and resume ones interrupted by a restart'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=jobs.STALE_AFTER,
+            help=f'Seconds without progress after which a running job is considered interrupted '
+                 f'(default: {jobs.STALE_AFTER})'
+        )
+        parser.add_argument(
+            '--job',
+            type=int,
+            help='Run only this job id (also retries it if it failed)'
+        )
+
+    def handle(self, *args, **options):
+        if options['job']:
+            job_ids = [options['job']]
+        else:
+            stale = timezone.now() - timedelta(seconds=options['stale_after'])
+            job_ids = list(BackgroundJob.objects.filter(
+                Q(status=BackgroundJob.Status.PENDING)
+                | Q(status=BackgroundJob.Status.RUNNING, updated_at__lt=stale)
+            ).order_by('created_at').values_list('pk', flat=True))
+        if not job_ids:
+            self.stdout.write('No background jobs to run.')
+            return
+
+        for job_id in job_ids:
+            job = jobs.run_job(job_id, options['stale_after'], retry_failed=bool(options['job']))
+            if job is None:
+                self.stdout.write(f'Background job #{job_id} is running elsewhere or finished; skipped.')
+                continue
+            style = self.style.SUCCESS if job.status == BackgroundJob.Status.COMPLETED else self.style.ERROR
+            self.stdout.write(style(f'{job}: {job.progress_done}/{job.progress_total} {job.error}'.rstrip()))
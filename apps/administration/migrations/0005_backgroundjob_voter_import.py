@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0004_auditlog_indexes_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='kind',
+            field=models.CharField(choices=[('VOTER_BULK_VERIFY', 'Bulk Voter Verification'), ('VOTE_RESET', 'Election Vote Reset'), ('VOTER_IMPORT', 'Voter Import')], max_length=30),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -24,13 +25,119 @@ class AuditLog(models.Model):
     action = models.CharField(max_length=100, help_text="e.g., 'LOGIN', 'VOTE_CAST', 'ELECTION_CREATED'")
     details = models.TextField(blank=True, help_text="JSON or text details about the action.")
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # When the action happened; entries may be written a moment later in a batch
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         verbose_name = 'Audit Log'
         verbose_name_plural = 'Audit Logs'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='auditlog_timestamp_idx'),
+            models.Index(fields=['action', 'timestamp'], name='auditlog_action_ts_idx'),
+            models.Index(fields=['user', 'timestamp'], name='auditlog_user_ts_idx'),
+        ]
 
     def __str__(self):
         user_str = self.user.username if self.user else "System/Anonymous"
         return f"[{self.timestamp.strftime('%Y-%m-%d %H:%M')}] {user_str} - {self.action}"
+
+
+class AuditLogArchive(models.Model):
+    """
+    Audit entries past the retention window, moved out of the live table by
+    ``manage.py prune_audit_log``. Rows keep the id they had in ``AuditLog``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_audit_logs'
+    )
+    action = models.CharField(max_length=100)
+    details = models.TextField(blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    timestamp = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Archived Audit Log'
+        verbose_name_plural = 'Archived Audit Logs'
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='auditarchive_timestamp_idx'),
+            models.Index(fields=['action', 'timestamp'], name='auditarchive_action_ts_idx'),
+            models.Index(fields=['user', 'timestamp'], name='auditarchive_user_ts_idx'),
+        ]
+
+    def __str__(self):
+        user_str = self.user.username if self.user else "System/Anonymous"
+        return f"[{self.timestamp.strftime('%Y-%m-%d %H:%M')}] {user_str} - {self.action}"
+
+
+# ----------------------------------------------------------------------
+# 4. Background Job Model
+# ----------------------------------------------------------------------
+class BackgroundJob(models.Model):
+    """
+    Long-running admin operation (bulk verification, voter import, vote
+    reset) executed outside the request. Progress is persisted so the UI can
+    poll it and an interrupted job can be resumed by
+    ``manage.py run_background_jobs``.
+    """
+    class Kind(models.TextChoices):
+        VOTER_BULK_VERIFY = 'VOTER_BULK_VERIFY', 'Bulk Voter Verification'
+        VOTE_RESET = 'VOTE_RESET', 'Election Vote Reset'
+        VOTER_IMPORT = 'VOTER_IMPORT', 'Voter Import'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        COMPLETED = 'COMPLETED', 'Completed'
+        FAILED = 'FAILED', 'Failed'
+
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    params = models.JSONField(default=dict, blank=True, help_text="Input of the job (filters, target ids).")
+    state = models.JSONField(default=dict, blank=True, help_text="Resume point and running totals.")
+    phase = models.CharField(max_length=50, blank=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='background_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Background Job'
+        verbose_name_plural = 'Background Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'kind']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    @property
+    def percent(self):
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(100, round(self.progress_done * 100 / self.progress_total))
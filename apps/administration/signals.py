@@ -0,0 +1,14 @@
+"""
+Cache invalidation for audit data.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.core.cache import AUDIT, bump_version_on_commit
+from .models import AuditLog
+
+
+@receiver(post_save, sender=AuditLog)
+def audit_log_saved(sender, instance, created, **kwargs):
+    if created:
+        bump_version_on_commit(AUDIT)
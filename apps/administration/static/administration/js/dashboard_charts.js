@@ -25,6 +25,9 @@ document.addEventListener('DOMContentLoaded', function() {
     const participationYearLabels = getData('participation-year-labels-data') || [];
     const participationYearCounts = getData('participation-year-counts-data') || [];
 
+    // Chart instances, updated in place when a section refreshes
+    const charts = {};
+
     // Chart.js default configuration
     Chart.defaults.font.family = "'Inter', sans-serif";
     Chart.defaults.color = '#64748b';
@@ -83,13 +86,13 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 1. Turnout Trend Chart (Line Chart)
     const turnoutTrendCanvas = document.getElementById('turnoutTrendChart');
-    if (turnoutTrendCanvas && turnoutHours.length > 0) {
+    if (turnoutTrendCanvas) {
         const ctx = turnoutTrendCanvas.getContext('2d');
         const gradient = ctx.createLinearGradient(0, 0, 0, 350);
         gradient.addColorStop(0, 'rgba(37, 99, 235, 0.3)');
         gradient.addColorStop(1, 'rgba(37, 99, 235, 0.05)');
 
-        new Chart(ctx, {
+        charts.turnout = new Chart(ctx, {
             type: 'line',
             data: {
                 labels: turnoutHours,
@@ -161,10 +164,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 2. Position Votes Chart (Horizontal Bar Chart)
     const positionVotesCanvas = document.getElementById('positionVotesChart');
-    if (positionVotesCanvas && positionLabels.length > 0) {
+    if (positionVotesCanvas) {
         const ctx = positionVotesCanvas.getContext('2d');
         
-        new Chart(ctx, {
+        charts.positions = new Chart(ctx, {
             type: 'bar',
             data: {
                 labels: positionLabels,
@@ -227,10 +230,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 3. Course Chart (Bar Chart)
     const courseCanvas = document.getElementById('courseChart');
-    if (courseCanvas && courseLabels.length > 0) {
+    if (courseCanvas) {
         const ctx = courseCanvas.getContext('2d');
         
-        new Chart(ctx, {
+        charts.course = new Chart(ctx, {
             type: 'bar',
             data: {
                 labels: courseLabels,
@@ -292,10 +295,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 4. Year Level Chart (Doughnut Chart)
     const yearCanvas = document.getElementById('yearChart');
-    if (yearCanvas && yearLabels.length > 0) {
+    if (yearCanvas) {
         const ctx = yearCanvas.getContext('2d');
         
-        new Chart(ctx, {
+        charts.year = new Chart(ctx, {
             type: 'doughnut',
             data: {
                 labels: yearLabels,
@@ -349,10 +352,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 5. Participation by Course Chart
     const participationCourseCanvas = document.getElementById('participationCourseChart');
-    if (participationCourseCanvas && participationCourseLabels.length > 0) {
+    if (participationCourseCanvas) {
         const ctx = participationCourseCanvas.getContext('2d');
         
-        new Chart(ctx, {
+        charts.participationCourse = new Chart(ctx, {
             type: 'bar',
             data: {
                 labels: participationCourseLabels,
@@ -414,10 +417,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 6. Participation by Year Chart (Pie Chart)
     const participationYearCanvas = document.getElementById('participationYearChart');
-    if (participationYearCanvas && participationYearLabels.length > 0) {
+    if (participationYearCanvas) {
         const ctx = participationYearCanvas.getContext('2d');
         
-        new Chart(ctx, {
+        charts.participationYear = new Chart(ctx, {
             type: 'pie',
             data: {
                 labels: participationYearLabels,
@@ -519,11 +522,203 @@ document.addEventListener('DOMContentLoaded', function() {
         setInterval(updateLastUpdated, 1000);
     }
 
-    // Auto-refresh dashboard every 30 seconds (optional - can be enabled)
-    // Uncomment the following lines to enable auto-refresh
-    /*
-    setInterval(() => {
-        location.reload();
-    }, 30000);
-    */
+    // Section refresh
+    // Each dashboard section is fetched from its own JSON endpoint on its own
+    // interval. The server answers 304 while a section's version is unchanged,
+    // so idle sections cost a cache lookup rather than a recomputation.
+    const config = getData('dashboard-config');
+    if (!config) return;
+
+    const versions = Object.assign({}, config.versions || {});
+    const sectionAlerts = Object.assign({}, config.alerts || {});
+    let electionId = config.election_id;
+
+    const escapeHtml = (value) => String(value ?? '').replace(/[&<>"']/g, (c) => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    }[c]));
+
+    const lookup = (obj, path) => path.split('.').reduce((acc, key) => (acc == null ? acc : acc[key]), obj);
+
+    function setChartData(chart, labels, counts) {
+        if (!chart) return;
+        chart.data.labels = labels;
+        chart.data.datasets[0].data = counts;
+        chart.update();
+        const card = chart.canvas.closest('.chart-card');
+        if (card) card.hidden = labels.length === 0;
+    }
+
+    function renderAlerts() {
+        const container = document.getElementById('dashboard-alerts');
+        if (!container) return;
+        const alerts = ['summary', 'positions', 'turnout'].flatMap((name) => sectionAlerts[name] || []);
+        container.innerHTML = alerts.map((alert) => `
+            <div class="alert alert-${escapeHtml(alert.type)}">
+                <i class="fas fa-${escapeHtml(alert.icon)}"></i>
+                <span>${escapeHtml(alert.message)}</span>
+            </div>`).join('');
+        container.hidden = alerts.length === 0;
+    }
+
+    function timeSince(isoString) {
+        const seconds = Math.max(0, Math.floor((Date.now() - new Date(isoString)) / 1000));
+        const units = [['day', 86400], ['hour', 3600], ['minute', 60]];
+        for (const [unit, size] of units) {
+            const value = Math.floor(seconds / size);
+            if (value >= 1) return `${value} ${unit}${value > 1 ? 's' : ''}`;
+        }
+        return '0 minutes';
+    }
+
+    const renderers = {
+        summary(data) {
+            document.querySelectorAll('[data-summary]').forEach((element) => {
+                const value = lookup(data, element.dataset.summary);
+                element.textContent = value ?? element.dataset.default ?? 0;
+            });
+            if (data.election) {
+                const badge = document.getElementById('election-status-badge');
+                if (badge) badge.className = `badge badge-${data.election.status}`;
+                const fill = document.getElementById('election-turnout-fill');
+                if (fill) fill.style.width = `${data.election.turnout_percentage}%`;
+                countdownElements.forEach((element) => {
+                    element.dataset.endTime = data.election.end_time;
+                });
+            }
+            sectionAlerts.summary = data.alerts;
+        },
+
+        positions(data) {
+            setChartData(charts.positions, data.position_labels, data.position_counts);
+            sectionAlerts.positions = data.alerts;
+
+            const container = document.getElementById('positions-container');
+            if (!container) return;
+            if (data.positions_data.length === 0) {
+                container.innerHTML = `
+                    <div class="no-candidates">
+                        <i class="fas fa-info-circle"></i>
+                        <p>No votes cast yet</p>
+                    </div>`;
+                return;
+            }
+            const groups = data.positions_data.map((position) => {
+                const cards = position.candidates.map((candidate, index) => `
+                    <div class="candidate-card ${candidate.is_winner ? 'leading' : ''}">
+                        <div class="candidate-rank">
+                            ${candidate.is_winner ? '<i class="fas fa-crown"></i>' : `#${index + 1}`}
+                        </div>
+                        <div class="candidate-info">
+                            <div class="candidate-name">${escapeHtml(candidate.name)}</div>
+                            <div class="candidate-party">${escapeHtml(candidate.partylist)}</div>
+                        </div>
+                        <div class="candidate-stats">
+                            <div class="candidate-votes">${candidate.votes}</div>
+                            <div class="candidate-percentage">${candidate.percentage}%</div>
+                            <div class="candidate-progress">
+                                <div class="progress-bar mini">
+                                    <div class="progress-fill" style="width: ${candidate.percentage}%"></div>
+                                </div>
+                            </div>
+                        </div>
+                    </div>`).join('');
+                const plural = position.number_of_winners > 1 ? 's' : '';
+                return `
+                    <div class="position-group" style="margin-bottom: 2rem;">
+                        <h5 class="position-title" style="font-size: 1.1rem; color: #64748b; margin-bottom: 1rem; border-bottom: 1px solid #e2e8f0; padding-bottom: 0.5rem;">
+                            ${escapeHtml(position.name)}
+                            <span style="font-size: 0.85rem; color: #94a3b8; margin-left: 0.5rem; font-weight: normal;">
+                                (${position.number_of_winners} winner${plural})
+                            </span>
+                            <span style="float: right; font-size: 0.9rem; font-weight: normal;">${position.total_votes} votes</span>
+                        </h5>
+                        <div class="candidates-grid">${cards}</div>
+                    </div>`;
+            }).join('');
+            container.innerHTML = `
+                <div class="candidates-section">
+                    <h4>
+                        <i class="fas fa-trophy"></i>
+                        Leading Candidates by Position
+                    </h4>
+                    ${groups}
+                </div>`;
+        },
+
+        turnout(data) {
+            setChartData(charts.turnout, data.turnout_hours, data.turnout_counts);
+            sectionAlerts.turnout = data.alerts;
+        },
+
+        demographics(data) {
+            setChartData(charts.course, data.course_labels, data.course_counts);
+            setChartData(charts.year, data.year_labels, data.year_counts);
+            setChartData(charts.participationCourse, data.participation_course_labels, data.participation_course_counts);
+            setChartData(charts.participationYear, data.participation_year_labels, data.participation_year_counts);
+        },
+
+        activity(data) {
+            const body = document.getElementById('recent-activity-body');
+            if (!body) return;
+            if (data.recent_activity.length === 0) {
+                body.innerHTML = `
+                    <tr>
+                        <td colspan="4" class="text-center py-4" style="color: var(--admin-slate-500);">No recent activity found.</td>
+                    </tr>`;
+                return;
+            }
+            body.innerHTML = data.recent_activity.map((log) => `
+                <tr>
+                    <td>
+                        <div class="d-flex align-items-center gap-2">
+                            <div class="avatar-circle-sm" style="width: 32px; height: 32px; background: var(--admin-primary); color: white; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; font-size: 0.8rem;">
+                                ${escapeHtml((log.username || '?').charAt(0).toUpperCase())}
+                            </div>
+                            <span style="font-weight: 500; color: var(--admin-slate-900);">${escapeHtml(log.username || 'System')}</span>
+                        </div>
+                    </td>
+                    <td>
+                        <span class="badge badge-gray" style="background: var(--admin-slate-100); color: var(--admin-slate-700);">${escapeHtml(log.action)}</span>
+                    </td>
+                    <td style="color: var(--admin-slate-600);">${escapeHtml(log.details.length > 50 ? log.details.slice(0, 49) + '…' : log.details)}</td>
+                    <td style="color: var(--admin-slate-500); font-size: 0.9rem;">${timeSince(log.timestamp)} ago</td>
+                </tr>`).join('');
+        }
+    };
+
+    async function refreshSection(name) {
+        const url = new URL(config.endpoint.replace('__section__', name), window.location.origin);
+        if (electionId) url.searchParams.set('election_id', electionId);
+        const headers = { 'Accept': 'application/json' };
+        if (versions[name]) headers['If-None-Match'] = `"${name}-${electionId || 0}-${versions[name]}"`;
+
+        try {
+            const response = await fetch(url, { headers, cache: 'no-store', credentials: 'same-origin' });
+            if (response.status === 304 || !response.ok) return;
+            const payload = await response.json();
+            versions[name] = payload.version;
+            renderers[name](payload.data);
+            if (name in sectionAlerts) renderAlerts();
+        } catch (e) {
+            console.error(`Error refreshing ${name}:`, e);
+        }
+    }
+
+    Object.keys(renderers).forEach((name) => {
+        const seconds = (config.intervals || {})[name];
+        if (seconds) setInterval(() => refreshSection(name), seconds * 1000);
+    });
+
+    // Switching elections refreshes every section in place
+    const electionSelect = document.getElementById('election-select');
+    if (electionSelect) {
+        electionSelect.addEventListener('change', () => {
+            electionId = electionSelect.value;
+            Object.keys(versions).forEach((name) => delete versions[name]);
+            const pageUrl = new URL(window.location.href);
+            pageUrl.searchParams.set('election_id', electionId);
+            window.history.replaceState(null, '', pageUrl);
+            Object.keys(renderers).forEach(refreshSection);
+        });
+    }
 });
@@ -0,0 +1,74 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const dataElement = document.getElementById('comparison-chart-data');
+    const canvas = document.getElementById('comparisonChart');
+    if (!dataElement || !canvas) return;
+
+    const data = JSON.parse(dataElement.textContent);
+
+    Chart.defaults.font.family = "'Inter', sans-serif";
+    Chart.defaults.color = '#64748b';
+
+    new Chart(canvas.getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: data.labels,
+            datasets: [
+                {
+                    label: 'Turnout',
+                    data: data.turnout,
+                    backgroundColor: 'rgba(37, 99, 235, 0.85)',
+                    borderRadius: 8,
+                    borderSkipped: false
+                },
+                {
+                    label: 'Abstention',
+                    data: data.abstention,
+                    backgroundColor: 'rgba(249, 115, 22, 0.85)',
+                    borderRadius: 8,
+                    borderSkipped: false
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    max: 100,
+                    grid: {
+                        color: 'rgba(226, 232, 240, 0.5)',
+                        drawBorder: false
+                    },
+                    ticks: {
+                        callback: (value) => `${value}%`
+                    }
+                },
+                x: {
+                    grid: {
+                        display: false,
+                        drawBorder: false
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: true,
+                    position: 'bottom',
+                    labels: {
+                        usePointStyle: true,
+                        pointStyle: 'circle'
+                    }
+                },
+                tooltip: {
+                    backgroundColor: 'rgba(15, 23, 42, 0.95)',
+                    padding: 12,
+                    cornerRadius: 8,
+                    callbacks: {
+                        label: (context) => `${context.dataset.label}: ${context.parsed.y}%`
+                    }
+                }
+            }
+        }
+    });
+});
@@ -0,0 +1,36 @@
+/**
+ * Background job progress banners.
+ *
+ * Polls the job status endpoint for every element rendered by
+ * includes/job_progress.html until the job finishes.
+ */
+document.addEventListener('DOMContentLoaded', function() {
+    const POLL_MS = 1500;
+
+    document.querySelectorAll('[data-job-status-url]').forEach(function(banner) {
+        if (banner.dataset.jobFinished === 'true') return;
+
+        const text = banner.querySelector('.job-progress-text');
+        const bar = banner.querySelector('.job-progress-bar');
+
+        function poll() {
+            fetch(banner.dataset.jobStatusUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+                .then(response => response.json())
+                .then(job => {
+                    bar.value = job.percent;
+                    if (job.status === 'FAILED') {
+                        text.textContent = `Failed: ${job.error}`;
+                    } else if (job.finished) {
+                        const summary = job.result && job.result.summary ? job.result.summary : 'Completed.';
+                        text.textContent = `${summary} Reload the page to see the changes.`;
+                    } else {
+                        const phase = job.phase ? ` (${job.phase})` : '';
+                        text.textContent = `Running${phase} — ${job.done} of ${job.total}`;
+                        setTimeout(poll, POLL_MS);
+                    }
+                })
+                .catch(error => console.error('Job status failed:', error));
+        }
+        poll();
+    });
+});
@@ -0,0 +1,80 @@
+/**
+ * Student picker autocomplete.
+ *
+ * Enhances every <select data-autocomplete-url> rendered by
+ * StudentAutocompleteWidget: typing into the linked search box fetches the
+ * top matches from the voter search endpoint and replaces the select's
+ * options with them. Only the chosen student's id is submitted.
+ */
+document.addEventListener('DOMContentLoaded', function() {
+    const MIN_CHARS = 2;
+    const DEBOUNCE_MS = 250;
+
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(function(select) {
+        const input = document.getElementById(select.dataset.searchInput);
+        if (!input) return;
+
+        const url = select.dataset.autocompleteUrl;
+        const limit = select.dataset.autocompleteLimit || 10;
+        const emptyOption = Array.from(select.options).find(option => !option.value);
+        let debounceTimer = null;
+        let controller = null;
+
+        function setOptions(results, term) {
+            const current = select.value;
+            select.innerHTML = '';
+            if (emptyOption) select.add(emptyOption);
+
+            results.forEach(function(result) {
+                const option = new Option(result.label, result.id);
+                option.selected = String(result.id) === current;
+                select.add(option);
+            });
+
+            if (results.length === 0) {
+                const noMatch = new Option('No students found matching "' + term + '"', '');
+                noMatch.disabled = true;
+                select.add(noMatch);
+            }
+            select.size = Math.min(Math.max(select.options.length, 2), 8);
+        }
+
+        function search() {
+            const term = input.value.trim();
+            if (term.length < MIN_CHARS) return;
+
+            if (controller) controller.abort();
+            controller = new AbortController();
+
+            const params = new URLSearchParams({ q: term, limit: limit });
+            fetch(`${url}?${params.toString()}`, {
+                headers: { 'X-Requested-With': 'XMLHttpRequest' },
+                signal: controller.signal
+            })
+                .then(response => response.json())
+                .then(data => setOptions(data.results, term))
+                .catch(error => {
+                    if (error.name !== 'AbortError') {
+                        console.error('Student search failed:', error);
+                    }
+                });
+        }
+
+        input.addEventListener('input', function() {
+            clearTimeout(debounceTimer);
+            debounceTimer = setTimeout(search, DEBOUNCE_MS);
+        });
+
+        input.addEventListener('keydown', function(e) {
+            // Enter picks the top match instead of submitting the form
+            if (e.key === 'Enter') {
+                e.preventDefault();
+                const first = Array.from(select.options).find(option => option.value && !option.disabled);
+                if (first) {
+                    select.value = first.value;
+                    select.dispatchEvent(new Event('change'));
+                }
+            }
+        });
+    });
+});
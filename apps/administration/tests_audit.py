@@ -0,0 +1,197 @@
+import json
+import tempfile
+from io import StringIO
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import ElectionAdmin
+from apps.administration import audit
+from apps.administration.models import AuditLog, AuditLogArchive
+from apps.core.cache import AUDIT, get_version
+
+
+class AuditRecordTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin')
+
+    def test_written_when_transaction_commits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit.record('ELECTION_CREATED', 'Created election: Council', user=self.user, ip_address='10.0.0.1')
+
+        log = AuditLog.objects.get()
+        self.assertEqual((log.user, log.action, log.ip_address), (self.user, 'ELECTION_CREATED', '10.0.0.1'))
+
+    def test_rolled_back_action_is_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    audit.record('ELECTION_DELETED', 'Deleted election: Council', user=self.user)
+                    raise DatabaseError('delete failed')
+            except DatabaseError:
+                pass
+        self.assertFalse(AuditLog.objects.exists())
+
+
+@override_settings(AUDIT_LOG_ASYNC=True, AUDIT_LOG_BATCH_SIZE=100, AUDIT_LOG_FLUSH_INTERVAL=3600)
+class AuditWriterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin')
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        self.spool_dir = Path(spool_dir.name)
+        self.enterContext(override_settings(AUDIT_LOG_SPOOL_DIR=spool_dir.name))
+
+        # A private writer without its background thread; tests flush by hand
+        self.writer = audit.AuditWriter()
+        self.enterContext(patch.object(audit, 'writer', self.writer))
+        self.enterContext(patch.object(audit.AuditWriter, '_ensure_thread'))
+
+    def record(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                audit.record('LOGIN', f'login {i}', user=self.user)
+
+    def test_entries_are_batched_until_flushed(self):
+        self.record(5)
+        self.assertFalse(AuditLog.objects.exists())
+
+        version = get_version(AUDIT)
+        with self.assertNumQueries(1):
+            self.assertEqual(audit.flush(), 5)
+        self.assertEqual(AuditLog.objects.count(), 5)
+        self.assertGreater(get_version(AUDIT), version)
+
+    def test_keeps_time_of_the_action(self):
+        recorded_at = timezone.now() - timedelta(minutes=5)
+        with patch('apps.administration.audit.timezone.now', return_value=recorded_at):
+            self.record(1)
+        audit.flush()
+        self.assertEqual(AuditLog.objects.get().timestamp, recorded_at)
+
+    def test_failed_batch_is_spooled_and_replayed(self):
+        self.record(3)
+        with patch.object(AuditLog.objects, 'bulk_create', side_effect=DatabaseError('table locked')):
+            audit.flush()
+        self.assertFalse(AuditLog.objects.exists())
+        self.assertEqual(len(list(self.spool_dir.glob('*.jsonl'))), 1)
+
+        self.assertEqual(audit.replay_spool(), 3)
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list('details', flat=True)), ['login 0', 'login 1', 'login 2'])
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+
+class AuditRetentionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin')
+        now = timezone.now()
+        AuditLog.objects.bulk_create(
+            AuditLog(user=self.user, action='LOGIN', details=f'old {i}', timestamp=now - timedelta(days=200 + i))
+            for i in range(5))
+        AuditLog.objects.create(user=self.user, action='LOGIN', details='recent', timestamp=now - timedelta(days=1))
+
+    def test_old_entries_move_to_archive(self):
+        old_ids = set(AuditLog.objects.exclude(details='recent').values_list('pk', flat=True))
+        version = get_version(AUDIT)
+
+        self.assertEqual(audit.archive_before(timezone.now() - timedelta(days=180), batch_size=2), 5)
+
+        self.assertEqual(list(AuditLog.objects.values_list('details', flat=True)), ['recent'])
+        self.assertEqual(set(AuditLogArchive.objects.values_list('pk', flat=True)), old_ids)
+        self.assertEqual(AuditLogArchive.objects.filter(user=self.user).count(), 5)
+        self.assertGreater(get_version(AUDIT), version)
+
+    def test_command_respects_dry_run_and_archive_retention(self):
+        call_command('prune_audit_log', keep_days=180, dry_run=True, stdout=StringIO())
+        self.assertEqual(AuditLog.objects.count(), 6)
+
+        call_command('prune_audit_log', keep_days=180, purge_archive_after_days=202, stdout=StringIO())
+        self.assertEqual(AuditLog.objects.count(), 1)
+        # Entries 200 and 201 days old are archived, older ones purged
+        self.assertEqual(sorted(AuditLogArchive.objects.values_list('details', flat=True)), ['old 0', 'old 1'])
+
+
+class AuditLogViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+        self.other = User.objects.create_user(username='other')
+
+        start = timezone.make_aware(datetime(2025, 3, 1, 12))
+        AuditLog.objects.bulk_create(
+            AuditLog(user=self.admin_user if i % 2 else self.other, action='VOTER_VERIFIED' if i % 3 else 'LOGIN',
+                     details=f'entry {i}', timestamp=start + timedelta(days=i))
+            for i in range(120))
+        self.url = reverse('administration:audit_log')
+
+    def details(self, response):
+        return [log.details for log in response.context['logs']]
+
+    def test_keyset_pages_walk_newest_first(self):
+        seen = []
+        params = {}
+        while True:
+            response = self.client.get(self.url, params)
+            seen += self.details(response)
+            page = response.context['page_obj']
+            if not page.has_next:
+                break
+            params = {'after': page.next_cursor}
+        self.assertEqual(seen, [f'entry {i}' for i in reversed(range(120))])
+
+    def test_filters_by_action_user_and_date_range(self):
+        response = self.client.get(self.url, {
+            'action': 'LOGIN', 'user': 'other', 'date_from': '2025-03-01', 'date_to': '2025-03-13'})
+        # LOGIN entries are multiples of 3, ``other`` has the even ones, day 12 is included
+        self.assertEqual(self.details(response), ['entry 12', 'entry 6', 'entry 0'])
+        self.assertIn('LOGIN', response.context['actions'])
+
+    def test_invalid_date_matches_nothing(self):
+        response = self.client.get(self.url, {'date_from': '2025-02-30'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.details(response), [])
+
+    def test_searches_archive(self):
+        audit.archive_before(timezone.make_aware(datetime(2025, 3, 3)))
+        response = self.client.get(self.url, {'source': 'archive'})
+        self.assertEqual(self.details(response), ['entry 1', 'entry 0'])
+
+    def export(self, **params):
+        url = reverse('administration:audit_log_export')
+        session = self.client.session
+        session[f'verified_action_{url}'] = True
+        session.save()
+        response = self.client.get(url, params)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_streams_every_matching_entry(self):
+        lines = self.export(format='csv').splitlines()
+        self.assertEqual(lines[0], 'ID,Time,User,Action,Details,IP Address')
+        self.assertEqual(len(lines), 121)
+        self.assertIn(',entry 119,', lines[1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            records = [json.loads(line) for line in self.export(
+                format='ndjson', action='LOGIN', user='other', date_to='2025-03-13').splitlines()]
+        self.assertEqual([r['details'] for r in records], ['entry 12', 'entry 6', 'entry 0'])
+        self.assertEqual(records[0]['user'], 'other')
+        audit.flush()
+        self.assertTrue(AuditLog.objects.filter(
+            action='DATA_EXPORT', details__startswith='Exported 3 audit entries').exists())
+
+    def test_export_requires_password_verification(self):
+        response = self.client.get(reverse('administration:audit_log_export'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/administration/verify-password/', response.url)
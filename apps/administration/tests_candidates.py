@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile, ElectionAdmin
+from apps.administration.forms import CandidateForm, ElectionAdminForm
+from apps.elections.models import Election, Position, Candidate
+
+
+class StudentPickerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name='Student Council', start_time=now, end_time=now + timedelta(days=1))
+        self.position = Position.objects.create(name='President', order_on_ballot=1)
+        self.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'student{i}', first_name='Student', last_name=str(i)),
+                student_id=f'S{i:03d}', year_level=1, course='BSIT')
+            for i in range(40)
+        ]
+
+    def test_create_page_does_not_list_students(self):
+        response = self.client.get(reverse('administration:candidate_create'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'S039')
+        self.assertContains(response, 'data-autocomplete-url="%s"' % reverse('administration:api_voter_search'))
+
+    def test_rendering_cost_is_independent_of_student_count(self):
+        form = CandidateForm()
+        with self.assertNumQueries(0):
+            html = str(form['student_profile'])
+        self.assertEqual(html.count('<option'), 1)
+
+    def test_selected_student_is_rendered(self):
+        student = self.students[7]
+        form = CandidateForm(initial={'student_profile': student.pk})
+        with self.assertNumQueries(1):
+            html = str(form['student_profile'])
+        self.assertIn('Student 7 (S007)', html)
+        self.assertIn('selected', html)
+
+    def test_post_resolves_chosen_student(self):
+        form = CandidateForm(data={
+            'student_profile': self.students[3].pk,
+            'election': self.election.pk,
+            'position': self.position.pk,
+            'is_approved': 'on',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        candidate = form.save()
+        self.assertEqual(candidate.student_profile, self.students[3])
+        self.assertEqual(Candidate.objects.count(), 1)
+
+    def test_invalid_choice(self):
+        form = CandidateForm(data={
+            'student_profile': 'abc', 'election': self.election.pk, 'position': self.position.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('student_profile', form.errors)
+
+    def test_admin_form_picker(self):
+        form = ElectionAdminForm()
+        self.assertEqual(str(form['student_profile']).count('<option'), 1)
+
+    def test_search_endpoint_labels(self):
+        response = self.client.get(reverse('administration:api_voter_search'), {'q': 'S012'})
+        self.assertEqual(response.json()['results'][0]['label'], 'Student 12 (S012)')
+
+
+class CandidateListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+
+        now = timezone.now()
+        self.old = Election.objects.create(
+            name='2024 Council', start_time=now - timedelta(days=400), end_time=now - timedelta(days=399))
+        self.new = Election.objects.create(
+            name='2025 Council', start_time=now, end_time=now + timedelta(days=1))
+        self.president = Position.objects.create(name='President', order_on_ballot=1)
+        self.secretary = Position.objects.create(name='Secretary', order_on_ballot=2)
+
+        self.candidates = []
+        i = 0
+        for election in (self.old, self.new):
+            for position in (self.secretary, self.president):
+                for _ in range(15):
+                    profile = StudentProfile.objects.create(
+                        user=User.objects.create_user(username=f'cand{i}', first_name='Cand', last_name=f'N{i}'),
+                        student_id=f'C{i:03d}', year_level=3, course='BSCS')
+                    self.candidates.append(Candidate.objects.create(
+                        student_profile=profile, position=position, election=election,
+                        is_approved=(i % 2 == 0)))
+                    i += 1
+
+    def get(self, **params):
+        response = self.client.get(reverse('administration:candidates'), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_first_page_order(self):
+        response = self.get()
+        rows = response.context['candidates']
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(response.context['total_count'], 60)
+        # Newest election first, then ballot order
+        self.assertTrue(all(c.election == self.new for c in rows))
+        self.assertEqual([c.position for c in rows[:15]], [self.president] * 15)
+
+    def test_pages_cover_every_candidate_once(self):
+        seen = []
+        params = {}
+        while True:
+            page = self.get(**params).context['page_obj']
+            seen.extend(c.pk for c in page)
+            if not page.has_next:
+                break
+            params = {'after': page.next_cursor}
+        self.assertEqual(sorted(seen), sorted(c.pk for c in self.candidates))
+
+    def test_vote_counts(self):
+        from apps.elections.models import Vote
+        target = self.candidates[-1]
+        Vote.objects.create(election=self.new, candidate=target)
+        Vote.objects.create(election=self.new, candidate=target)
+        rows = self.get(election=self.new.pk, position=self.president.pk).context['candidates']
+        counts = {c.pk: c.vote_count for c in rows}
+        self.assertEqual(counts[target.pk], 2)
+        self.assertEqual(sum(counts.values()), 2)
+
+    def test_filters_and_facet_count(self):
+        response = self.get(election=self.old.pk, status='approved')
+        self.assertEqual(response.context['total_count'], 15)
+        self.assertTrue(all(c.is_approved and c.election == self.old for c in response.context['candidates']))
+
+    def test_search(self):
+        response = self.get(search='N42')
+        self.assertEqual([c.student_profile.student_id for c in response.context['candidates']], ['C042'])
+        self.assertEqual(response.context['total_count'], 1)
+
+    def test_query_count_does_not_grow_with_history(self):
+        cursor = self.get().context['page_obj'].next_cursor  # also warms the facets
+        with self.assertNumQueries(4):
+            self.get(after=cursor)
+
+    def test_new_partylist_refreshes_facets(self):
+        from apps.elections.models import Partylist
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Partylist.objects.create(name='Unity Party', short_code='UNI')
+        self.assertContains(self.get(), 'Unity Party')
@@ -0,0 +1,186 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile, ElectionAdmin
+from apps.administration import dashboard as dashboard_data
+from apps.elections.models import Election, Position, Candidate, Vote, VoterReceipt
+
+
+class DashboardSectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name='Student Council', start_time=now - timedelta(hours=2),
+            end_time=now + timedelta(days=1), is_active=True
+        )
+        self.position = Position.objects.create(name='President', order_on_ballot=1, number_of_winners=1)
+        self.candidates = []
+        for i in range(2):
+            user = User.objects.create_user(username=f'cand{i}', first_name='Cand', last_name=str(i))
+            profile = StudentProfile.objects.create(user=user, student_id=f'C{i}', year_level=1)
+            self.candidates.append(Candidate.objects.create(
+                student_profile=profile, position=self.position, election=self.election))
+
+        self.voter = StudentProfile.objects.create(
+            user=User.objects.create_user(username='voter'), student_id='V1', year_level=2,
+            course='BSIT', is_eligible_to_vote=True
+        )
+
+    def section_url(self, section):
+        url = reverse('administration:api_dashboard_section', args=[section])
+        return f'{url}?election_id={self.election.pk}'
+
+    def cast_vote(self, candidate):
+        with self.captureOnCommitCallbacks(execute=True):
+            ballot_id = uuid.uuid4()
+            VoterReceipt.objects.create(
+                voter=self.voter, election=self.election, ballot_id=ballot_id, encrypted_choices='x')
+            Vote.objects.create(election=self.election, candidate=candidate, ballot_id=ballot_id)
+
+    def test_dashboard_renders_sections(self):
+        self.cast_vote(self.candidates[1])
+        response = self.client.get(reverse('administration:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_votes_cast'], 1)
+        positions = response.context['election_analytics'][0]['positions_data']
+        self.assertEqual(positions[0]['candidates'][0]['votes'], 1)
+        self.assertIn('dashboard_config', response.context)
+
+    def test_section_payload(self):
+        self.cast_vote(self.candidates[0])
+        response = self.client.get(self.section_url('positions'))
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload['section'], 'positions')
+        self.assertEqual(payload['data']['position_labels'], ['President'])
+        self.assertEqual(payload['data']['position_counts'], [1])
+
+    def test_turnout_counts_current_hour(self):
+        self.cast_vote(self.candidates[0])
+        data = self.client.get(self.section_url('turnout')).json()['data']
+        self.assertEqual(len(data['turnout_counts']), 24)
+        self.assertEqual(data['turnout_counts'][-1], 1)
+        self.assertEqual(sum(data['turnout_counts']), 1)
+
+    def test_unchanged_section_returns_304(self):
+        response = self.client.get(self.section_url('summary'))
+        etag = response['ETag']
+        response = self.client.get(self.section_url('summary'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_section_etag_expires_with_ttl(self):
+        etag = self.client.get(self.section_url('activity'))['ETag']
+        later = time.time() + dashboard_data.SECTION_TTLS['activity']
+        with patch('apps.administration.dashboard.time.time', return_value=later):
+            response = self.client.get(self.section_url('activity'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_vote_invalidates_section(self):
+        response = self.client.get(self.section_url('summary'))
+        etag = response['ETag']
+        self.assertEqual(response.json()['data']['total_votes_cast'], 0)
+
+        self.cast_vote(self.candidates[0])
+        response = self.client.get(self.section_url('summary'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['total_votes_cast'], 1)
+
+    def test_unknown_section(self):
+        response = self.client.get(reverse('administration:api_dashboard_section', args=['nope']))
+        self.assertEqual(response.status_code, 404)
+
+
+class ElectionComparisonTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+
+        now = timezone.now()
+        self.closed = Election.objects.create(
+            name='2024 Council', start_time=now - timedelta(days=30), end_time=now - timedelta(days=29))
+        self.open = Election.objects.create(
+            name='2025 Council', start_time=now - timedelta(hours=1), end_time=now + timedelta(days=1),
+            is_active=True)
+        position = Position.objects.create(name='President', order_on_ballot=1, number_of_winners=1)
+
+        self.voters = []
+        for i, course in enumerate(['BSIT', 'BSIT', 'BSCS']):
+            self.voters.append(StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'), student_id=f'V{i}',
+                year_level=i + 1, course=course))
+
+        for election in (self.closed, self.open):
+            profile = StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'cand{election.pk}'), student_id=f'C{election.pk}',
+                year_level=4, is_eligible_to_vote=False)
+            candidate = Candidate.objects.create(student_profile=profile, position=position, election=election)
+            setattr(self, f'candidate_{election.pk}', candidate)
+
+        # Two ballots in the closed election, one of them blank
+        for voter in self.voters[:2]:
+            ballot_id = uuid.uuid4()
+            VoterReceipt.objects.create(
+                voter=voter, election=self.closed, ballot_id=ballot_id, encrypted_choices='x')
+        Vote.objects.create(election=self.closed, candidate=getattr(self, f'candidate_{self.closed.pk}'))
+
+    def rows(self):
+        response = self.client.get(reverse('administration:api_election_comparison'))
+        self.assertEqual(response.status_code, 200)
+        return {row['name']: row for row in response.json()['elections']}
+
+    def test_comparison_figures(self):
+        rows = self.rows()
+        closed = rows['2024 Council']
+        self.assertEqual(closed['eligible_voters'], 3)
+        self.assertEqual(closed['ballots_cast'], 2)
+        self.assertEqual(closed['turnout_percentage'], 66.67)
+        self.assertEqual(closed['abstention_rate'], 50.0)
+        self.assertEqual(closed['participation_by_course'], {'BSIT': 2})
+        self.assertEqual(closed['participation_by_year'], {'1': 1, '2': 1})
+        self.assertEqual(rows['2025 Council']['ballots_cast'], 0)
+
+    def test_closed_election_is_snapshotted(self):
+        from apps.elections.models import ElectionSnapshot
+        from apps.elections.services import get_comparative_stats
+
+        get_comparative_stats()
+        self.assertTrue(ElectionSnapshot.objects.filter(election=self.closed).exists())
+        self.assertFalse(ElectionSnapshot.objects.filter(election=self.open).exists())
+
+        # Snapshotted elections are not recounted
+        with self.assertNumQueries(5):
+            rows = {row['name']: row for row in get_comparative_stats()}
+        self.assertTrue(rows['2024 Council']['from_snapshot'])
+        self.assertEqual(rows['2024 Council']['ballots_cast'], 2)
+
+    def test_reopening_election_drops_snapshot(self):
+        from apps.elections.models import ElectionSnapshot
+        from apps.elections.services import get_comparative_stats
+
+        get_comparative_stats()
+        self.closed.end_time = timezone.now() + timedelta(days=1)
+        self.closed.save()
+        self.assertFalse(ElectionSnapshot.objects.filter(election=self.closed).exists())
+
+    def test_comparison_page(self):
+        response = self.client.get(reverse('administration:election_comparison'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '2024 Council')
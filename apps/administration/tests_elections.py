@@ -0,0 +1,148 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile, ElectionAdmin
+from apps.administration import jobs
+from apps.administration.models import AuditLog, BackgroundJob
+from apps.elections.models import Election, ElectionSnapshot, Position, Candidate, Vote, VoterReceipt
+from apps.elections.services import get_comparative_stats
+
+
+class ElectionResetVotesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name='2024 Council', start_time=now - timedelta(days=30), end_time=now - timedelta(days=29))
+        self.other = Election.objects.create(
+            name='2025 Council', start_time=now - timedelta(hours=1), end_time=now + timedelta(days=1))
+        position = Position.objects.create(name='President', order_on_ballot=1, number_of_winners=1)
+        voters = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'), student_id=f'V{i}', year_level=1, course='BSIT')
+            for i in range(5)
+        ]
+        for election in (self.election, self.other):
+            profile = StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'cand{election.pk}'), student_id=f'C{election.pk}',
+                year_level=4)
+            candidate = Candidate.objects.create(student_profile=profile, position=position, election=election)
+            for voter in voters:
+                ballot_id = uuid.uuid4()
+                VoterReceipt.objects.create(voter=voter, election=election, ballot_id=ballot_id, encrypted_choices='x')
+                Vote.objects.create(election=election, candidate=candidate, ballot_id=ballot_id)
+
+        self.url = reverse('administration:election_reset_votes', args=[self.election.pk])
+        session = self.client.session
+        session[f'verified_action_{self.url}'] = True
+        session.save()
+
+    def reset(self):
+        with patch.object(jobs, 'RUN_IN_THREAD', False), patch.object(jobs, 'VOTE_RESET_BATCH_SIZE', 2), \
+                self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url)
+
+    def test_reset_runs_as_batched_job(self):
+        response = self.reset()
+
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, f"{reverse('administration:elections')}?job={job.pk}",
+                             fetch_redirect_response=False)
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual((job.progress_done, job.progress_total), (10, 10))
+        self.assertEqual(job.state['result']['votes'], 5)
+
+        self.assertFalse(Vote.objects.filter(election=self.election).exists())
+        self.assertFalse(VoterReceipt.objects.filter(election=self.election).exists())
+        self.assertEqual(Vote.objects.filter(election=self.other).count(), 5)
+        self.assertEqual(VoterReceipt.objects.filter(election=self.other).count(), 5)
+
+    def test_refused_while_election_accepts_ballots(self):
+        Election.objects.filter(pk=self.election.pk).update(
+            is_active=True, end_time=timezone.now() + timedelta(hours=1))
+        response = self.reset()
+        self.assertRedirects(response, reverse('administration:elections'), fetch_redirect_response=False)
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 5)
+
+    def test_job_stops_if_election_is_activated(self):
+        job = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTE_RESET, params={'election_id': self.election.pk})
+        Election.objects.filter(pk=self.election.pk).update(
+            is_active=True, end_time=timezone.now() + timedelta(hours=1))
+        job = jobs.run_job(job.pk)
+        self.assertEqual(job.status, BackgroundJob.Status.FAILED)
+        self.assertIn('accepting ballots', job.error)
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 5)
+        self.assertEqual(VoterReceipt.objects.filter(election=self.election).count(), 5)
+
+    def test_audit_record_per_phase(self):
+        self.reset()
+        self.assertEqual(
+            list(AuditLog.objects.order_by('pk').values_list('action', flat=True)),
+            ['ELECTION_RESET_STARTED', 'ELECTION_RESET_VOTES_DELETED', 'ELECTION_RESET_RECEIPTS_DELETED',
+             'ELECTION_RESET'])
+
+    def test_reset_invalidates_snapshot_and_cached_results(self):
+        get_comparative_stats()
+        self.assertTrue(ElectionSnapshot.objects.filter(election=self.election).exists())
+        comparison_url = reverse('administration:api_election_comparison')
+        self.assertEqual(self.client.get(comparison_url).json()['elections'][0]['ballots_cast'], 5)
+
+        self.reset()
+
+        self.assertFalse(ElectionSnapshot.objects.filter(election=self.election).exists())
+        rows = {row['name']: row for row in self.client.get(comparison_url).json()['elections']}
+        self.assertEqual(rows['2024 Council']['ballots_cast'], 0)
+        self.assertEqual(rows['2025 Council']['ballots_cast'], 5)
+
+    def test_interrupted_reset_skips_completed_phases(self):
+        Vote.objects.filter(election=self.election).delete()
+        job = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTE_RESET,
+            status=BackgroundJob.Status.RUNNING,
+            params={'election_id': self.election.pk},
+            state={'completed_phases': ['votes'], 'deleted': {'votes': 5}},
+            progress_done=5,
+            progress_total=10,
+        )
+        # Its runner died: no progress for longer than STALE_AFTER
+        BackgroundJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.run_job(job.pk)
+
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual(job.progress_done, 10)
+        self.assertFalse(VoterReceipt.objects.filter(election=self.election).exists())
+        self.assertFalse(AuditLog.objects.filter(action='ELECTION_RESET_VOTES_DELETED').exists())
+        self.assertTrue(AuditLog.objects.filter(action='ELECTION_RESET_RECEIPTS_DELETED').exists())
+
+    def test_no_second_reset_while_running(self):
+        running = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTE_RESET, status=BackgroundJob.Status.RUNNING,
+            params={'election_id': self.election.pk})
+        response = self.reset()
+
+        self.assertRedirects(response, f"{reverse('administration:elections')}?job={running.pk}",
+                             fetch_redirect_response=False)
+        self.assertEqual(BackgroundJob.objects.count(), 1)
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 5)
+
+    def test_election_list_shows_progress(self):
+        self.reset()
+        job = BackgroundJob.objects.get()
+        response = self.client.get(reverse('administration:elections'), {'job': job.pk})
+        self.assertEqual(response.context['reset_job'], job)
+        self.assertContains(response, 'Deleted 5 votes and 5 receipts')
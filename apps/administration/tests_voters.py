@@ -0,0 +1,319 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile, ElectionAdmin
+from apps.administration import jobs
+from apps.administration.models import AuditLog, BackgroundJob
+
+
+class VoterListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+        self.url = reverse('administration:voters')
+
+        for i in range(60):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'),
+                student_id=f'2024-{i:04d}',
+                year_level=1 + i % 4,
+                course='BSIT' if i % 2 else 'BSCS',
+                verification_status='PENDING' if i < 5 else 'VERIFIED',
+            )
+
+    def test_pages_through_all_voters(self):
+        response = self.client.get(self.url)
+        seen = [v.student_id for v in response.context['voters']]
+        while response.context['page_obj'].has_next:
+            response = self.client.get(self.url, {'after': response.context['page_obj'].next_cursor})
+            seen.extend(v.student_id for v in response.context['voters'])
+        self.assertEqual(seen, [f'2024-{i:04d}' for i in range(60)])
+
+    def test_facet_counts(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['total_filtered_count'], 60)
+        self.assertEqual(response.context['pending_count'], 5)
+        self.assertEqual(response.context['courses'], ['BSCS', 'BSIT'])
+        self.assertEqual(response.context['year_levels'], [1, 2, 3, 4])
+
+        response = self.client.get(self.url, {'course': 'BSIT', 'year_level': '2'})
+        self.assertEqual(response.context['total_filtered_count'], 15)
+        self.assertTrue(all(v.course == 'BSIT' and v.year_level == 2 for v in response.context['voters']))
+
+    def test_filters_kept_in_page_links(self):
+        response = self.client.get(self.url, {'course': 'BSIT'})
+        self.assertContains(response, 'course=BSIT&amp;after=')
+
+    def test_deep_page_query_count_matches_first_page(self):
+        self.client.get(self.url)  # warm the facet cache and session
+        first = self.client.get(self.url)
+        cursor = first.context['page_obj'].next_cursor
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as first_page:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as deep_page:
+            self.client.get(self.url, {'after': cursor})
+        self.assertEqual(len(first_page), len(deep_page))
+
+
+class VoterImportViewTests(TestCase):
+    CSV_HEADER = 'student_id,first_name,last_name,email,course,year_level\n'
+
+    def setUp(self):
+        cache.clear()
+        import_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(import_dir.cleanup)
+        self.enterContext(override_settings(VOTER_IMPORT_DIR=import_dir.name))
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+        self.url = reverse('administration:voter_import')
+
+    def upload(self, content, **options):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        data = {'file': SimpleUploadedFile('voters.csv', content.encode(), content_type='text/csv')}
+        data.update(options)
+        with patch.object(jobs, 'RUN_IN_THREAD', False), self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data)
+
+    def test_dry_run_shows_report(self):
+        response = self.upload(
+            self.CSV_HEADER +
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1\n'
+            '2024-0002,John,Roe,bad,BSIT,1\n',
+            dry_run='on')
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, f'{self.url}?job={job.pk}')
+        response = self.client.get(response.url)
+        self.assertEqual(response.context['report']['valid_count'], 1)
+        self.assertContains(response, "invalid email")
+        self.assertFalse(StudentProfile.objects.exists())
+        self.assertEqual(os.listdir(settings.VOTER_IMPORT_DIR), [])
+
+    def test_import(self):
+        response = self.upload(self.CSV_HEADER + '2024-0001,Jane,Doe,jane@school.edu,BSIT,1\n')
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, f'{self.url}?job={job.pk}')
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual(job.state['result']['created'], 1)
+        profile = StudentProfile.objects.get(student_id='2024-0001')
+        self.assertEqual(profile.verified_by, self.admin_user)
+        self.assertFalse(profile.user.has_usable_password())
+        self.assertTrue(AuditLog.objects.filter(action='VOTERS_IMPORTED').exists())
+
+    def test_invalid_rows_block_import(self):
+        self.upload(
+            self.CSV_HEADER +
+            '2024-0001,Jane,Doe,jane@school.edu,BSIT,1\n'
+            '2024-0002,John,Roe,bad,BSIT,1\n')
+        result = BackgroundJob.objects.get().state['result']
+        self.assertFalse(result['imported'])
+        self.assertEqual(result['error_count'], 1)
+        self.assertFalse(StudentProfile.objects.exists())
+
+    def test_interrupted_import_resumes(self):
+        from apps.accounts import importer
+        path = os.path.join(settings.VOTER_IMPORT_DIR, 'voters.csv')
+        with open(path, 'w') as f:
+            f.write(self.CSV_HEADER + ''.join(
+                f'2024-000{i},Student,{i},s{i}@school.edu,BSIT,1\n' for i in range(3)))
+        # The first row was imported before the process died
+        with open(path, 'rb') as f:
+            first = importer.validate_file(f, 'voters.csv')
+        first.rows = first.rows[:1]
+        importer.import_voters(first)
+        job = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTER_IMPORT,
+            status=BackgroundJob.Status.RUNNING,
+            params={'file': 'voters.csv', 'filename': 'voters.csv', 'dry_run': False,
+                    'skip_invalid': False, 'send_emails': False},
+            state={'validation': {'total_rows': 3, 'valid_count': 3, 'error_count': 0, 'errors': []},
+                   'created': 1},
+            phase='importing',
+            created_by=self.admin_user,
+        )
+        BackgroundJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        job = jobs.run_job(job.pk)
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual(job.state['result']['created'], 3)
+        self.assertEqual(job.state['result']['error_count'], 0)
+        self.assertEqual(StudentProfile.objects.count(), 3)
+        self.assertFalse(os.path.exists(path))
+
+    def test_rejects_unknown_file_type(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        response = self.client.post(self.url, {'file': SimpleUploadedFile('voters.pdf', b'x')})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+
+class VoterBulkVerifyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+        self.url = reverse('administration:voter_bulk_verify')
+
+        for i in range(10):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'),
+                student_id=f'2024-{i:04d}',
+                year_level=1,
+                course='BSIT' if i % 2 else 'BSCS',
+                verification_status='PENDING',
+            )
+
+    def _post_filtered(self, **filters):
+        with patch.object(jobs, 'RUN_IN_THREAD', False), self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'scope': 'filtered', **filters})
+
+    def test_verifies_all_matching_in_background_job(self):
+        response = self._post_filtered(course='BSIT', status='PENDING')
+
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, f"{reverse('administration:voters')}?course=BSIT&status=PENDING&job={job.pk}",
+                             fetch_redirect_response=False)
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual((job.progress_done, job.progress_total), (5, 5))
+
+        verified = StudentProfile.objects.filter(verification_status='VERIFIED')
+        self.assertEqual(set(verified.values_list('course', flat=True)), {'BSIT'})
+        self.assertTrue(all(v.is_eligible_to_vote and v.verified_by == self.admin_user for v in verified))
+        self.assertEqual(AuditLog.objects.filter(action='VOTERS_BULK_VERIFIED').count(), 1)
+
+    def test_job_invalidates_cached_counts(self):
+        self.assertEqual(self.client.get(reverse('administration:voters')).context['pending_count'], 10)
+        self._post_filtered()
+        self.assertEqual(self.client.get(reverse('administration:voters')).context['pending_count'], 0)
+
+    def test_interrupted_job_resumes_from_saved_position(self):
+        profiles = list(StudentProfile.objects.order_by('pk'))
+        job = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTER_BULK_VERIFY,
+            status=BackgroundJob.Status.RUNNING,
+            params={'filters': {}},
+            state={'last_pk': profiles[5].pk, 'verified': 6},
+            progress_done=6,
+            progress_total=10,
+            created_by=self.admin_user,
+        )
+        # Its runner died: no progress for longer than STALE_AFTER
+        BackgroundJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        with patch.object(jobs, 'BULK_VERIFY_BATCH_SIZE', 2):
+            job = jobs.run_job(job.pk)
+
+        self.assertEqual(job.status, BackgroundJob.Status.COMPLETED)
+        self.assertEqual(job.state['result']['verified'], 10)
+        verified = set(StudentProfile.objects.filter(verification_status='VERIFIED').values_list('pk', flat=True))
+        self.assertEqual(verified, {p.pk for p in profiles[6:]})
+
+    def test_running_job_is_not_run_twice(self):
+        job = BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.VOTER_BULK_VERIFY,
+            status=BackgroundJob.Status.RUNNING,
+            params={'filters': {}},
+            progress_total=10,
+            created_by=self.admin_user,
+        )
+        self.assertIsNone(jobs.run_job(job.pk))
+        self.assertFalse(StudentProfile.objects.filter(verification_status='VERIFIED').exists())
+
+        BackgroundJob.objects.filter(pk=job.pk).update(status=BackgroundJob.Status.PENDING)
+        self.assertTrue(jobs.claim(job.pk))
+        self.assertFalse(jobs.claim(job.pk))
+
+    def test_job_status_endpoint(self):
+        self._post_filtered(course='BSCS')
+        job = BackgroundJob.objects.get()
+        data = self.client.get(reverse('administration:api_job_status', args=[job.pk])).json()
+        self.assertEqual(data['status'], 'COMPLETED')
+        self.assertEqual(data['percent'], 100)
+        self.assertEqual(data['result']['verified'], 5)
+
+    def test_verify_selected_sets_eligibility(self):
+        ids = list(StudentProfile.objects.values_list('pk', flat=True)[:3])
+        self.client.post(self.url, {'voter_ids': ids})
+        verified = StudentProfile.objects.filter(verification_status='VERIFIED')
+        self.assertEqual(verified.count(), 3)
+        self.assertTrue(all(v.is_eligible_to_vote for v in verified))
+        self.assertEqual(BackgroundJob.objects.count(), 0)
+
+
+class VoterExportTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = User.objects.create_user(username='admin', password='password')
+        ElectionAdmin.objects.create(user=self.admin_user, admin_type='EMP')
+        self.client.force_login(self.admin_user)
+        self.url = reverse('administration:voter_export')
+
+        for i in range(6):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}', first_name='Voter', last_name=str(i)),
+                student_id=f'2024-{i:04d}',
+                year_level=1,
+                course='BSIT' if i % 2 else 'BSCS',
+                verification_status='VERIFIED',
+                is_eligible_to_vote=True,
+            )
+
+    def verify(self):
+        session = self.client.session
+        session[f'verified_action_{self.url}'] = True
+        session.save()
+
+    def test_requires_password_and_keeps_filters(self):
+        response = self.client.get(self.url, {'course': 'BSIT'})
+        self.assertRedirects(
+            response, '/administration/verify-password/?next=%2Fadministration%2Fvoters%2Fexport%2F%3Fcourse%3DBSIT',
+            fetch_redirect_response=False)
+
+        response = self.client.post(response.url, {'password': 'password'})
+        self.assertRedirects(response, f'{self.url}?course=BSIT', fetch_redirect_response=False)
+        self.assertTrue(self.client.get(response.url).streaming)
+
+    def test_streams_filtered_rows_and_audits_after_stream(self):
+        self.verify()
+        response = self.client.get(self.url, {'course': 'BSIT'})
+        self.assertTrue(response.streaming)
+        self.assertFalse(AuditLog.objects.filter(action='DATA_EXPORT').exists())
+
+        # One SELECT for all rows plus the audit insert
+        with self.assertNumQueries(2), self.captureOnCommitCallbacks(execute=True):
+            content = b''.join(response.streaming_content).decode()
+
+        lines = content.strip().splitlines()
+        self.assertEqual(lines[0], 'Student ID,First Name,Last Name,Email,Course,Year Level,Section,Status,Eligible')
+        self.assertEqual([line.split(',')[0] for line in lines[1:]], ['2024-0001', '2024-0003', '2024-0005'])
+        self.assertTrue(lines[1].endswith('VERIFIED,Yes'))
+        log = AuditLog.objects.get(action='DATA_EXPORT')
+        self.assertIn('Exported 3 voters', log.details)
+
+    def test_gzip_export(self):
+        import gzip
+
+        self.verify()
+        response = self.client.get(self.url, {'gzip': '1'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('voters_export.csv.gz', response['Content-Disposition'])
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        self.assertEqual(len(content.strip().splitlines()), 7)
@@ -9,6 +9,7 @@ urlpatterns = [
     path('login/', views.admin_login, name='login'),
     path('logout/', views.admin_logout, name='logout'),
     path('verify-password/', views.verify_password, name='verify_password'),
+    path('analytics/compare/', views.election_comparison, name='election_comparison'),
     
     # Elections Management
     path('elections/', views.election_list, name='elections'),
@@ -36,11 +37,16 @@ urlpatterns = [
     path('voters/', views.voter_list, name='voters'),
     path('voters/export/', views.voter_export, name='voter_export'),
     path('voters/create/', views.voter_create, name='voter_create'),
+    path('voters/import/', views.voter_import, name='voter_import'),
     path('voters/<int:pk>/edit/', views.voter_edit, name='voter_edit'),
     path('voters/<int:pk>/verify/', views.voter_verify, name='voter_verify'),
     path('voters/<int:pk>/reject/', views.voter_reject, name='voter_reject'),
     path('voters/bulk-verify/', views.voter_bulk_verify, name='voter_bulk_verify'),
     
+    # Audit Log
+    path('audit/', views.audit_log, name='audit_log'),
+    path('audit/export/', views.audit_log_export, name='audit_log_export'),
+    
     # Profile Settings
     path('profile/', views.admin_profile, name='profile'),
     
@@ -52,6 +58,10 @@ urlpatterns = [
     
     # API Endpoints
     path('api/student-profile/<int:pk>/', views.get_student_profile_data, name='api_student_profile'),
+    path('api/dashboard/<slug:section>/', views.dashboard_section, name='api_dashboard_section'),
+    path('api/elections/compare/', views.election_comparison_data, name='api_election_comparison'),
+    path('api/voters/search/', views.voter_search, name='api_voter_search'),
+    path('api/jobs/<int:pk>/', views.job_status, name='api_job_status'),
     
     # Timeline Management
     path('timeline/', views.timeline_list, name='timeline_list'),
@@ -0,0 +1,62 @@
+"""
+Form widgets for the custom admin.
+"""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+def student_label(profile):
+    """Short picker label for a student, e.g. 'Jane Doe (2024-0001)'."""
+    name = profile.user.get_full_name() or profile.user.username
+    if profile.student_id:
+        return f"{name} ({profile.student_id})"
+    return name
+
+
+class StudentAutocompleteWidget(forms.Select):
+    """
+    ``<select>`` for a ``StudentProfile`` choice that renders only the
+    current selection instead of every student. Matching options are
+    fetched from the voter search endpoint as the admin types into the
+    search box named by ``search_input`` (see ``student_autocomplete.js``).
+
+    On POST the form field still resolves the submitted primary key with a
+    single lookup, so validation is unchanged.
+    """
+
+    def __init__(self, attrs=None, search_input=None, limit=10):
+        super().__init__(attrs)
+        self.search_input = search_input
+        self.limit = limit
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context['widget']['attrs']
+        widget_attrs['data-autocomplete-url'] = reverse('administration:api_voter_search')
+        widget_attrs['data-autocomplete-limit'] = self.limit
+        if self.search_input:
+            widget_attrs['data-search-input'] = self.search_input
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        choices = []
+        field = getattr(self.choices, 'field', None)
+        if field is not None and field.empty_label is not None:
+            choices.append(('', field.empty_label))
+
+        selected = [v for v in value if v]
+        if selected and field is not None:
+            try:
+                profiles = field.queryset.select_related('user').filter(pk__in=selected)
+                choices.extend((profile.pk, student_label(profile)) for profile in profiles)
+            except (ValueError, ValidationError):
+                # Garbage from a bound form; the field reports the error
+                pass
+
+        original = self.choices
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = original
@@ -0,0 +1,23 @@
+"""
+DeepFace, loaded on first use.
+
+Importing DeepFace imports TensorFlow, which takes seconds and hundreds of
+MB of memory. Only face enrollment and verification need it, so it is
+imported the first time one of them runs rather than when the URLconf, a
+management command or the test runner loads the views.
+"""
+import functools
+import os
+
+
+@functools.cache
+def load():
+    """The ``DeepFace`` class, or None if DeepFace is not installed."""
+    # Force TensorFlow to use CPU only to avoid CUDA configuration issues
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Reduce TensorFlow logging
+    try:
+        from deepface import DeepFace
+    except ImportError:
+        return None
+    return DeepFace
@@ -11,19 +11,7 @@ import os
 import tempfile
 from PIL import Image
 
-# Force TensorFlow to use CPU only to avoid CUDA configuration issues
-os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Reduce TensorFlow logging
-
-try:
-    from deepface import DeepFace
-    import numpy as np
-    FACE_RECOGNITION_AVAILABLE = True
-except ImportError:
-    FACE_RECOGNITION_AVAILABLE = False
-    DeepFace = None
-    np = None
-
+from . import face
 from .models import UserBiometric
 from apps.core.logging import logger
 
@@ -38,8 +26,10 @@ def enroll_face(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
-    if not FACE_RECOGNITION_AVAILABLE:
+    DeepFace = face.load()
+    if DeepFace is None:
         return JsonResponse({'error': 'Face recognition library not installed'}, status=500)
+    import numpy as np
 
     temp_file = None
     try:
@@ -181,8 +171,10 @@ def verify_face(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
         
-    if not FACE_RECOGNITION_AVAILABLE:
+    DeepFace = face.load()
+    if DeepFace is None:
         return JsonResponse({'error': 'Face recognition library not installed'}, status=500)
+    import numpy as np
     
     temp_file = None
     try:
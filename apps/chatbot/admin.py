@@ -8,6 +8,10 @@ class ChatConversationAdmin(admin.ModelAdmin):
     list_filter = ['started_at', 'election']
     search_fields = ['user__username', 'session_id']
     readonly_fields = ['started_at', 'last_activity']
+    list_select_related = ['user', 'election']
+    raw_id_fields = ['user']
+    autocomplete_fields = ['election']
+    show_full_result_count = False
 
 
 @admin.register(ChatMessage)
@@ -16,6 +20,10 @@ class ChatMessageAdmin(admin.ModelAdmin):
     list_filter = ['role', 'flagged_as_biased', 'timestamp']
     search_fields = ['content']
     readonly_fields = ['timestamp']
+    # The conversation column renders ChatConversation.__str__ (its user)
+    list_select_related = ['conversation__user']
+    raw_id_fields = ['conversation']
+    show_full_result_count = False
     
     def content_preview(self, obj):
         return obj.content[:100] + '...' if len(obj.content) > 100 else obj.content
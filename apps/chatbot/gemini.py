@@ -0,0 +1,29 @@
+"""
+The Gemini client library (``google.generativeai``), loaded on first use.
+
+Importing it pulls in gRPC, protobuf and the generated API types - over a
+second of start-up - so the chatbot and the report narratives import it
+only when they first call Gemini, not when their modules load.
+"""
+import functools
+import importlib.util
+
+
+@functools.cache
+def installed():
+    """Whether the library is installed, checked without importing it."""
+    try:
+        return importlib.util.find_spec('google.generativeai') is not None
+    except ModuleNotFoundError:
+        # No ``google`` package at all
+        return False
+
+
+@functools.cache
+def load():
+    """The ``google.generativeai`` module, or None if it is not installed."""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
@@ -7,12 +7,7 @@ from typing import Dict, List, Optional
 from django.conf import settings
 from apps.elections.models import Election, Candidate
 
-# Placeholder for Gemini API - will be replaced when user provides API key
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from . import gemini
 
 
 # System prompt for bias mitigation
@@ -104,7 +99,8 @@ def get_gemini_response(user_message: str, election: Optional[Election] = None)
     start_time = time.time()
     
     # Check if Gemini is available
-    if not GEMINI_AVAILABLE:
+    genai = gemini.load()
+    if genai is None:
         return {
             'success': False,
             'response': None,
@@ -0,0 +1,72 @@
+"""
+Versioned cache helpers.
+
+Cached data is keyed by one or more *namespaces* (e.g. ``voters`` or
+``election:3:tally``). Each namespace carries a version counter; bumping the
+counter makes every key built from it unreachable, so writers never need to
+know which cache entries exist.
+
+A counter starts from the current time in nanoseconds, so if it is evicted
+(cached data can outlive it) the new sequence starts above every version
+handed out before and old entries are never served as current.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY_PREFIX = 'votewise:version:'
+
+# Shared namespaces
+VOTERS = 'voters'
+CANDIDATES = 'candidates'
+AUDIT = 'audit'
+
+
+def election_tally(election_id):
+    """Namespace covering ballots and votes of one election."""
+    return f'election:{election_id}:tally'
+
+
+def get_version(namespace):
+    """Return the current version number for a namespace."""
+    key = f'{VERSION_KEY_PREFIX}{namespace}'
+    version = cache.get(key)
+    if version is None:
+        seed = time.time_ns()
+        cache.add(key, seed, None)
+        version = cache.get(key) or seed
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate everything cached under a namespace."""
+    key = f'{VERSION_KEY_PREFIX}{namespace}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key missing (evicted or never read) - start a fresh sequence, above
+        # any version handed out before eviction
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_version_on_commit(namespace):
+    """
+    Bump a namespace once the current transaction commits.
+
+    Bumping before commit would let a concurrent reader recompute from the
+    old rows and cache them under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+def versioned_key(prefix, namespaces, *parts):
+    """
+    Build a cache key that embeds the versions of the given namespaces.
+
+    Returns ``(key, version_tag)`` where ``version_tag`` is a short string
+    suitable for ETags.
+    """
+    version_tag = '.'.join(str(get_version(ns)) for ns in namespaces)
+    suffix = ':'.join(str(p) for p in parts)
+    return f'{prefix}:{suffix}:v{version_tag}', version_tag
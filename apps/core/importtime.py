@@ -0,0 +1,99 @@
+"""
+Start-up import profile.
+
+``python -X importtime`` writes a line per imported module to stderr; the
+indentation of the name is how deeply the import was nested::
+
+    import time: self [us] | cumulative | imported package
+    import time:       417 |       1074 |   PIL
+
+:func:`profile_boot` runs a fresh interpreter that sets Django up and loads
+the URLconf - what every web worker, management command and test run does
+before anything else - and parses that output. Heavy optional libraries
+(TensorFlow through DeepFace, matplotlib, ReportLab, the Gemini client) are
+loaded on first use by their facades (``apps.biometrics.face``,
+``apps.chatbot.gemini``, ``apps.reports.jobs`` and ``.charts``) and must not
+show up here; ``manage.py profile_imports`` prints the report.
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+from django.conf import settings
+
+# Modules that must not be imported at start-up
+HEAVY_MODULES = (
+    'deepface', 'tensorflow', 'keras', 'torch', 'cv2',
+    'matplotlib', 'reportlab', 'google.generativeai',
+)
+
+# Seconds of imports allowed at start-up (about 0.5 s on a development machine)
+BOOT_IMPORT_BUDGET = 1.5
+
+BOOT_SCRIPT = (
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns'
+)
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$')
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(output):
+    """The :class:`ImportRecord` of every module in ``-X importtime`` output, in import order."""
+    records = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def total_seconds(records):
+    """Time spent importing: the sum over the outermost imports."""
+    return sum(record.cumulative_us for record in records if record.depth == 0) / 1e6
+
+
+def heavy_imports(records, heavy=HEAVY_MODULES):
+    """Which of ``heavy`` were imported (as themselves or through a submodule)."""
+    return sorted({
+        name for record in records for name in heavy
+        if record.module == name or record.module.startswith(name + '.')
+    })
+
+
+def profile_boot(script=BOOT_SCRIPT):
+    """Import records of a fresh interpreter running ``script`` with the current settings."""
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'project_config.settings')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=300)
+    if result.returncode:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError('Start-up failed:\n' + '\n'.join(errors[-20:]))
+    return parse(result.stderr)
+
+
+def format_report(records, top=15):
+    """Text summary: total, heavy modules, and the costliest imports by cumulative and own time."""
+    lines = [f'Start-up imports: {total_seconds(records):.3f} s over {len(records)} modules']
+    heavy = heavy_imports(records)
+    lines.append(f"Heavy modules imported: {', '.join(heavy) if heavy else 'none'}")
+
+    lines += ['', f"{'cumulative ms':>14}  outermost imports"]
+    outermost = sorted((r for r in records if r.depth == 0), key=lambda r: r.cumulative_us, reverse=True)
+    lines += [f'{r.cumulative_us / 1000:>14.1f}  {r.module}' for r in outermost[:top]]
+
+    lines += ['', f"{'self ms':>14}  slowest modules"]
+    slowest = sorted(records, key=lambda r: r.self_us, reverse=True)
+    lines += [f'{r.self_us / 1000:>14.1f}  {r.module}' for r in slowest[:top]]
+    return '\n'.join(lines)
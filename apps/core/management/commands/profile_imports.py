@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import importtime
+
+
+class Command(BaseCommand):
+    help = 'Profile the imports of a fresh start-up (python -X importtime) and check them against the budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Imports listed per table (default: 15)'
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=importtime.BOOT_IMPORT_BUDGET,
+            help=f'Seconds of imports allowed (default: {importtime.BOOT_IMPORT_BUDGET})'
+        )
+
+    def handle(self, *args, **options):
+        records = importtime.profile_boot()
+        self.stdout.write(importtime.format_report(records, top=options['top']))
+
+        problems = []
+        heavy = importtime.heavy_imports(records)
+        if heavy:
+            problems.append(f"heavy modules imported at start-up: {', '.join(heavy)}")
+        total = importtime.total_seconds(records)
+        if total > options['budget']:
+            problems.append(f"imports took {total:.3f} s, over the {options['budget']} s budget")
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS(f"Within budget ({total:.3f} s of {options['budget']} s)."))
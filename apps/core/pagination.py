@@ -0,0 +1,202 @@
+"""
+Keyset (seek) pagination.
+
+Instead of ``OFFSET n`` - which makes the database walk and discard every
+row before the requested page - each page is fetched with a ``WHERE`` clause
+that continues after the last row of the previous page. With an index on the
+ordering columns, page 1000 costs the same as page 1.
+
+Pages are addressed by opaque cursors rather than page numbers::
+
+    paginator = KeysetPaginator(queryset, ('student_id', 'pk'), per_page=25)
+    page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+
+The ordering must be unique (end it with ``pk``). Nullable ordering fields
+are supported: ascending fields sort NULLs last and descending fields sort
+NULLs first, consistently on every backend.
+"""
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for this ordering."""
+
+
+class KeysetPage:
+    """One page of results plus the cursors that address its neighbours."""
+
+    def __init__(self, object_list, has_next, has_previous, paginator):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking on a unique ordering.
+
+    Args:
+        queryset: The (filtered) queryset to paginate. Its own ordering is
+            replaced.
+        ordering: Field paths, optionally prefixed with ``-``, ending in a
+            unique field (normally ``pk``). Related paths such as
+            ``position__order_on_ballot`` are allowed.
+        per_page: Rows per page.
+    """
+
+    def __init__(self, queryset, ordering, per_page=25):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.fields = []
+        for name in ordering:
+            descending = name.startswith('-')
+            path = name.lstrip('-')
+            if path == 'pk':
+                path = queryset.model._meta.pk.name
+            self.fields.append((path, descending, self._resolve_field(path)))
+
+    def _resolve_field(self, path):
+        model = self.queryset.model
+        parts = path.split('__')
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(parts[-1])
+
+    # ------------------------------------------------------------------
+    # Cursors
+    # ------------------------------------------------------------------
+
+    def _row_values(self, obj):
+        values = []
+        for path, _, field in self.fields:
+            value = obj
+            parts = path.split('__')
+            for part in parts[:-1]:
+                value = getattr(value, part)
+            values.append(getattr(value, field.attname))
+        return values
+
+    def encode_cursor(self, obj):
+        payload = json.dumps(self._row_values(obj), cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+            raise InvalidCursor(str(e))
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor('Cursor does not match ordering')
+        try:
+            return [
+                None if value is None else field.to_python(value)
+                for value, (_, _, field) in zip(values, self.fields)
+            ]
+        except ValidationError as e:
+            raise InvalidCursor(str(e))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _order_by(self, reverse):
+        expressions = []
+        for path, descending, _ in self.fields:
+            if descending != reverse:
+                expressions.append(F(path).desc(nulls_first=True))
+            else:
+                expressions.append(F(path).asc(nulls_last=True))
+        return expressions
+
+    def _after(self, path, descending, field, value):
+        """Rows strictly after ``value`` on one column in the given direction."""
+        if descending:
+            # NULLs come first, so nothing precedes them
+            if value is None:
+                return Q(**{f'{path}__isnull': False})
+            return Q(**{f'{path}__lt': value})
+        # Ascending: NULLs come last
+        if value is None:
+            return None
+        condition = Q(**{f'{path}__gt': value})
+        if field.null:
+            condition |= Q(**{f'{path}__isnull': True})
+        return condition
+
+    def _equal(self, path, value):
+        if value is None:
+            return Q(**{f'{path}__isnull': True})
+        return Q(**{path: value})
+
+    def _seek(self, values, reverse):
+        """
+        Lexicographic "row comes after ``values``" condition:
+        (a > va) OR (a = va AND b > vb) OR ...
+        """
+        branches = []
+        for i, (path, descending, field) in enumerate(self.fields):
+            after = self._after(path, descending != reverse, field, values[i])
+            if after is None:
+                continue
+            prefix = [self._equal(p, values[j]) for j, (p, _, _) in enumerate(self.fields[:i])]
+            branches.append(reduce(and_, prefix + [after]))
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(or_, branches)
+
+    def page(self, after=None, before=None):
+        """
+        Return the page following cursor ``after`` or preceding cursor
+        ``before`` (the first page when neither is given). Invalid cursors
+        fall back to the first page.
+        """
+        reverse = False
+        queryset = self.queryset
+        try:
+            if before:
+                reverse = True
+                queryset = queryset.filter(self._seek(self.decode_cursor(before), reverse=True))
+            elif after:
+                queryset = queryset.filter(self._seek(self.decode_cursor(after), reverse=False))
+        except InvalidCursor:
+            reverse = False
+            queryset = self.queryset
+            after = before = None
+
+        # One extra row tells us whether there is another page this way
+        rows = list(queryset.order_by(*self._order_by(reverse))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return KeysetPage(rows, has_next=True, has_previous=has_more, paginator=self)
+        return KeysetPage(rows, has_next=has_more, has_previous=bool(after), paginator=self)
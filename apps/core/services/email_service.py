@@ -266,6 +266,58 @@ class EmailService:
             recipient_list=[user.email]
         )
     
+    @staticmethod
+    def send_account_setup_emails(users, batch_size=100, async_send=True):
+        """
+        Send each imported user a one-time link to set their password.
+        Messages go out in batches sharing one SMTP connection, in background
+        threads unless ``async_send`` is False (e.g. from a management
+        command, whose process would exit before daemon threads finish).
+        """
+        from django.contrib.auth.tokens import default_token_generator
+        from django.urls import reverse
+        from django.utils.encoding import force_bytes
+        from django.utils.http import urlsafe_base64_encode
+
+        site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
+        from_email = settings.DEFAULT_FROM_EMAIL
+
+        messages = []
+        for user in users:
+            if not user.email:
+                continue
+            reset_path = reverse('accounts:password_reset_confirm', kwargs={
+                'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+                'token': default_token_generator.make_token(user),
+            })
+            context = {
+                'username': user.get_full_name() or user.username,
+                'login_username': user.username,
+                'setup_url': f"{site_url}{reset_path}",
+                'site_name': 'VoteWise',
+                'site_url': site_url,
+            }
+            email = EmailMultiAlternatives(
+                subject="Set Up Your VoteWise Account",
+                body=render_to_string('emails/account_setup.txt', context),
+                from_email=from_email,
+                to=[user.email]
+            )
+            email.attach_alternative(render_to_string('emails/account_setup.html', context), "text/html")
+            messages.append(email)
+
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            if not async_send:
+                EmailService._send_bulk_thread(batch)
+                continue
+            thread = threading.Thread(target=EmailService._send_bulk_thread, args=(batch,))
+            thread.daemon = True
+            thread.start()
+
+        logger.email(f"Queued {len(messages)} account setup emails")
+        return len(messages)
+
     @staticmethod
     def send_admin_notification(subject, message, admin_emails=None):
         """Send notification to administrators"""
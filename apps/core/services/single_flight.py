@@ -0,0 +1,100 @@
+"""
+Single-flight request coalescing.
+
+When several requests need the same expensive value at the same moment
+(e.g. two admins opening the dashboard right after a vote wave), only one of
+them should compute it. The first caller takes a short-lived lock in the
+cache and computes; the others wait for the published result and share it.
+
+Waiting is bounded: if the result does not appear within ``wait_timeout``
+(slow or crashed leader), the waiter computes the value itself rather than
+holding a worker indefinitely.
+
+Coalescing works across processes only when the configured cache is shared
+between them (Redis/Memcached). With the default per-process LocMemCache it
+still coalesces threads within one worker.
+"""
+import time
+import uuid
+
+from django.core.cache import cache
+
+from apps.core.logging import logger
+
+LOCK_PREFIX = 'singleflight:lock:'
+
+# Defaults, in seconds
+DEFAULT_LOCK_TIMEOUT = 60
+DEFAULT_WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+def _get(key):
+    """Return the cached value for ``key`` or ``_MISSING``."""
+    entry = cache.get(key)
+    if entry is None:
+        return _MISSING
+    # Values are stored wrapped so that ``None`` results can be shared too
+    return entry[0]
+
+
+def single_flight(key, compute, ttl, lock_timeout=DEFAULT_LOCK_TIMEOUT,
+                  wait_timeout=DEFAULT_WAIT_TIMEOUT):
+    """
+    Return the cached value for ``key``, computing it at most once across
+    concurrent callers.
+
+    Args:
+        key: Cache key of the result (should embed any version information).
+        compute: Zero-argument callable producing the value.
+        ttl: Seconds to keep the result cached (``None`` for no expiry).
+        lock_timeout: Seconds after which a leader's lock expires on its own,
+            so a crashed leader cannot block the key forever.
+        wait_timeout: Maximum seconds a follower waits for the leader.
+    """
+    value = _get(key)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'{LOCK_PREFIX}{key}'
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_timeout
+
+    while True:
+        if cache.add(lock_key, token, lock_timeout):
+            return _lead(key, lock_key, token, compute, ttl)
+
+        time.sleep(POLL_INTERVAL)
+        value = _get(key)
+        if value is not _MISSING:
+            return value
+
+        if time.monotonic() >= deadline:
+            logger.warning(f"Single-flight wait timed out for {key}; computing locally", category="CACHE")
+            value = compute()
+            cache.set(key, (value,), ttl)
+            return value
+
+
+def _lead(key, lock_key, token, compute, ttl):
+    """Compute and publish the value while holding the lock."""
+    try:
+        # Another leader may have finished between our miss and the lock
+        value = _get(key)
+        if value is _MISSING:
+            value = compute()
+            cache.set(key, (value,), ttl)
+        return value
+    finally:
+        # Only release a lock we still own; an expired lock may already have
+        # been taken by another leader.
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def cached_get(key):
+    """Read a value stored by :func:`single_flight` (``None`` on miss)."""
+    value = _get(key)
+    return None if value is _MISSING else value
@@ -0,0 +1,114 @@
+"""
+Building blocks for streamed downloads.
+
+Large exports are produced row by row and handed to a
+``StreamingHttpResponse`` so neither the queryset nor the file is ever held
+in memory::
+
+    rows = queryset.values_list(...).iterator(chunk_size=2000)
+    chunks = csv_chunks(header, rows)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=...)
+
+Rows are grouped into chunks of a few hundred lines so the server does not
+issue one socket write per row. Several files can be streamed as one zip
+archive with :func:`zip_chunks`.
+"""
+import csv
+import json
+import zipfile
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+ROWS_PER_CHUNK = 500
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(header, rows, rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield the CSV encoding of ``header`` and ``rows`` as strings of several lines."""
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow(header)] if header else []
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= rows_per_chunk:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def ndjson_chunks(records, rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield ``records`` (JSON-serializable dicts) as newline-delimited JSON, several lines per chunk."""
+    buffer = []
+    for record in records:
+        buffer.append(json.dumps(record, cls=DjangoJSONEncoder) + '\n')
+        if len(buffer) >= rows_per_chunk:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip-compress a stream of ``str``/``bytes`` chunks incrementally."""
+    # wbits=31 writes a gzip header and trailer instead of a bare zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _Spool:
+    """Write-only, unseekable file object holding what was written until drained."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def zip_chunks(members, compression=zipfile.ZIP_DEFLATED):
+    """
+    Zip archive of ``members`` - ``(name, chunks)`` pairs, the chunks being
+    ``str``/``bytes`` - yielded as it is written. Members are compressed as
+    they stream; sizes and checksums follow each member's data, so nothing
+    is seeked back to.
+    """
+    spool = _Spool()
+    # Without tell() zipfile writes the archive strictly front to back
+    with zipfile.ZipFile(spool, 'w', compression) as archive:
+        for name, chunks in members:
+            with archive.open(name, 'w') as member:
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode('utf-8')
+                    member.write(chunk)
+                    data = spool.drain()
+                    if data:
+                        yield data
+            # The member's remaining compressed data and its descriptor
+            yield spool.drain()
+    # Central directory
+    yield spool.drain()
@@ -0,0 +1,82 @@
+"""
+Query budget for Django admin change lists
+"""
+import uuid
+from datetime import timedelta
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import StudentProfile
+from apps.administration.models import AuditLog
+from apps.chatbot.models import ChatConversation, ChatMessage
+from apps.elections.models import Candidate, Election, Partylist, Position, Vote, VoterReceipt
+
+ROWS = 10_000
+
+# Session, user, counts, the page itself and the sidebar filter choices;
+# independent of the number of rows
+MAX_QUERIES = 15
+
+PROJECT_APPS = {'accounts', 'administration', 'chatbot', 'core', 'elections', 'reports'}
+
+
+class AdminChangeListQueryTests(TestCase):
+    """Every project change list renders in a bounded number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('root', 'root@example.com', 'password')
+
+        users = User.objects.bulk_create(
+            User(username=f'student{i}', first_name='Student', last_name=str(i)) for i in range(ROWS))
+        profiles = StudentProfile.objects.bulk_create(
+            StudentProfile(user=user, student_id=f'S{i:05d}', year_level=1 + i % 4, course='BSIT')
+            for i, user in enumerate(users))
+
+        election = Election.objects.create(
+            name='Council', start_time=timezone.now(), end_time=timezone.now() + timedelta(days=1))
+        positions = [
+            Position.objects.create(name=f'Position {i}', order_on_ballot=i) for i in range(5)]
+        partylist = Partylist.objects.create(name='Party', short_code='P')
+        candidates = Candidate.objects.bulk_create(
+            Candidate(student_profile=profile, election=election, position=positions[i % 5], partylist=partylist)
+            for i, profile in enumerate(profiles[:200]))
+
+        ballot_ids = [uuid.uuid4() for _ in range(ROWS)]
+        VoterReceipt.objects.bulk_create(
+            VoterReceipt(voter=profile, election=election, ballot_id=ballot_id, encrypted_choices='x')
+            for profile, ballot_id in zip(profiles, ballot_ids))
+        Vote.objects.bulk_create(
+            Vote(election=election, candidate=candidates[i % 200], position=candidates[i % 200].position,
+                 ballot_id=ballot_ids[i])
+            for i in range(ROWS))
+
+        AuditLog.objects.bulk_create(
+            AuditLog(user=users[i % 100], action='LOGIN', details='x') for i in range(ROWS))
+        conversations = ChatConversation.objects.bulk_create(
+            ChatConversation(user=users[i], election=election, session_id=f'session-{i}') for i in range(200))
+        ChatMessage.objects.bulk_create(
+            ChatMessage(conversation=conversations[i % 200], role='user', content='hello') for i in range(ROWS))
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def test_change_lists_have_bounded_queries(self):
+        models = [model for model in admin.site._registry if model._meta.app_label in PROJECT_APPS]
+        self.assertIn(Vote, models)
+
+        for model in models:
+            opts = model._meta
+            url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            for params in ({}, {'q': 'a'}):
+                with self.subTest(model=opts.label, params=params):
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertLessEqual(len(queries), MAX_QUERIES, [q['sql'] for q in queries])
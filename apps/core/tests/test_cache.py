@@ -0,0 +1,29 @@
+"""
+Unit tests for versioned cache namespaces
+"""
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.core.cache import VERSION_KEY_PREFIX, bump_version, get_version
+
+
+class VersionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_increases_version(self):
+        version = get_version('things')
+        bump_version('things')
+        self.assertGreater(get_version('things'), version)
+
+    def test_evicted_version_does_not_repeat(self):
+        bump_version('things')
+        bump_version('things')
+        before = get_version('things')
+
+        cache.delete(f'{VERSION_KEY_PREFIX}things')
+        self.assertGreater(get_version('things'), before)
+
+        cache.delete(f'{VERSION_KEY_PREFIX}things')
+        bump_version('things')
+        self.assertGreater(get_version('things'), before)
@@ -0,0 +1,33 @@
+"""
+Start-up import budget
+"""
+from django.test import SimpleTestCase
+
+from apps.core import importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | site
+import time:       900 |        900 |     reportlab.lib.colors
+import time:       100 |       1000 |   reportlab.lib
+import time:        50 |       1050 | apps.reports.pdf
+"""
+
+
+class ImportTimeTests(SimpleTestCase):
+    """Test cases for parsing -X importtime output and the boot budget"""
+
+    def test_parse(self):
+        records = importtime.parse(SAMPLE)
+        self.assertEqual(records[0], importtime.ImportRecord('_io', 120, 120, 1))
+        self.assertEqual([r.depth for r in records], [1, 0, 2, 1, 0])
+        self.assertAlmostEqual(importtime.total_seconds(records), 0.00147)
+        self.assertEqual(importtime.heavy_imports(records), ['reportlab'])
+        self.assertIn('apps.reports.pdf', importtime.format_report(records))
+
+    def test_boot_stays_light(self):
+        records = importtime.profile_boot()
+        report = importtime.format_report(records)
+        self.assertEqual(importtime.heavy_imports(records), [], report)
+        self.assertLessEqual(importtime.total_seconds(records), importtime.BOOT_IMPORT_BUDGET, report)
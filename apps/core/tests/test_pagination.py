@@ -0,0 +1,64 @@
+"""
+Unit tests for keyset pagination
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.accounts.models import StudentProfile
+from apps.core.pagination import KeysetPaginator
+
+
+class KeysetPaginatorTests(TestCase):
+    """Test cases for KeysetPaginator"""
+
+    def setUp(self):
+        for i in range(12):
+            # Every third profile has no student ID; they must sort last
+            student_id = None if i % 3 == 0 else f'S{i:03d}'
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'user{i}'), student_id=student_id, year_level=1)
+        self.queryset = StudentProfile.objects.all()
+        self.expected = [
+            p.pk for p in sorted(self.queryset, key=lambda p: (p.student_id is None, p.student_id or '', p.pk))
+        ]
+
+    def walk_forward(self, paginator):
+        seen = []
+        page = paginator.page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(p.pk for p in page)
+            if not page.has_next:
+                return seen, page
+            page = paginator.page(after=page.next_cursor)
+
+    def test_forward_covers_all_rows_in_order(self):
+        paginator = KeysetPaginator(self.queryset, ('student_id', 'pk'), per_page=5)
+        seen, _ = self.walk_forward(paginator)
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_from_last_page(self):
+        paginator = KeysetPaginator(self.queryset, ('student_id', 'pk'), per_page=5)
+        _, page = self.walk_forward(paginator)
+        pages = [[p.pk for p in page]]
+        while page.has_previous:
+            page = paginator.page(before=page.previous_cursor)
+            pages.insert(0, [p.pk for p in page])
+        self.assertEqual([pk for chunk in pages for pk in chunk], self.expected)
+        self.assertEqual(len(pages[0]), 5)
+
+    def test_descending_ordering(self):
+        paginator = KeysetPaginator(self.queryset, ('-student_id', '-pk'), per_page=4)
+        seen, _ = self.walk_forward(paginator)
+        self.assertEqual(seen, list(reversed(self.expected)))
+
+    def test_invalid_cursor_returns_first_page(self):
+        paginator = KeysetPaginator(self.queryset, ('student_id', 'pk'), per_page=5)
+        page = paginator.page(after='not-a-cursor')
+        self.assertEqual([p.pk for p in page], self.expected[:5])
+
+    def test_deep_page_is_single_query(self):
+        paginator = KeysetPaginator(self.queryset, ('student_id', 'pk'), per_page=5)
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            list(paginator.page(after=cursor))
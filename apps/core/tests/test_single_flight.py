@@ -0,0 +1,76 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.core.services import single_flight as sf
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Test cases for single_flight"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_caches_result(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'value': 42}
+
+        self.assertEqual(sf.single_flight('k', compute, 30), {'value': 42})
+        self.assertEqual(sf.single_flight('k', compute, 30), {'value': 42})
+        self.assertEqual(len(calls), 1)
+
+    def test_none_results_are_shared(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+
+        self.assertIsNone(sf.single_flight('k', compute, 30))
+        self.assertIsNone(sf.single_flight('k', compute, 30))
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_callers_compute_once(self):
+        calls = []
+        results = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return 'done'
+
+        def worker():
+            results.append(sf.single_flight('k', compute, 30))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['done'] * 5)
+
+    def test_waiter_computes_after_timeout(self):
+        # A stale lock from a stuck leader must not block callers forever
+        cache.add(f'{sf.LOCK_PREFIX}k', 'other', 60)
+        value = sf.single_flight('k', lambda: 'fallback', 30, wait_timeout=0.1)
+        self.assertEqual(value, 'fallback')
+
+    def test_lock_released_on_error(self):
+        def fail():
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            sf.single_flight('k', fail, 30)
+        self.assertIsNone(cache.get(f'{sf.LOCK_PREFIX}k'))
+        self.assertEqual(sf.single_flight('k', lambda: 'ok', 30), 'ok')
@@ -0,0 +1,24 @@
+"""
+Unit tests for streamed download helpers
+"""
+import gzip
+
+from django.test import SimpleTestCase
+
+from apps.core.streaming import csv_chunks, gzip_chunks
+
+
+class StreamingTests(SimpleTestCase):
+    """Test cases for csv_chunks and gzip_chunks"""
+
+    def test_csv_chunks_group_rows(self):
+        rows = ((i, f'name, {i}') for i in range(5))
+        chunks = list(csv_chunks(['id', 'name'], rows, rows_per_chunk=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0], 'id,name\r\n0,"name, 0"\r\n')
+        self.assertEqual(''.join(chunks).count('\r\n'), 6)
+
+    def test_gzip_chunks_round_trip(self):
+        chunks = list(csv_chunks(['id'], ((i,) for i in range(1000))))
+        compressed = b''.join(gzip_chunks(chunks))
+        self.assertEqual(gzip.decompress(compressed).decode(), ''.join(chunks))
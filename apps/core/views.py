@@ -1,8 +1,13 @@
 from django.shortcuts import render
 
 # Create your views here.
-from apps.elections.models import Election, Position, Candidate, Vote, VoterReceipt
-from django.db.models import Count
+from apps.elections.models import Election, Position, Candidate
+from apps.elections.services import get_ballots_cast, get_position_results
+from apps.core.cache import CANDIDATES, election_tally, versioned_key
+from apps.core.services.single_flight import single_flight
+
+# Seconds public results may be served from cache (votes bump the version)
+RESULTS_CACHE_TTL = 30
 
 def home(request):
     return render(request, 'core/home.html')
@@ -36,54 +41,47 @@ def results(request):
     }
     
     if election:
-        # Count total ballots (voters who participated)
-        context['total_ballots'] = VoterReceipt.objects.filter(election=election).count()
-        
-        # Get all positions
-        positions = Position.objects.filter(is_active=True).order_by('order_on_ballot')
-        
-        for pos in positions:
-            # Get candidates for this position in this election
-            candidates = Candidate.objects.filter(election=election, position=pos)
-            
-            # Skip positions with no candidates
-            if not candidates.exists():
-                continue
-                
-            candidates_data = []
-            # Calculate total votes for this specific position to compute percentages
-            pos_total_votes = Vote.objects.filter(election=election, position=pos).count()
-            
-            for cand in candidates:
-                votes = Vote.objects.filter(election=election, candidate=cand).count()
-                percentage = (votes / pos_total_votes * 100) if pos_total_votes > 0 else 0
-                
-                candidates_data.append({
-                    'object': cand,
-                    'name': cand.student_profile.user.get_full_name(),
-                    'photo_url': cand.get_photo_url,
-                    'votes': votes,
-                    'percentage': round(percentage, 1),
-                    'partylist': cand.partylist.short_code if cand.partylist else "Independent"
-                })
-            
-            # Sort candidates by votes descending
-            candidates_data.sort(key=lambda x: x['votes'], reverse=True)
-            
-            # Mark winners based on position.number_of_winners
-            for idx, cand in enumerate(candidates_data):
-                cand['is_winner'] = (idx < pos.number_of_winners)
-                cand['rank'] = idx + 1
-            
-            context['positions_data'].append({
-                'name': pos.name,
-                'candidates': candidates_data,
-                'total_votes': pos_total_votes,
-                'number_of_winners': pos.number_of_winners
-            })
-            
+        key, _ = versioned_key('results', [CANDIDATES, election_tally(election.id)], election.id)
+        context.update(single_flight(key, lambda: _build_results(election), RESULTS_CACHE_TTL))
+
     return render(request, 'core/election-results.html', context)
 
+
+def _build_results(election):
+    """Ballot count and per-position standings for the public results page."""
+    positions_data = []
+    for result in get_position_results(election, active_positions_only=True):
+        pos = result['position']
+        pos_total_votes = result['total_votes']
+
+        candidates_data = []
+        for idx, entry in enumerate(result['candidates']):
+            cand = entry['candidate']
+            percentage = (entry['votes'] / pos_total_votes * 100) if pos_total_votes > 0 else 0
+            candidates_data.append({
+                'object': cand,
+                'name': cand.student_profile.user.get_full_name(),
+                'photo_url': cand.get_photo_url,
+                'votes': entry['votes'],
+                'percentage': round(percentage, 1),
+                'partylist': cand.partylist.short_code if cand.partylist else "Independent",
+                # Mark winners based on position.number_of_winners
+                'is_winner': idx < pos.number_of_winners,
+                'rank': idx + 1,
+            })
+
+        positions_data.append({
+            'name': pos.name,
+            'candidates': candidates_data,
+            'total_votes': pos_total_votes,
+            'number_of_winners': pos.number_of_winners
+        })
+
+    return {
+        'total_ballots': get_ballots_cast(election),
+        'positions_data': positions_data,
+    }
+
 def terms(request):
     return render(request, 'pages/terms.html')
 
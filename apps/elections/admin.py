@@ -83,9 +83,13 @@ class CandidateAdmin(admin.ModelAdmin):
         'partylist__name',
     )
     list_editable = ('is_approved',)
+    # Every column (and __str__) reads these relations; join them up front
+    list_select_related = ('student_profile__user', 'election', 'position', 'partylist')
+    show_full_result_count = False
     
-    # REMOVED 'position' from this list to enable the dropdown menu:
-    raw_id_fields = ('student_profile', 'partylist')
+    # Students and partylists are searched instead of rendered as full
+    # dropdowns; positions and elections are short lists and keep theirs
+    autocomplete_fields = ('student_profile', 'partylist')
     readonly_fields = ('created_at',)
     
     fieldsets = (
@@ -130,13 +134,13 @@ class ElectionTimelineInline(admin.TabularInline):
 class ElectionAdmin(admin.ModelAdmin):
     list_display = ('name', 'start_time', 'end_time', 'is_active', 'status', 'created_at')
     list_filter = ('is_active', 'start_time', 'end_time')
-    search_fields = ('name', 'description')
+    search_fields = ('name',)
     readonly_fields = ('created_at', 'updated_at')
     inlines = [ElectionTimelineInline]
     
     fieldsets = (
         ('Election Details', {
-            'fields': ('name', 'description'),
+            'fields': ('name',),
         }),
         ('Schedule', {
             'fields': ('start_time', 'end_time'),
@@ -156,6 +160,12 @@ class VoteAdmin(admin.ModelAdmin):
     list_filter = ('election', 'position')
     search_fields = ('candidate__student_profile__user__username',)
     readonly_fields = ('election', 'position', 'candidate', 'ballot_id', 'timestamp')
+    # Candidate.__str__ reads the student's name, position and election
+    list_select_related = (
+        'election', 'position',
+        'candidate__student_profile__user', 'candidate__position', 'candidate__election',
+    )
+    show_full_result_count = False
     
     def has_add_permission(self, request):
         return False
@@ -169,6 +179,8 @@ class VoterReceiptAdmin(admin.ModelAdmin):
     list_filter = ('election', 'timestamp')
     search_fields = ('voter__user__username', 'ballot_id')
     readonly_fields = ('voter', 'election', 'ballot_id', 'encrypted_choices', 'timestamp', 'voter_ip_address')
+    list_select_related = ('voter__user', 'election')
+    show_full_result_count = False
     
     def has_add_permission(self, request):
         return False
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0004_electiontimeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectionSnapshot',
+            fields=[
+                ('election', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='elections.election')),
+                ('eligible_voters', models.PositiveIntegerField(default=0)),
+                ('ballots_cast', models.PositiveIntegerField(default=0)),
+                ('votes_cast', models.PositiveIntegerField(default=0, help_text='Individual candidate selections.')),
+                ('seats', models.PositiveIntegerField(default=0, help_text='Winners to be elected across all contested positions.')),
+                ('participation_by_course', models.JSONField(default=dict)),
+                ('participation_by_year', models.JSONField(default=dict)),
+                ('captured_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Election Snapshot',
+                'verbose_name_plural': 'Election Snapshots',
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_electionsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='electionsnapshot',
+            name='candidate_pairs',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'ballot_id'], name='vote_election_ballot_idx'),
+        ),
+    ]
@@ -245,6 +245,10 @@ class Vote(models.Model):
         verbose_name = 'Vote Record'
         verbose_name_plural = 'Vote Records'
         ordering = ['-timestamp']
+        indexes = [
+            # Reading an election's votes ballot by ballot (candidate pair counts)
+            models.Index(fields=['election', 'ballot_id'], name='vote_election_ballot_idx'),
+        ]
 
     def __str__(self):
         return f"Vote for {self.candidate} in {self.election.name}"
@@ -287,4 +291,42 @@ class VoterReceipt(models.Model):
         ordering = ['-timestamp']
 
     def __str__(self):
-        return f"Receipt for {self.voter} in {self.election.name}"
\ No newline at end of file
+        return f"Receipt for {self.voter} in {self.election.name}"
+
+# ----------------------------------------------------------------------
+# 7. Election Snapshot Model (Frozen Rollup)
+# ----------------------------------------------------------------------
+class ElectionSnapshot(models.Model):
+    """
+    Frozen turnout figures for a closed election.
+
+    Captured once after an election ends so historical comparisons read one
+    row instead of recounting ballots. Deleted whenever the election's votes
+    are reset so it is recaptured from the remaining data.
+    """
+    election = models.OneToOneField(
+        Election,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot'
+    )
+    eligible_voters = models.PositiveIntegerField(default=0)
+    ballots_cast = models.PositiveIntegerField(default=0)
+    votes_cast = models.PositiveIntegerField(default=0, help_text="Individual candidate selections.")
+    seats = models.PositiveIntegerField(default=0, help_text="Winners to be elected across all contested positions.")
+
+    # Ballots cast per cohort, e.g. {"BSIT": 120} and {"1": 80}
+    participation_by_course = models.JSONField(default=dict)
+    participation_by_year = models.JSONField(default=dict)
+    # [candidate, candidate, ballots] for every pair chosen together on a ballot;
+    # null until a results bundle first needs them (too costly for comparisons)
+    candidate_pairs = models.JSONField(null=True, blank=True)
+
+    captured_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Election Snapshot'
+        verbose_name_plural = 'Election Snapshots'
+
+    def __str__(self):
+        return f"Snapshot of {self.election.name}"
@@ -0,0 +1,286 @@
+"""
+Read-side helpers for election results.
+
+Tallies are computed with grouped queries so the cost of a results page does
+not grow with the number of candidates.
+"""
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.core.cache import CANDIDATES, bump_version_on_commit, election_tally
+
+from .models import Candidate, Election, ElectionSnapshot, Vote, VoterReceipt
+
+
+def get_candidate_tallies(election):
+    """Return ``{candidate_id: vote_count}`` for an election in one query."""
+    rows = (
+        Vote.objects.filter(election=election)
+        .values('candidate_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    return {row['candidate_id']: row['count'] for row in rows}
+
+
+def get_ballots_cast(election):
+    """Number of voters who submitted a ballot (one receipt per voter)."""
+    return VoterReceipt.objects.filter(election=election).count()
+
+
+def get_position_results(election, mark_winners=False, active_positions_only=False):
+    """
+    Build per-position results for an election.
+
+    Returns a list of ``{'position', 'candidates', 'total_votes'}`` dicts ordered
+    by ballot order, with candidates sorted by votes. When ``mark_winners`` is
+    set, the top ``number_of_winners`` candidates (plus anyone tied for the last
+    seat) get ``is_winner=True``. ``active_positions_only`` skips positions
+    that have been deactivated.
+    """
+    tallies = get_candidate_tallies(election)
+    candidates = (
+        Candidate.objects.filter(election=election)
+        .select_related('student_profile__user', 'partylist', 'position')
+        .order_by('position__order_on_ballot', 'pk')
+    )
+    if active_positions_only:
+        candidates = candidates.filter(position__is_active=True)
+
+    positions = {}
+    for candidate in candidates:
+        entry = positions.setdefault(candidate.position_id, {
+            'position': candidate.position,
+            'candidates': [],
+            'total_votes': 0,
+        })
+        votes = tallies.get(candidate.pk, 0)
+        entry['total_votes'] += votes
+        entry['candidates'].append({
+            'candidate': candidate,
+            'votes': votes,
+            'is_winner': False,
+        })
+
+    results = list(positions.values())
+    for entry in results:
+        entry['candidates'].sort(key=lambda c: c['votes'], reverse=True)
+        if mark_winners:
+            _mark_winners(entry['candidates'], entry['position'].number_of_winners)
+    return results
+
+
+def _mark_winners(candidates, number_of_winners):
+    """Flag the top N candidates, extending the last seat to anyone tied."""
+    if not candidates:
+        return
+    for candidate in candidates[:number_of_winners]:
+        candidate['is_winner'] = True
+    if len(candidates) > number_of_winners:
+        last_winner_votes = candidates[number_of_winners - 1]['votes']
+        for candidate in candidates[number_of_winners:]:
+            if candidate['votes'] == last_winner_votes and last_winner_votes > 0:
+                candidate['is_winner'] = True
+            else:
+                break
+
+
+def get_comparative_stats():
+    """
+    Turnout, abstention and cohort participation for every election.
+
+    Closed elections are read from their :class:`ElectionSnapshot`, captured
+    the first time they are compared. Elections without a snapshot are
+    counted together with a fixed number of grouped queries, so the cost does
+    not depend on how many elections or ballots exist.
+    """
+    from apps.accounts.models import StudentProfile
+
+    now = timezone.now()
+    elections = list(Election.objects.select_related('snapshot').order_by('start_time'))
+    live = [e for e in elections if not hasattr(e, 'snapshot')]
+
+    computed = {}
+    if live:
+        eligible_voters = StudentProfile.objects.filter(is_eligible_to_vote=True).count()
+        computed = _count_elections([e.pk for e in live], eligible_voters)
+
+        # Freeze closed elections so later comparisons skip the recount
+        # (candidate pairs are left for get_candidate_pairs to fill in)
+        closed = [
+            ElectionSnapshot(election=e, **computed[e.pk])
+            for e in live if e.end_time < now
+        ]
+        if closed:
+            ElectionSnapshot.objects.bulk_create(closed, ignore_conflicts=True)
+
+    rows = []
+    for election in elections:
+        snapshot = getattr(election, 'snapshot', None)
+        figures = computed.get(election.pk) or _snapshot_figures(snapshot)
+        rows.append(_comparison_row(election, figures, from_snapshot=snapshot is not None))
+    return rows
+
+
+def get_election_figures(election):
+    """
+    Turnout figures of one election (eligible voters, ballots, votes, seats
+    and ballots per cohort) - from its snapshot if it has one, otherwise
+    counted like :func:`get_comparative_stats` does.
+    """
+    from apps.accounts.models import StudentProfile
+
+    snapshot = ElectionSnapshot.objects.filter(election=election).first()
+    if snapshot is not None:
+        return _snapshot_figures(snapshot)
+    eligible_voters = StudentProfile.objects.filter(is_eligible_to_vote=True).count()
+    return _count_elections([election.pk], eligible_voters)[election.pk]
+
+
+def get_candidate_pairs(election):
+    """
+    Ballots shared by each pair of candidates of one election (see
+    :func:`count_candidate_pairs`). They are counted on first use and kept
+    in a closed election's snapshot, which is captured here if the election
+    was never compared.
+    """
+    snapshot = ElectionSnapshot.objects.filter(election=election).first()
+    if snapshot is not None and snapshot.candidate_pairs is not None:
+        return snapshot.candidate_pairs
+
+    pairs = count_candidate_pairs([election.pk])[election.pk]
+    if snapshot is not None:
+        ElectionSnapshot.objects.filter(pk=snapshot.pk).update(candidate_pairs=pairs)
+    elif election.end_time < timezone.now():
+        figures = get_election_figures(election)
+        ElectionSnapshot.objects.bulk_create(
+            [ElectionSnapshot(election=election, candidate_pairs=pairs, **figures)], ignore_conflicts=True)
+    return pairs
+
+
+def count_candidate_pairs(election_ids):
+    """
+    ``{election_id: [[a, b, ballots], ...]}`` with, for every pair of
+    candidates ``a <= b`` chosen together on at least one ballot, the number
+    of such ballots (``a == b`` is a candidate's ballot count).
+
+    Votes are read in ballot order through the (election, ballot_id) index,
+    one ballot at a time.
+    """
+    counts = {pk: Counter() for pk in election_ids}
+    votes = (
+        Vote.objects.filter(election_id__in=election_ids, ballot_id__isnull=False)
+        .order_by('election_id', 'ballot_id')
+        .values_list('election_id', 'ballot_id', 'candidate_id')
+    )
+    for (election_id, _), ballot in groupby(votes.iterator(chunk_size=5000), key=itemgetter(0, 1)):
+        chosen = sorted({candidate_id for _, _, candidate_id in ballot})
+        for i, a in enumerate(chosen):
+            for b in chosen[i:]:
+                counts[election_id][a, b] += 1
+    return {pk: [[a, b, n] for (a, b), n in sorted(pairs.items())] for pk, pairs in counts.items()}
+
+
+def invalidate_snapshot(election_id):
+    """Drop an election's frozen figures so they are recaptured."""
+    ElectionSnapshot.objects.filter(election_id=election_id).delete()
+
+
+def invalidate_election_results(election_id):
+    """
+    Discard everything derived from an election's ballots after a bulk
+    change that sends no signals (e.g. a vote reset): cached tallies,
+    results pages and report data (all keyed on the election's tally
+    version), the comparison rollups, and the frozen snapshot.
+    """
+    bump_version_on_commit(election_tally(election_id))
+    # Candidate listings show per-candidate vote counts
+    bump_version_on_commit(CANDIDATES)
+    invalidate_snapshot(election_id)
+
+
+def _count_elections(election_ids, eligible_voters):
+    """Count ballots, votes, seats and cohorts for many elections at once."""
+    figures = {
+        pk: {
+            'eligible_voters': eligible_voters,
+            'ballots_cast': 0,
+            'votes_cast': 0,
+            'seats': 0,
+            'participation_by_course': {},
+            'participation_by_year': {},
+        }
+        for pk in election_ids
+    }
+
+    votes = (
+        Vote.objects.filter(election_id__in=election_ids)
+        .values('election_id').annotate(count=Count('id')).order_by()
+    )
+    for row in votes:
+        figures[row['election_id']]['votes_cast'] = row['count']
+
+    # Seats: winners per distinct contested position
+    contested = (
+        Candidate.objects.filter(election_id__in=election_ids)
+        .values_list('election_id', 'position_id', 'position__number_of_winners')
+        .distinct().order_by()
+    )
+    for election_id, _, number_of_winners in contested:
+        figures[election_id]['seats'] += number_of_winners
+
+    # Ballots per cohort; their sum is the ballot count
+    cohorts = (
+        VoterReceipt.objects.filter(election_id__in=election_ids)
+        .values('election_id', 'voter__course', 'voter__year_level')
+        .annotate(count=Count('id')).order_by()
+    )
+    for row in cohorts:
+        entry = figures[row['election_id']]
+        entry['ballots_cast'] += row['count']
+        course = row['voter__course'] or 'Unspecified'
+        year = str(row['voter__year_level'])
+        entry['participation_by_course'][course] = entry['participation_by_course'].get(course, 0) + row['count']
+        entry['participation_by_year'][year] = entry['participation_by_year'].get(year, 0) + row['count']
+
+    return figures
+
+
+def _snapshot_figures(snapshot):
+    return {
+        'eligible_voters': snapshot.eligible_voters,
+        'ballots_cast': snapshot.ballots_cast,
+        'votes_cast': snapshot.votes_cast,
+        'seats': snapshot.seats,
+        'participation_by_course': snapshot.participation_by_course,
+        'participation_by_year': snapshot.participation_by_year,
+    }
+
+
+def _comparison_row(election, figures, from_snapshot):
+    eligible = figures['eligible_voters']
+    ballots = figures['ballots_cast']
+    possible_votes = ballots * figures['seats']
+    abstention_rate = 0
+    if possible_votes > 0:
+        abstention_rate = round(max(0, (possible_votes - figures['votes_cast']) / possible_votes * 100), 1)
+
+    return {
+        'id': election.pk,
+        'name': election.name,
+        'start_time': election.start_time,
+        'end_time': election.end_time,
+        'status': election.status,
+        'eligible_voters': eligible,
+        'ballots_cast': ballots,
+        'votes_cast': figures['votes_cast'],
+        'turnout_percentage': round(ballots / eligible * 100, 2) if eligible > 0 else 0,
+        'abstention_rate': abstention_rate,
+        'participation_by_course': figures['participation_by_course'],
+        'participation_by_year': figures['participation_by_year'],
+        'from_snapshot': from_snapshot,
+    }
@@ -0,0 +1,44 @@
+"""
+Cache and snapshot invalidation for election data.
+
+Votes are always written together with their VoterReceipt inside one
+transaction, so receipts alone drive the tally version. Bulk deletes (vote
+resets) bypass signals and bump the namespace explicitly.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.core.cache import CANDIDATES, bump_version_on_commit, election_tally
+from .models import Candidate, Election, Partylist, Position, VoterReceipt
+from .services import invalidate_snapshot
+
+
+@receiver(post_save, sender=VoterReceipt)
+def receipt_saved(sender, instance, **kwargs):
+    bump_version_on_commit(election_tally(instance.election_id))
+
+
+@receiver(post_save, sender=Election)
+def election_saved(sender, instance, **kwargs):
+    bump_version_on_commit(election_tally(instance.pk))
+    # Election names appear in candidate listings and filters
+    bump_version_on_commit(CANDIDATES)
+    # A reopened election is no longer final
+    if not kwargs.get('created') and instance.end_time > timezone.now():
+        invalidate_snapshot(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Candidate)
+def candidate_changed(sender, instance, **kwargs):
+    bump_version_on_commit(CANDIDATES)
+    bump_version_on_commit(election_tally(instance.election_id))
+    invalidate_snapshot(instance.election_id)
+
+
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Partylist)
+def ballot_structure_changed(sender, instance, **kwargs):
+    # Deleting a partylist detaches its candidates with a bulk UPDATE, which
+    # sends no Candidate signals
+    bump_version_on_commit(CANDIDATES)
@@ -1,3 +1,81 @@
-# from django.contrib import admin
+from django.contrib import admin, messages
+from . import artifacts
+from .models import ReportArtifact, ReportJob, ReportNarrative
+from .narratives import generate_narrative_report, narrative_failed, NARRATIVE_UNAVAILABLE
+from .utils import get_election_data
 
-# Register your models here.
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'phase', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    list_select_related = ('created_by',)
+    show_full_result_count = False
+    readonly_fields = (
+        'kind', 'status', 'params', 'phase', 'progress_done', 'progress_total', 'artifact_path', 'artifact',
+        'error', 'created_by', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReportArtifact)
+class ReportArtifactAdmin(admin.ModelAdmin):
+    list_display = ('key', 'kind', 'election', 'size', 'reusable', 'permanent', 'created_at', 'last_accessed_at')
+    list_filter = ('kind', 'permanent', 'reusable')
+    list_select_related = ('election',)
+    show_full_result_count = False
+    readonly_fields = (
+        'key', 'kind', 'path', 'size', 'election', 'reusable', 'permanent', 'created_at', 'last_accessed_at',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReportNarrative)
+class ReportNarrativeAdmin(admin.ModelAdmin):
+    list_display = ('election', 'model', 'prompt_version', 'created_at', 'updated_at')
+    list_filter = ('model', 'prompt_version')
+    list_select_related = ('election',)
+    show_full_result_count = False
+    readonly_fields = ('key', 'election', 'model', 'prompt_version', 'text', 'created_at', 'updated_at')
+    actions = ['regenerate']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_regenerate_permission(self, request):
+        # Every regeneration is a paid API call
+        return request.user.is_superuser
+
+    @admin.action(description='Regenerate from current results', permissions=['regenerate'])
+    def regenerate(self, request, queryset):
+        """
+        Write the narrative of each selected election again and drop its
+        stored election reports, so the next report shows the new text.
+        """
+        election_ids = set(queryset.exclude(election=None).values_list('election_id', flat=True))
+        regenerated = 0
+        for election_id in election_ids:
+            data = get_election_data(election_id)
+            if not data:
+                continue
+            narrative = generate_narrative_report(data, regenerate=True)
+            if narrative_failed(narrative) or narrative.startswith(NARRATIVE_UNAVAILABLE):
+                self.message_user(request, f"{data['election']}: {narrative}", messages.ERROR)
+                continue
+            artifacts.discard(ReportArtifact.objects.filter(election_id=election_id, kind=ReportJob.Kind.ELECTION))
+            regenerated += 1
+        if regenerated:
+            self.message_user(request, f"Regenerated {regenerated} narrative(s).", messages.SUCCESS)
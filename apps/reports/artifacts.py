@@ -0,0 +1,207 @@
+"""
+Content-addressed store of generated reports.
+
+A report's key is a SHA-256 of everything its PDF is built from: the report
+data itself (for an election, the full tally), the template version, the
+language, the chart backend and style, and the narrative version (model,
+prompt version and whether a narrative can be generated at all). Hashing
+the data rather than cache version counters keeps keys valid across cache
+flushes and processes.
+
+Files live under ``REPORT_ARTIFACT_DIR`` as ``<key[:2]>/<key>.pdf`` with a
+:class:`~.models.ReportArtifact` row each. When the evictable files exceed
+``REPORT_ARTIFACT_MAX_BYTES`` the least recently downloaded go first.
+Reports of closed elections are permanent; a permanent report is released
+to normal eviction once a newer one exists for the same election (e.g.
+after its votes were reset).
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Sum
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+from apps.accounts.demographics import voter_demographics
+from apps.elections.models import Election
+from .charts import CHART_STYLE, chart_backend
+from .models import ReportArtifact, ReportJob
+from .narratives import NARRATIVE_PROMPT_VERSION, narrative_available, narrative_model
+from .utils import candidate_summary, get_election_data
+
+# Part of every artifact key; bump when the layout of any report (``pdf``)
+# changes so stored PDFs are rebuilt
+REPORT_TEMPLATE_VERSION = 2
+
+
+def _election_inputs(params):
+    data = get_election_data(params.get('election_id'))
+    if not data:
+        return None
+    election = data['election']
+    return {
+        'election': [election.pk, election.name, election.status],
+        'tally': {
+            key: data[key] for key in ('eligible_voters', 'ballots_cast', 'turnout_percentage', 'results')
+        },
+        'narrative': [narrative_model(), NARRATIVE_PROMPT_VERSION, narrative_available()],
+        'charts': [chart_backend(), CHART_STYLE],
+    }
+
+
+def _demographics_inputs(params):
+    return voter_demographics()['rows']
+
+
+def _candidate_summary_inputs(params):
+    _, groups = candidate_summary(params.get('election_id'))
+    return [[election.pk, election.name, election.status, positions] for election, positions in groups]
+
+
+# The audit log changes with every request, so its report is never reused
+INPUTS = {
+    ReportJob.Kind.ELECTION: _election_inputs,
+    ReportJob.Kind.VOTER_DEMOGRAPHICS: _demographics_inputs,
+    ReportJob.Kind.CANDIDATE_SUMMARY: _candidate_summary_inputs,
+}
+
+
+def report_key(kind, params):
+    """Key of the report ``kind``/``params`` would produce now, or None if it is never reused."""
+    inputs = INPUTS.get(kind)
+    data = inputs(params) if inputs else None
+    if data is None:
+        return None
+    payload = {
+        'kind': kind,
+        'template': REPORT_TEMPLATE_VERSION,
+        'language': settings.LANGUAGE_CODE,
+        'data': data,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def is_permanent(kind, params):
+    """Results of closed elections no longer change; keep their reports."""
+    if kind != ReportJob.Kind.ELECTION:
+        return False
+    election = Election.objects.filter(pk=params.get('election_id')).first()
+    return election is not None and election.status == 'Closed'
+
+
+def artifact_dir():
+    return Path(settings.REPORT_ARTIFACT_DIR)
+
+
+def file_of(artifact):
+    return artifact_dir() / artifact.path
+
+
+def partial_path(job_id):
+    """Where a job writes its PDF before it is added to the store."""
+    path = artifact_dir() / 'tmp' / f'{job_id}.part'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def lookup(key):
+    """The stored artifact for ``key`` (marked as used), or None."""
+    artifact = ReportArtifact.objects.filter(key=key, reusable=True).first()
+    if artifact is None:
+        return None
+    if not file_of(artifact).is_file():
+        # Removed from disk behind our back
+        artifact.delete()
+        return None
+    touch(artifact)
+    return artifact
+
+
+def store(partial, key, kind, reusable=True, election_id=None, permanent=False):
+    """Move a finished file into the store under ``key`` and return its artifact."""
+    relative = f'{key[:2]}/{key}.pdf' if reusable else f'jobs/{key}.pdf'
+    path = artifact_dir() / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Readers never see a half-written file
+    os.replace(partial, path)
+    artifact, _ = ReportArtifact.objects.update_or_create(key=key, defaults={
+        'kind': kind,
+        'path': relative,
+        'size': path.stat().st_size,
+        'election_id': election_id,
+        'reusable': reusable,
+        'permanent': permanent,
+        'last_accessed_at': timezone.now(),
+    })
+    evict()
+    return artifact
+
+
+def discard(artifacts):
+    """Delete ``artifacts`` (a queryset) and their files; they are rebuilt when next requested."""
+    discarded = 0
+    for artifact in artifacts:
+        file_of(artifact).unlink(missing_ok=True)
+        artifact.delete()
+        discarded += 1
+    return discarded
+
+
+def touch(artifact):
+    ReportArtifact.objects.filter(pk=artifact.pk).update(last_accessed_at=timezone.now())
+
+
+def evict(max_bytes=None):
+    """
+    Delete least recently used evictable artifacts until they fit in
+    ``max_bytes`` (default ``REPORT_ARTIFACT_MAX_BYTES``). Returns the number deleted.
+    """
+    if max_bytes is None:
+        max_bytes = settings.REPORT_ARTIFACT_MAX_BYTES
+    _release_superseded()
+
+    evictable = ReportArtifact.objects.filter(permanent=False)
+    total = evictable.aggregate(total=Sum('size'))['total'] or 0
+    evicted = 0
+    for artifact in evictable.order_by('last_accessed_at', 'pk').iterator():
+        if total <= max_bytes:
+            break
+        file_of(artifact).unlink(missing_ok=True)
+        artifact.delete()
+        total -= artifact.size
+        evicted += 1
+    return evicted
+
+
+def _release_superseded():
+    """Unpin permanent reports that have a newer one for the same election."""
+    latest = {}
+    superseded = []
+    pinned = ReportArtifact.objects.filter(permanent=True, election__isnull=False).order_by('-created_at', '-pk')
+    for pk, election_id, kind in pinned.values_list('pk', 'election_id', 'kind'):
+        if (election_id, kind) in latest:
+            superseded.append(pk)
+        else:
+            latest[election_id, kind] = pk
+    if superseded:
+        ReportArtifact.objects.filter(pk__in=superseded).update(permanent=False)
+
+
+def serve(artifact, filename):
+    """
+    Download response for an artifact. With ``REPORT_ARTIFACT_ACCEL_REDIRECT``
+    set, nginx sends the file from its internal location; otherwise Django
+    streams it.
+    """
+    touch(artifact)
+    prefix = getattr(settings, 'REPORT_ARTIFACT_ACCEL_REDIRECT', None)
+    if prefix:
+        response = HttpResponse(content_type='application/pdf')
+        response['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{artifact.path}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    return FileResponse(open(file_of(artifact), 'rb'), as_attachment=True, filename=filename,
+                        content_type='application/pdf')
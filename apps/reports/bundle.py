@@ -0,0 +1,272 @@
+"""
+Results bundle: the results of one election in machine-readable form.
+
+A zip archive of typed CSV tables, with every column also stored as a NumPy
+``.npy`` array and a ``schema.json`` describing both:
+
+* ``candidates`` - votes, share and winner flag of every candidate
+* ``turnout`` - ballots cast per hour, and cumulatively
+* ``participation`` - ballots and eligible voters per course and year level
+* ``incidence`` (array only) - candidates x candidates, the number of ballots
+  on which both were chosen. Its diagonal is each candidate's ballot count.
+  Only these pairwise counts are exported, never single ballots.
+
+Tables come from the grouped tallies and rollups the results pages and
+comparisons use (the election's snapshot once it is closed, which also keeps
+the pair counts behind ``incidence``), are cached until the election's
+tally, its candidates or the voters change, and the archive is streamed.
+"""
+import io
+import json
+from datetime import timezone as dt_timezone
+
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from apps.accounts.demographics import voter_demographics
+from apps.core.cache import CANDIDATES, VOTERS, election_tally, versioned_key
+from apps.core.services.single_flight import single_flight
+from apps.core.streaming import csv_chunks, zip_chunks
+from apps.elections.models import VoterReceipt
+from apps.elections.services import get_candidate_pairs, get_election_figures, get_position_results
+from .utils import REPORT_DATA_TTL
+
+BUNDLE_FORMAT = 'votewise-results-bundle'
+# Bump when a table or column changes meaning
+BUNDLE_VERSION = 1
+
+# Column types of the schema and the NumPy dtype each is stored as
+# (strings are stored as fixed-width unicode, sized to the longest value)
+COLUMN_DTYPES = {
+    'integer': 'int64',
+    'number': 'float64',
+    'boolean': 'bool',
+    'string': 'str',
+    'datetime': 'datetime64[s]',
+}
+
+UNSPECIFIED = 'Unspecified'
+
+# name: (description, [(column, type, description)])
+TABLES = {
+    'candidates': (
+        'Votes per candidate, in ballot order and by votes within a position.',
+        [
+            ('position_id', 'integer', 'Position'),
+            ('position', 'string', 'Position name'),
+            ('order_on_ballot', 'integer', 'Place of the position on the ballot'),
+            ('candidate_id', 'integer', 'Candidate'),
+            ('name', 'string', 'Candidate name'),
+            ('partylist', 'string', 'Partylist short code, empty for independents'),
+            ('votes', 'integer', 'Votes received'),
+            ('share', 'number', 'Share of the votes cast for the position, 0 to 1'),
+            ('is_winner', 'boolean', 'Won a seat (ties for the last seat included)'),
+        ],
+    ),
+    'turnout': (
+        'Ballots cast per hour, for hours in which any were cast.',
+        [
+            ('hour', 'datetime', 'Start of the hour, UTC'),
+            ('ballots', 'integer', 'Ballots cast during the hour'),
+            ('cumulative_ballots', 'integer', 'Ballots cast up to the end of the hour'),
+        ],
+    ),
+    'participation': (
+        'Ballots cast per cohort, by course and by year level.',
+        [
+            ('dimension', 'string', "'course' or 'year_level'"),
+            ('cohort', 'string', 'Course code or year level'),
+            ('label', 'string', 'Cohort name'),
+            ('ballots', 'integer', 'Ballots cast by the cohort'),
+            ('eligible', 'integer', 'Voters of the cohort currently eligible to vote'),
+            ('rate', 'number', 'ballots / eligible, 0 if no one is eligible'),
+        ],
+    ),
+}
+
+INCIDENCE_DESCRIPTION = (
+    'Ballots on which both candidates were chosen; rows and columns follow '
+    'candidates.candidate_id.'
+)
+
+
+def bundle_filename(election):
+    return f'election_{election.pk}_results.zip'
+
+
+def results_tables(election):
+    """
+    The bundle's data: ``{'tables': {name: rows}, 'incidence': matrix}``,
+    rows being lists in the column order of :data:`TABLES`.
+    """
+    key, _ = versioned_key(
+        'report:results-bundle', [VOTERS, CANDIDATES, election_tally(election.pk)], election.pk)
+    return single_flight(key, lambda: _compute_tables(election), REPORT_DATA_TTL)
+
+
+def _compute_tables(election):
+    candidates = []
+    for entry in get_position_results(election, mark_winners=True):
+        position, total = entry['position'], entry['total_votes']
+        for result in entry['candidates']:
+            candidate = result['candidate']
+            candidates.append([
+                position.pk, position.name, position.order_on_ballot,
+                candidate.pk, candidate.student_profile.user.get_full_name(),
+                candidate.partylist.short_code if candidate.partylist else '',
+                result['votes'], result['votes'] / total if total else 0.0, result['is_winner'],
+            ])
+
+    return {
+        'tables': {
+            'candidates': candidates,
+            'turnout': _turnout(election),
+            'participation': _participation(election),
+        },
+        'incidence': _incidence(election, [row[3] for row in candidates]),
+    }
+
+
+def _turnout(election):
+    hourly = (
+        VoterReceipt.objects.filter(election=election)
+        .annotate(hour=TruncHour('timestamp', tzinfo=dt_timezone.utc))
+        .values('hour').annotate(ballots=Count('id')).order_by('hour')
+    )
+    rows, cumulative = [], 0
+    for row in hourly:
+        cumulative += row['ballots']
+        rows.append([row['hour'], row['ballots'], cumulative])
+    return rows
+
+
+def _participation(election):
+    figures = get_election_figures(election)
+    demographics = voter_demographics()
+    rows = []
+    for dimension, ballots_by_cohort, rollup in (
+        ('course', figures['participation_by_course'], demographics['by_course']),
+        ('year_level', figures['participation_by_year'], demographics['by_year_level']),
+    ):
+        # Snapshot keys are strings, with voters lacking a course under UNSPECIFIED
+        cohorts = {
+            UNSPECIFIED if row[dimension] in (None, '') else str(row[dimension]): row
+            for row in rollup
+        }
+        for cohort in [*cohorts, *(c for c in ballots_by_cohort if c not in cohorts)]:
+            ballots = ballots_by_cohort.get(cohort, 0)
+            eligible = cohorts[cohort]['eligible'] if cohort in cohorts else 0
+            label = cohorts[cohort]['label'] if cohort in cohorts else cohort
+            rows.append([dimension, cohort, label, ballots, eligible, ballots / eligible if eligible else 0.0])
+    return rows
+
+
+def _incidence(election, candidate_ids):
+    index = {pk: i for i, pk in enumerate(candidate_ids)}
+    matrix = [[0] * len(candidate_ids) for _ in candidate_ids]
+    for a, b, count in get_candidate_pairs(election):
+        if a in index and b in index:
+            matrix[index[a]][index[b]] = matrix[index[b]][index[a]] = count
+    return matrix
+
+
+# ----------------------------------------------------------------------
+# Archive
+# ----------------------------------------------------------------------
+def _dtype(kind, values):
+    if kind == 'string':
+        return f'<U{max((len(value) for value in values), default=1) or 1}'
+    return COLUMN_DTYPES[kind]
+
+
+def _array_path(table, column):
+    return f'npy/{table}.{column}.npy'
+
+
+def _npy(values, dtype, shape=None):
+    import numpy
+
+    if dtype.startswith('datetime64'):
+        # NumPy datetimes are naive; the values are UTC
+        values = [value.replace(tzinfo=None) for value in values]
+    buffer = io.BytesIO()
+    array = numpy.asarray(values, dtype=dtype)
+    if shape is not None:
+        array = array.reshape(shape)
+    numpy.save(buffer, array, allow_pickle=False)
+    yield buffer.getvalue()
+
+
+def _csv_value(kind, value):
+    if kind == 'boolean':
+        return 'true' if value else 'false'
+    if kind == 'datetime':
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return value
+
+
+def _csv(columns, rows):
+    kinds = [kind for _, kind, _ in columns]
+    header = [name for name, _, _ in columns]
+    return csv_chunks(header, ([_csv_value(k, v) for k, v in zip(kinds, row)] for row in rows))
+
+
+def bundle_schema(election, data):
+    tables = {}
+    for name, (description, columns) in TABLES.items():
+        rows = data['tables'][name]
+        tables[name] = {
+            'description': description,
+            'path': f'{name}.csv',
+            'rows': len(rows),
+            'columns': [
+                {
+                    'name': column,
+                    'type': kind,
+                    'description': column_description,
+                    'array': _array_path(name, column),
+                    'dtype': _dtype(kind, [row[i] for row in rows]),
+                }
+                for i, (column, kind, column_description) in enumerate(columns)
+            ],
+        }
+    size = len(data['incidence'])
+    return {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'generated_at': timezone.now().isoformat(timespec='seconds'),
+        'election': {
+            'id': election.pk,
+            'name': election.name,
+            'start_time': election.start_time.isoformat(),
+            'end_time': election.end_time.isoformat(),
+            'status': election.status,
+        },
+        'tables': tables,
+        'arrays': {
+            'incidence': {
+                'description': INCIDENCE_DESCRIPTION,
+                'path': 'npy/incidence.npy',
+                'dtype': 'int64',
+                'shape': [size, size],
+            },
+        },
+    }
+
+
+def bundle_chunks(election):
+    """The results bundle of ``election`` as a stream of zip archive bytes."""
+    data = results_tables(election)
+    schema = bundle_schema(election, data)
+
+    members = [('schema.json', [json.dumps(schema, indent=2)])]
+    for name, (_, columns) in TABLES.items():
+        members.append((schema['tables'][name]['path'], _csv(columns, data['tables'][name])))
+    for name, table in schema['tables'].items():
+        rows = data['tables'][name]
+        for i, column in enumerate(table['columns']):
+            members.append((column['array'], _npy([row[i] for row in rows], column['dtype'])))
+    incidence = schema['arrays']['incidence']
+    members.append((incidence['path'], _npy(data['incidence'], incidence['dtype'], incidence['shape'])))
+    return zip_chunks(members)
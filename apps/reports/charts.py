@@ -0,0 +1,261 @@
+"""
+Result charts for election reports.
+
+``REPORT_CHART_BACKEND`` picks how charts are drawn:
+
+* ``'reportlab'`` (default) draws vector bar charts with ``reportlab.graphics``
+  straight into the PDF. They are cheap to build, stay sharp at any zoom and
+  keep reports small; matplotlib is not imported at all.
+* ``'matplotlib'`` rasterizes a PNG per position. It is also the fallback
+  for any position whose vector chart cannot be drawn.
+
+PNG charts are cached under a hash of what they show - position, candidate
+names, vote counts and the chart style - so a chart is rendered once for as
+long as its numbers do not change, whichever report needs it. Charts
+missing from the cache are rendered in parallel in a process pool
+of ``REPORT_CHART_WORKERS`` processes (matplotlib holds the GIL, so threads
+would not help). The pool is started on first use and reused by later
+reports; the renderer itself does not touch Django, so pool processes never
+load the project. With fewer than two charts to draw, or if the pool cannot
+be used, charts are rendered in the calling process.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.core.logging import logger
+
+CHART_BACKENDS = ('reportlab', 'matplotlib')
+
+# Bump when the look of the charts changes
+CHART_STYLE = {
+    'version': 1,
+    # Size on the page, in inches
+    'size': (6.5, 4),
+    'figsize': (10, 6),
+    'dpi': 100,
+    'color': '#2563eb',
+}
+
+CHART_CACHE_TTL = 24 * 60 * 60
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def chart_backend():
+    backend = getattr(settings, 'REPORT_CHART_BACKEND', 'reportlab')
+    if backend not in CHART_BACKENDS:
+        raise ImproperlyConfigured(f"REPORT_CHART_BACKEND must be one of {', '.join(CHART_BACKENDS)}")
+    return backend
+
+
+def chart_flowables(results, backend=None, style=CHART_STYLE):
+    """
+    ReportLab flowables charting every position of ``results``
+    ({position: [candidate dicts]}), in the order of ``results``. Positions
+    whose chart fails are left out.
+    """
+    backend = backend or chart_backend()
+    flowables = {}
+    fallback = {}
+    for position, candidates in results.items():
+        if not candidates:
+            continue
+        if backend == 'reportlab':
+            try:
+                flowables[position] = vector_chart(
+                    position, [c['name'] for c in candidates], [c['votes'] for c in candidates], style)
+                continue
+            except Exception as e:
+                logger.error(f"Error drawing chart for {position}, rendering it with matplotlib: {e}",
+                             category="REPORT")
+        fallback[position] = candidates
+
+    if fallback:
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Image
+
+        width, height = style['size']
+        for position, png in render_charts(fallback, style).items():
+            flowables[position] = Image(io.BytesIO(png), width=width * inch, height=height * inch)
+
+    return {position: flowables[position] for position in results if position in flowables}
+
+
+def vector_chart(position, names, votes, style=CHART_STYLE):
+    """Bar chart of one position's results as a ReportLab ``Drawing``."""
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing, Group, String
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+
+    width, height = (side * inch for side in style['size'])
+    drawing = Drawing(width, height)
+    # Rotate x-axis labels if many candidates
+    rotate = len(names) > 3
+
+    chart = VerticalBarChart()
+    chart.x = 60
+    chart.y = 80 if rotate else 45
+    chart.width = width - chart.x - 10
+    chart.height = height - chart.y - 40
+    chart.data = [list(votes)]
+    chart.bars[0].fillColor = colors.HexColor(style['color'])
+    chart.bars[0].strokeColor = None
+
+    # Value labels
+    chart.barLabelFormat = '%d'
+    chart.barLabels.nudge = 7
+    chart.barLabels.fontSize = 8
+
+    chart.categoryAxis.categoryNames = list(names)
+    chart.categoryAxis.labels.fontSize = 8
+    if rotate:
+        chart.categoryAxis.labels.angle = 45
+        chart.categoryAxis.labels.boxAnchor = 'ne'
+        chart.categoryAxis.labels.dx = 4
+        chart.categoryAxis.labels.dy = -4
+
+    top = max(votes, default=0)
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = None if top else 1
+    if top < 5:
+        chart.valueAxis.valueStep = 1
+    chart.valueAxis.labelTextFormat = '%d'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    chart.valueAxis.gridStrokeDashArray = (3, 3)
+    drawing.add(chart)
+
+    drawing.add(String(width / 2, height - 18, f'Results for {position}', fontSize=14, textAnchor='middle'))
+    drawing.add(String(chart.x + chart.width / 2, 4, 'Candidates', fontSize=9, textAnchor='middle'))
+    ylabel = Group(String(0, 0, 'Votes Cast', fontSize=9, textAnchor='middle'))
+    ylabel.translate(14, chart.y + chart.height / 2)
+    ylabel.rotate(90)
+    drawing.add(ylabel)
+    return drawing
+
+
+def chart_key(position, names, votes, style=CHART_STYLE):
+    payload = json.dumps([position, names, votes, style], sort_keys=True)
+    return f'report:chart:{hashlib.sha256(payload.encode()).hexdigest()}'
+
+
+def render_chart(position, names, votes, style=CHART_STYLE):
+    """Bar chart of one position's results as PNG bytes, drawn with matplotlib."""
+    # Imported here so importing this module (and pool start-up) stays cheap
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    # Create figure using OO interface (no pyplot)
+    fig = Figure(figsize=style['figsize'], dpi=style['dpi'])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    # Plot
+    bars = ax.bar(names, votes, color=style['color'])
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{int(height)}',
+                ha='center', va='bottom')
+
+    ax.set_title(f'Results for {position}', fontsize=14, pad=20)
+    ax.set_ylabel('Votes Cast')
+    ax.set_xlabel('Candidates')
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+
+    # Rotate x-axis labels if many candidates
+    if len(names) > 3:
+        fig.autofmt_xdate(rotation=45)
+
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    canvas.print_png(buffer)
+    return buffer.getvalue()
+
+
+def render_charts(results, style=CHART_STYLE, workers=None):
+    """
+    PNG chart of every position of ``results`` ({position: [candidate dicts]}).
+    Returns {position: png_bytes} in the order of ``results``; positions
+    whose chart fails are left out.
+    """
+    specs = {
+        position: ([c['name'] for c in candidates], [c['votes'] for c in candidates])
+        for position, candidates in results.items() if candidates
+    }
+    keys = {position: chart_key(position, *spec, style) for position, spec in specs.items()}
+    cached = cache.get_many(list(keys.values()))
+
+    charts = {position: cached[key] for position, key in keys.items() if key in cached}
+    missing = [position for position in specs if position not in charts]
+    if missing:
+        rendered = _render_missing(missing, specs, style, workers)
+        cache.set_many({keys[position]: png for position, png in rendered.items()}, CHART_CACHE_TTL)
+        charts.update(rendered)
+
+    return {position: charts[position] for position in specs if position in charts}
+
+
+def _render_missing(positions, specs, style, workers):
+    if workers is None:
+        workers = getattr(settings, 'REPORT_CHART_WORKERS', 0)
+    if workers > 1 and len(positions) > 1:
+        try:
+            return _render_in_pool(positions, specs, style, workers)
+        except (BrokenProcessPool, OSError) as e:
+            logger.error(f"Chart process pool unavailable, rendering in process: {e}", category="REPORT")
+            _shutdown_pool()
+
+    rendered = {}
+    for position in positions:
+        try:
+            rendered[position] = render_chart(position, *specs[position], style)
+        except Exception as e:
+            logger.error(f"Error generating chart for {position}: {e}", category="REPORT")
+    return rendered
+
+
+def _render_in_pool(positions, specs, style, workers):
+    pool = _get_pool(workers)
+    futures = {position: pool.submit(render_chart, position, *specs[position], style) for position in positions}
+    rendered = {}
+    for position, future in futures.items():
+        try:
+            rendered[position] = future.result()
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating chart for {position}: {e}", category="REPORT")
+    return rendered
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a multi-threaded web or worker process is unsafe
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,175 @@
+"""
+Queued report generation.
+
+The hub creates a ``ReportJob`` and returns straight away; the PDF is built
+outside the request and added to the artifact store (``.artifacts``), and
+the hub polls :func:`job_payload` until the file can be downloaded. A report
+whose inputs match a stored artifact completes at once, without a rebuild.
+
+Jobs are run by ``manage.py run_report_worker``. With
+``REPORT_JOBS_IN_PROCESS`` enabled (the development default) a job is
+instead started in a daemon thread of the web process once the request's
+transaction commits, so reports work without a separate worker. Either way a
+job is claimed with a conditional update, so it is built only once.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.logging import logger
+from . import artifacts
+from .models import ReportJob
+
+# Builder of each kind, in ``pdf``; that module (and with it ReportLab) is
+# imported by the first job, so processes that only queue reports never load it
+BUILDERS = {
+    ReportJob.Kind.ELECTION: 'build_election_report',
+    ReportJob.Kind.VOTER_DEMOGRAPHICS: 'build_voter_demographics_report',
+    ReportJob.Kind.AUDIT_LOG: 'build_audit_log_report',
+    ReportJob.Kind.CANDIDATE_SUMMARY: 'build_candidate_summary_report',
+}
+
+# Set to False (e.g. in tests) to run in-process jobs inline instead of in a thread
+RUN_IN_THREAD = True
+
+
+def _builder(kind):
+    from . import pdf
+
+    return getattr(pdf, BUILDERS[kind])
+
+
+def request_report(kind, params, user=None):
+    """Queue a report and return its job (already completed if it is stored)."""
+    key = artifacts.report_key(kind, params)
+    artifact = artifacts.lookup(key) if key else None
+    if artifact is not None:
+        now = timezone.now()
+        return ReportJob.objects.create(
+            kind=kind, params=params, created_by=user, status=ReportJob.Status.COMPLETED,
+            phase='stored', artifact=artifact, artifact_path=artifact.path, started_at=now, finished_at=now)
+
+    job = ReportJob.objects.create(kind=kind, params=params, created_by=user)
+    if getattr(settings, 'REPORT_JOBS_IN_PROCESS', False):
+        transaction.on_commit(lambda: _dispatch(job.pk))
+    return job
+
+
+def _dispatch(job_id):
+    if not RUN_IN_THREAD:
+        run_report_job(job_id)
+        return
+    thread = threading.Thread(target=_run_in_thread, args=(job_id,), name=f'report-job-{job_id}')
+    thread.daemon = True
+    thread.start()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_report_job(job_id)
+    finally:
+        # The thread has its own database connection; do not leak it
+        connection.close()
+
+
+def claim(job_id):
+    """Mark a queued job as running. False if another process got it first."""
+    return bool(ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.PENDING).update(
+        status=ReportJob.Status.RUNNING, started_at=timezone.now(), updated_at=timezone.now()))
+
+
+def claim_next():
+    """Claim the oldest queued job. Returns its id, or None when the queue is empty."""
+    while True:
+        job_id = (
+            ReportJob.objects.filter(status=ReportJob.Status.PENDING)
+            .order_by('created_at', 'pk').values_list('pk', flat=True).first()
+        )
+        if job_id is None or claim(job_id):
+            return job_id
+
+
+def requeue_stale(seconds):
+    """Put running jobs without progress for ``seconds`` back in the queue (their worker died)."""
+    stale = timezone.now() - timedelta(seconds=seconds)
+    return ReportJob.objects.filter(status=ReportJob.Status.RUNNING, updated_at__lt=stale).update(
+        status=ReportJob.Status.PENDING, phase='', progress_done=0, progress_total=0)
+
+
+def run_report_job(job_id, claimed=False):
+    """
+    Build the report of one job (claiming it first unless ``claimed``).
+    Returns the job, or None if it was not ours to run.
+    """
+    close_old_connections()
+    if not claimed and not claim(job_id):
+        return None
+    job = ReportJob.objects.get(pk=job_id)
+
+    def progress(phase, done=None, total=None):
+        fields = {'phase': phase, 'updated_at': timezone.now()}
+        if done is not None:
+            fields['progress_done'] = done
+        if total is not None:
+            fields['progress_total'] = total
+        ReportJob.objects.filter(pk=job.pk).update(**fields)
+
+    partial = None
+    try:
+        key = artifacts.report_key(job.kind, job.params)
+        # Built meanwhile for an identical request
+        artifact = artifacts.lookup(key) if key else None
+        if artifact is None:
+            partial = artifacts.partial_path(job.pk)
+            with open(partial, 'wb') as output:
+                reusable = _builder(job.kind)(job.params, output, progress) is not False
+            if not (key and reusable):
+                key, reusable = f'job-{job.pk}', False
+            artifact = artifacts.store(
+                partial, key, job.kind, reusable=reusable,
+                election_id=job.params.get('election_id'),
+                permanent=reusable and artifacts.is_permanent(job.kind, job.params))
+    except Exception as e:
+        if partial is not None:
+            partial.unlink(missing_ok=True)
+        logger.error(f"Report job {job.pk} ({job.kind}) failed: {e}", category="REPORT")
+        ReportJob.objects.filter(pk=job.pk).update(
+            status=ReportJob.Status.FAILED, error=str(e), finished_at=timezone.now())
+    else:
+        ReportJob.objects.filter(pk=job.pk).update(
+            status=ReportJob.Status.COMPLETED, artifact=artifact, artifact_path=artifact.path, phase='done',
+            progress_done=F('progress_total'), finished_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def job_artifact(job):
+    """The stored PDF of a finished job, or None if it is not available (e.g. evicted)."""
+    if job.status != ReportJob.Status.COMPLETED or job.artifact_id is None:
+        return None
+    artifact = job.artifact
+    return artifact if artifacts.file_of(artifact).is_file() else None
+
+
+def job_payload(job):
+    """JSON-serialisable status of a report job for the hub."""
+    ready = job.status == ReportJob.Status.COMPLETED
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'label': job.get_kind_display(),
+        'status': job.status,
+        'status_label': job.get_status_display(),
+        'phase': job.phase,
+        'done': job.progress_done,
+        'total': job.progress_total,
+        'percent': job.percent,
+        'finished': job.is_finished,
+        'error': job.error,
+        'download_url': reverse('reports:report_job_download', args=[job.pk]) if ready else None,
+    }
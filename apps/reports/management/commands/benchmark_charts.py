@@ -0,0 +1,69 @@
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.reports import charts
+
+
+class Command(BaseCommand):
+    help = ('Time chart rendering for a synthetic ballot: matplotlib in process, in the process pool '
+            'and from cache, and ReportLab vector charts')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--positions',
+            type=int,
+            default=12,
+            help='Positions on the ballot (default: 12)'
+        )
+        parser.add_argument(
+            '--candidates',
+            type=int,
+            default=5,
+            help='Candidates per position (default: 5)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Pool size (default: REPORT_CHART_WORKERS)'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or max(2, settings.REPORT_CHART_WORKERS)
+        rng = random.Random(0)
+        results = {
+            f'Position {p}': [
+                {'name': f'Candidate {p}-{c}', 'votes': rng.randint(0, 5000)}
+                for c in range(1, options['candidates'] + 1)
+            ]
+            for p in range(1, options['positions'] + 1)
+        }
+
+        def timed(label, workers):
+            # A style of its own per run so nothing is served from the cache
+            style = {**charts.CHART_STYLE, 'benchmark': uuid.uuid4().hex}
+            started = time.perf_counter()
+            rendered = charts.render_charts(results, style=style, workers=workers)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{label:<32}{elapsed * 1000:>10.1f} ms  ({len(rendered)} charts)')
+            return style
+
+        self.stdout.write(
+            f"{options['positions']} positions x {options['candidates']} candidates, {workers} workers")
+        timed('in process', 0)
+        timed('pool (incl. start-up)', workers)
+        style = timed('pool (warm)', workers)
+
+        started = time.perf_counter()
+        charts.render_charts(results, style=style, workers=workers)
+        self.stdout.write(f"{'cached':<32}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+
+        started = time.perf_counter()
+        drawn = charts.chart_flowables(results, backend='reportlab')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{'vector (reportlab)':<32}{elapsed * 1000:>10.1f} ms  ({len(drawn)} charts)")
+        charts._shutdown_pool()
@@ -0,0 +1,395 @@
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from apps.accounts.demographics import voter_demographics
+from apps.accounts.models import Course, StudentProfile, YearLevel
+from apps.administration.filters import filter_audit_logs
+from apps.administration.models import AuditLog
+from apps.core.cache import CANDIDATES, VOTERS, bump_version, election_tally
+from apps.elections.models import Candidate, Election, Partylist, Position, Vote, VoterReceipt
+from apps.reports import pdf
+from apps.reports.models import ReportNarrative
+from apps.reports.narratives import generate_narrative_report
+from apps.reports.utils import candidate_summary, generate_charts, get_election_data
+
+# Action of the seeded audit entries; the audit report is filtered on it
+BENCHMARK_ACTION = 'BENCHMARK'
+
+# Partylists candidates are spread over (the rest run as independents)
+PARTYLISTS = 3
+
+# A stage is only a regression if it is also slower by at least this many
+# seconds, so sub-millisecond stages do not fail on timer noise
+NOISE_SECONDS = 0.05
+
+SIZE_OPTIONS = ('voters', 'positions', 'candidates', 'turnout', 'audit_entries', 'seed')
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+
+def _no_progress(phase, done=None, total=None):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Seed a synthetic election and time every stage of every report (data, charts, '
+            'narrative, PDF) with query counts and memory peaks, optionally against a saved baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--voters',
+            type=int,
+            default=2000,
+            help='Registered voters to seed (default: 2000)'
+        )
+        parser.add_argument(
+            '--positions',
+            type=int,
+            default=12,
+            help='Positions on the ballot (default: 12)'
+        )
+        parser.add_argument(
+            '--candidates',
+            type=int,
+            default=5,
+            help='Candidates per position (default: 5)'
+        )
+        parser.add_argument(
+            '--turnout',
+            type=float,
+            default=0.75,
+            help='Share of voters who cast a ballot (default: 0.75)'
+        )
+        parser.add_argument(
+            '--audit-entries',
+            type=int,
+            default=5000,
+            help='Audit log entries to seed (default: 5000)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed of the synthetic data (default: 0)'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'reports.json'),
+            help='Baseline file to compare against (default: benchmarks/reports.json)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Write this run to the baseline file instead of comparing against it'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed slowdown against the baseline, as a fraction (default: 0.25)'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error if any stage regressed against the baseline'
+        )
+        parser.add_argument(
+            '--no-tracemalloc',
+            action='store_true',
+            help='Do not trace Python allocations (faster, but no per-stage memory peaks)'
+        )
+        parser.add_argument(
+            '--keep-data',
+            action='store_true',
+            help='Leave the seeded election, voters and audit entries in the database'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run even with DEBUG off'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Refusing to seed benchmark data with DEBUG off; pass --force to run anyway.')
+        if options['positions'] < 1 or options['candidates'] < 1:
+            raise CommandError('--positions and --candidates must be at least 1.')
+        if options['voters'] < options['positions'] * options['candidates']:
+            # Every candidate is one of the seeded students
+            raise CommandError('--voters must be at least --positions x --candidates.')
+        if not 0 <= options['turnout'] <= 1:
+            raise CommandError('--turnout must be between 0 and 1.')
+
+        size = {name: options[name] for name in SIZE_OPTIONS}
+        self.trace = not options['no_tracemalloc']
+        self.results = {}
+
+        self.stdout.write('Seeding: ' + ', '.join(f'{name}={value}' for name, value in size.items()))
+        token = uuid.uuid4().hex[:8]
+        started = time.perf_counter()
+        election = self.seed(
+            token, random.Random(options['seed']), options['voters'], options['positions'],
+            options['candidates'], options['turnout'], options['audit_entries'])
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f} s')
+
+        # Leave tracing alone if it was already on (python -X tracemalloc)
+        own_trace = self.trace and not tracemalloc.is_tracing()
+        if own_trace:
+            tracemalloc.start()
+        try:
+            self.run_reports(election)
+        finally:
+            if own_trace:
+                tracemalloc.stop()
+            if not options['keep_data']:
+                self.clean_up(token, election)
+
+        run = {
+            'recorded_at': timezone.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'size': size,
+            'peak_rss_mb': _peak_rss_mb(),
+            'reports': self.results,
+        }
+        baseline = self.load_baseline(options['baseline']) if not options['save_baseline'] else None
+        if baseline is not None and baseline.get('size') != size:
+            self.stdout.write(self.style.WARNING(
+                'Baseline was recorded with a different size; not comparing.'))
+            baseline = None
+
+        regressions = self.report(run, baseline, options['tolerance'])
+
+        if options['save_baseline']:
+            path = Path(options['baseline'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(run, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {path}'))
+        elif regressions:
+            message = f'{len(regressions)} stage(s) regressed: {", ".join(regressions)}'
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+
+    # ------------------------------------------------------------------
+    # Synthetic data
+    # ------------------------------------------------------------------
+    def seed(self, token, rng, voters, positions, candidates, turnout, audit_entries):
+        """Seed a finished election named after ``token``; returns it."""
+        now = timezone.now()
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'bench-{token}-{i}', first_name='Voter', last_name=f'{token} {i}',
+                     password='!')
+                for i in range(voters)
+            ], batch_size=1000)
+            # Usernames are reloaded for their primary keys (not every database returns them)
+            users = list(User.objects.filter(username__startswith=f'bench-{token}-').order_by('pk'))
+            StudentProfile.objects.bulk_create([
+                StudentProfile(
+                    user=user,
+                    student_id=f'B{token}-{i}',
+                    course=rng.choice(Course.values),
+                    year_level=rng.choice(YearLevel.values),
+                    verification_status=rng.choice(StudentProfile.VerificationStatus.values),
+                )
+                for i, user in enumerate(users)
+            ], batch_size=1000)
+            profiles = list(StudentProfile.objects.filter(user__in=users).order_by('pk'))
+
+            election = Election.objects.create(
+                name=f'Benchmark {token}', start_time=now - timedelta(days=1), end_time=now - timedelta(hours=1))
+            partylists = [
+                Partylist.objects.create(name=f'Benchmark {token} {p}', short_code=f'B{token[:6]}{p}')
+                for p in range(PARTYLISTS)
+            ]
+            first_order = (Position.objects.aggregate(top=Max('order_on_ballot'))['top'] or 0) + 1
+            ballot = []
+            for p in range(positions):
+                position = Position.objects.create(name=f'Benchmark {token} {p}', order_on_ballot=first_order + p)
+                Candidate.objects.bulk_create([
+                    Candidate(
+                        student_profile=profiles[p * candidates + c],
+                        position=position,
+                        election=election,
+                        partylist=partylists[c] if c < PARTYLISTS else None,
+                        biography=f'Platform of candidate {c} for position {p}. ' * 20,
+                        is_approved=True,
+                    )
+                    for c in range(candidates)
+                ])
+                ballot.append((position, list(Candidate.objects.filter(position=position))))
+
+            receipts, votes = [], []
+            for profile in rng.sample(profiles, round(len(profiles) * turnout)):
+                ballot_id = uuid.uuid4()
+                receipts.append(VoterReceipt(
+                    voter=profile, election=election, ballot_id=ballot_id, encrypted_choices=''))
+                votes.extend(
+                    Vote(election=election, candidate=rng.choice(running), position=position, ballot_id=ballot_id)
+                    for position, running in ballot
+                )
+            VoterReceipt.objects.bulk_create(receipts, batch_size=1000)
+            Vote.objects.bulk_create(votes, batch_size=1000)
+
+            AuditLog.objects.bulk_create([
+                AuditLog(action=BENCHMARK_ACTION, details=f'Benchmark {token} entry {i}',
+                         timestamp=now - timedelta(minutes=i))
+                for i in range(audit_entries)
+            ], batch_size=1000)
+
+        # bulk_create sends no signals, so cached figures are invalidated here
+        bump_version(VOTERS)
+        bump_version(CANDIDATES)
+        bump_version(election_tally(election.pk))
+        return election
+
+    def clean_up(self, token, election):
+        with transaction.atomic():
+            Vote.objects.filter(election=election).delete()
+            VoterReceipt.objects.filter(election=election).delete()
+            Candidate.objects.filter(election=election).delete()
+            ReportNarrative.objects.filter(election=election).delete()
+            election.delete()
+            Position.objects.filter(name__startswith=f'Benchmark {token} ').delete()
+            Partylist.objects.filter(name__startswith=f'Benchmark {token} ').delete()
+            User.objects.filter(username__startswith=f'bench-{token}-').delete()
+            AuditLog.objects.filter(action=BENCHMARK_ACTION, details__startswith=f'Benchmark {token} ').delete()
+        bump_version(VOTERS)
+        bump_version(CANDIDATES)
+        bump_version(election_tally(election.pk))
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+    @contextmanager
+    def stage(self, report, name):
+        """Time the block as ``report``/``name``: wall time, queries and Python memory peak."""
+        if self.trace:
+            tracemalloc.reset_peak()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - started
+        result = {'seconds': round(elapsed, 4), 'queries': len(queries)}
+        if self.trace:
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        self.results.setdefault(report, {})[name] = result
+
+    def total(self, report):
+        stages = self.results[report].values()
+        total = {
+            'seconds': round(sum(s['seconds'] for s in stages), 4),
+            'queries': sum(s['queries'] for s in stages),
+        }
+        if self.trace:
+            total['peak_mb'] = max(s['peak_mb'] for s in stages)
+        self.results[report]['total'] = total
+
+    def run_reports(self, election):
+        """
+        Every report in stages. Data stages start from cold caches; the
+        ``pdf`` stage then runs the report builder as the report worker
+        would, with the data (and narrative) already at hand - i.e. it
+        measures the layout.
+        """
+        params = {'election_id': election.pk}
+        with override_settings(REPORT_NARRATIVE_BACKEND='stub'):
+            with self.stage('election', 'data'):
+                data = get_election_data(election.pk)
+            with self.stage('election', 'charts'):
+                generate_charts(data)
+            with self.stage('election', 'narrative'):
+                generate_narrative_report(data)
+            with self.stage('election', 'pdf'):
+                pdf.build_election_report(params, io.BytesIO(), _no_progress)
+        self.total('election')
+
+        with self.stage('voter_demographics', 'data'):
+            voter_demographics()
+        with self.stage('voter_demographics', 'pdf'):
+            pdf.build_voter_demographics_report({}, io.BytesIO(), _no_progress)
+        self.total('voter_demographics')
+
+        with self.stage('candidate_summary', 'data'):
+            _, groups = candidate_summary(election.pk)
+            for _ in groups:
+                pass
+        with self.stage('candidate_summary', 'pdf'):
+            pdf.build_candidate_summary_report(params, io.BytesIO(), _no_progress)
+        self.total('candidate_summary')
+
+        audit_params = {'action': BENCHMARK_ACTION}
+        with self.stage('audit_log', 'data'):
+            log_qs, _ = filter_audit_logs(AuditLog.objects.all(), audit_params)
+            for _ in log_qs.values_list('timestamp', 'user__username', 'action', 'details').iterator(
+                    chunk_size=pdf.AUDIT_REPORT_CHUNK_ROWS):
+                pass
+        with self.stage('audit_log', 'pdf'):
+            pdf.build_audit_log_report(audit_params, io.BytesIO(), _no_progress)
+        self.total('audit_log')
+
+    # ------------------------------------------------------------------
+    # Baseline
+    # ------------------------------------------------------------------
+    def load_baseline(self, path):
+        try:
+            return json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            self.stdout.write(f'No baseline at {path}; pass --save-baseline to record one.')
+        except ValueError as e:
+            raise CommandError(f'Baseline {path} is not valid JSON: {e}')
+        return None
+
+    def report(self, run, baseline, tolerance):
+        """Print the results (with deltas against ``baseline``); returns the regressed stages."""
+        regressions = []
+        self.stdout.write(f"{'report':<20}{'stage':<11}{'seconds':>10}{'queries':>9}{'peak MB':>9}  baseline")
+        for report, stages in run['reports'].items():
+            for name, result in stages.items():
+                peak = result.get('peak_mb')
+                line = (f"{report:<20}{name:<11}{result['seconds']:>10.3f}{result['queries']:>9}"
+                        f"{'-' if peak is None else f'{peak:.1f}':>9}")
+                before = (baseline or {}).get('reports', {}).get(report, {}).get(name)
+                if before:
+                    slower = result['seconds'] - before['seconds']
+                    change = slower / before['seconds'] * 100 if before['seconds'] else 0
+                    line += f"  {change:+.0f}% time, {result['queries'] - before['queries']:+d} queries"
+                    if (slower > NOISE_SECONDS and slower > before['seconds'] * tolerance
+                            or result['queries'] > before['queries']):
+                        regressions.append(f'{report}/{name}')
+                        line = self.style.ERROR(line + '  REGRESSION')
+                self.stdout.write(line)
+
+        if run['peak_rss_mb'] is not None:
+            self.stdout.write(f"Peak RSS: {run['peak_rss_mb']:.1f} MB")
+        return regressions
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.elections.models import Election
+from apps.reports.bundle import bundle_chunks, bundle_filename
+
+
+class Command(BaseCommand):
+    help = "Write an election's results bundle (typed CSV, NumPy arrays and a JSON schema in a zip)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'election_id',
+            type=int,
+            help='Election to export'
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='File to write (default: election_<id>_results.zip)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            election = Election.objects.get(pk=options['election_id'])
+        except Election.DoesNotExist:
+            raise CommandError(f"Election {options['election_id']} does not exist.")
+
+        path = options['output'] or bundle_filename(election)
+        size = 0
+        with open(path, 'wb') as output:
+            for chunk in bundle_chunks(election):
+                output.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {path} ({size} bytes).'))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.reports import jobs
+from apps.reports.models import ReportJob
+
+
+class Command(BaseCommand):
+    help = 'Build queued PDF reports (runs until stopped unless --once is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of waiting for new jobs'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between checks of an empty queue (default: 2)'
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Seconds without progress after which a running job is requeued (default: 600)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = jobs.requeue_stale(options['stale_after'])
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} interrupted report job(s).'))
+
+            job_id = jobs.claim_next()
+            if job_id is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            job = jobs.run_report_job(job_id, claimed=True)
+            style = self.style.SUCCESS if job.status == ReportJob.Status.COMPLETED else self.style.ERROR
+            self.stdout.write(style(f'{job}: {job.artifact_path or job.error}'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.3 on 2026-10-19 07:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ELECTION', 'Election Results'), ('VOTER_DEMOGRAPHICS', 'Voter Demographics'), ('AUDIT_LOG', 'Security Audit Log'), ('CANDIDATE_SUMMARY', 'Candidate Master List')], max_length=30)),
+                ('status', models.CharField(choices=[('PENDING', 'Queued'), ('RUNNING', 'Generating'), ('COMPLETED', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Input of the report (e.g. election id).')),
+                ('phase', models.CharField(blank=True, max_length=50)),
+                ('progress_done', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.PositiveIntegerField(default=0)),
+                ('artifact_path', models.CharField(blank=True, help_text='Generated file, relative to REPORT_ARTIFACT_DIR.', max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Report Job',
+                'verbose_name_plural': 'Report Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reports_rep_status_051565_idx')],
+            },
+        ),
+    ]
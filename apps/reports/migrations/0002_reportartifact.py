@@ -0,0 +1,45 @@
+# Generated by Django 5.1.3 on 2026-10-19 07:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_electionsnapshot'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(choices=[('ELECTION', 'Election Results'), ('VOTER_DEMOGRAPHICS', 'Voter Demographics'), ('AUDIT_LOG', 'Security Audit Log'), ('CANDIDATE_SUMMARY', 'Candidate Master List')], max_length=30)),
+                ('path', models.CharField(help_text='Relative to REPORT_ARTIFACT_DIR.', max_length=255)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('reusable', models.BooleanField(default=True)),
+                ('permanent', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('election', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_artifacts', to='elections.election')),
+            ],
+            options={
+                'verbose_name': 'Report Artifact',
+                'verbose_name_plural': 'Report Artifacts',
+                'ordering': ['-last_accessed_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='reportjob',
+            name='artifact',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='reports.reportartifact'),
+        ),
+        migrations.AddIndex(
+            model_name='reportartifact',
+            index=models.Index(fields=['permanent', 'last_accessed_at'], name='reports_rep_permane_76de05_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 07:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_electionsnapshot'),
+        ('reports', '0002_reportartifact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportNarrative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('model', models.CharField(max_length=50)),
+                ('prompt_version', models.PositiveIntegerField()),
+                ('text', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('election', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_narratives', to='elections.election')),
+            ],
+            options={
+                'verbose_name': 'Report Narrative',
+                'verbose_name_plural': 'Report Narratives',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['election', '-updated_at'], name='reports_rep_electio_114ccb_idx')],
+            },
+        ),
+    ]
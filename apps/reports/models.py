@@ -1,3 +1,169 @@
-# from django.db import models
+from django.db import models
+from django.utils import timezone
+from django.contrib.auth import get_user_model
 
-# Create your models here.
+User = get_user_model()
+
+
+# ----------------------------------------------------------------------
+# 1. Report Job Model
+# ----------------------------------------------------------------------
+class ReportJob(models.Model):
+    """
+    A requested PDF report. The reports hub queues a job and polls it; the
+    report worker (``manage.py run_report_worker``) builds the PDF and
+    records where the file was written.
+    """
+    class Kind(models.TextChoices):
+        ELECTION = 'ELECTION', 'Election Results'
+        VOTER_DEMOGRAPHICS = 'VOTER_DEMOGRAPHICS', 'Voter Demographics'
+        AUDIT_LOG = 'AUDIT_LOG', 'Security Audit Log'
+        CANDIDATE_SUMMARY = 'CANDIDATE_SUMMARY', 'Candidate Master List'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Queued'
+        RUNNING = 'RUNNING', 'Generating'
+        COMPLETED = 'COMPLETED', 'Ready'
+        FAILED = 'FAILED', 'Failed'
+
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    params = models.JSONField(default=dict, blank=True, help_text="Input of the report (e.g. election id).")
+    phase = models.CharField(max_length=50, blank=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    artifact_path = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Generated file, relative to REPORT_ARTIFACT_DIR."
+    )
+    artifact = models.ForeignKey(
+        'ReportArtifact',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    @property
+    def percent(self):
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(100, round(self.progress_done * 100 / self.progress_total))
+
+    @property
+    def filename(self):
+        """Name offered to the browser for the download."""
+        if self.kind == self.Kind.ELECTION:
+            return f"election_report_{self.params.get('election_id')}.pdf"
+        if self.kind == self.Kind.CANDIDATE_SUMMARY and self.params.get('election_id'):
+            return f"candidate_summary_report_{self.params['election_id']}.pdf"
+        return f"{self.kind.lower()}_report.pdf"
+
+
+# ----------------------------------------------------------------------
+# 2. Report Artifact Model
+# ----------------------------------------------------------------------
+class ReportArtifact(models.Model):
+    """
+    A generated report file in the artifact store (``apps.reports.artifacts``).
+
+    ``key`` is a hash of everything the PDF was built from, so a request
+    with the same inputs is served this file instead of being rebuilt.
+    Artifacts are evicted least recently used first once the store grows
+    past ``REPORT_ARTIFACT_MAX_BYTES``; permanent ones (results of closed
+    elections) are never evicted.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=30, choices=ReportJob.Kind.choices)
+    path = models.CharField(max_length=255, help_text="Relative to REPORT_ARTIFACT_DIR.")
+    size = models.PositiveBigIntegerField(default=0)
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_artifacts'
+    )
+    # Reusable artifacts are found by key; others exist for one job only
+    reusable = models.BooleanField(default=True)
+    permanent = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Report Artifact'
+        verbose_name_plural = 'Report Artifacts'
+        ordering = ['-last_accessed_at']
+        indexes = [
+            models.Index(fields=['permanent', 'last_accessed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.key[:12]}"
+
+
+# ----------------------------------------------------------------------
+# 3. Report Narrative Model
+# ----------------------------------------------------------------------
+class ReportNarrative(models.Model):
+    """
+    AI narrative of an election's results (``apps.reports.narratives``).
+
+    ``key`` is a hash of the results summary the model was given, the model
+    and the prompt version, so the same results are only narrated once.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_narratives'
+    )
+    model = models.CharField(max_length=50)
+    prompt_version = models.PositiveIntegerField()
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Report Narrative'
+        verbose_name_plural = 'Report Narratives'
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['election', '-updated_at']),
+        ]
+
+    def __str__(self):
+        return f"Narrative of {self.election or 'deleted election'} ({self.model})"
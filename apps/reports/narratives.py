@@ -0,0 +1,207 @@
+"""
+AI narratives of election results.
+
+A narrative is written from a plain-text summary of the results
+(:func:`data_summary`) and stored as a :class:`~.models.ReportNarrative`
+under a SHA-256 of that summary, the model and the prompt version. The same
+results are therefore narrated once; later reports reuse the stored text
+until an admin regenerates it (the "Regenerate" action of the narrative
+admin).
+
+``REPORT_NARRATIVE_BACKEND`` selects who writes narratives: ``'gemini'``
+calls the Gemini API, ``'stub'`` writes a fixed narrative locally (tests and
+offline development). A backend that has not answered after
+``REPORT_NARRATIVE_TIMEOUT`` seconds is abandoned; the report then falls
+back to the newest stored narrative of the election, marked as based on
+earlier results.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from apps.chatbot import gemini
+from apps.chatbot.services import get_gemini_api_key
+from apps.core.logging import logger
+from .models import ReportNarrative
+
+# Part of the narrative and artifact keys; bump NARRATIVE_PROMPT_VERSION
+# whenever the prompt below changes so narratives are written again
+NARRATIVE_MODEL = 'gemini-2.5-flash'
+NARRATIVE_PROMPT_VERSION = 1
+
+NARRATIVE_UNAVAILABLE = "AI Narrative generation unavailable"
+NARRATIVE_ERROR = "Error generating narrative"
+NARRATIVE_STALE = "Narrative based on earlier results"
+
+DISCLAIMER = (
+    "**DISCLAIMER: This narrative report was generated by AI based "
+    "on the official election data provided.**"
+)
+
+
+class NarrativeUnavailable(Exception):
+    """The backend cannot write narratives at all (e.g. no API key)."""
+
+
+def data_summary(election_data):
+    """The results as the text the model is given; identical results give identical text."""
+    election = election_data['election']
+
+    summary = f"""
+    ELECTION: {election.name}
+    STATUS: {election.status}
+    TURNOUT: {election_data['ballots_cast']} out of {election_data['eligible_voters']} eligible voters ({election_data['turnout_percentage']}%)
+
+    RESULTS BY POSITION:
+    """
+
+    for position, candidates in election_data['results'].items():
+        summary += f"\nPOSITION: {position}\n"
+        for i, c in enumerate(candidates, 1):
+            summary += f"{i}. {c['name']} ({c['party']}): {c['votes']} votes ({c['percentage']:.1f}%)\n"
+    return summary
+
+
+def build_prompt(summary):
+    return f"""
+    You are an impartial election analyst for VoteWise. Write a formal, factual, and unbiased narrative report for the election described below.
+
+    DATA:
+    {summary}
+
+    INSTRUCTIONS:
+    1. Start with an "Executive Summary" section summarizing the overall turnout and key outcomes.
+    2. Provide a "Results Analysis" section breaking down the results by position. Highlight the winners and the margins of victory. Mention if races were close or decisive.
+    3. Include a "Conclusion" section wrapping up the report.
+    4. TONE: Professional, objective, data-driven. Avoid emotional language or bias.
+    5. FORMAT: Use Markdown formatting (headers, bullet points).
+    6. DISCLAIMER: You MUST begin the report with the following exact disclaimer in bold: "{DISCLAIMER}"
+
+    Do not include any information not present in the data provided.
+    """
+
+
+def narrative_key(summary, model=None, prompt_version=NARRATIVE_PROMPT_VERSION):
+    payload = [summary, model or narrative_model(), prompt_version]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Backends: backend(prompt, summary) -> narrative text
+# ----------------------------------------------------------------------
+def _gemini(prompt, summary):
+    genai = gemini.load()
+    if genai is None:
+        raise NarrativeUnavailable("Google Generative AI library not installed.")
+    api_key = get_gemini_api_key()
+    if not api_key or api_key == 'YOUR_API_KEY_HERE':
+        raise NarrativeUnavailable("API Key not configured.")
+
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel(NARRATIVE_MODEL)
+    return model.generate_content(prompt).text
+
+
+def _stub(prompt, summary):
+    lines = [line.strip() for line in summary.strip().splitlines() if line.strip()]
+    return "\n".join([
+        DISCLAIMER,
+        "",
+        "## Executive Summary",
+        "This narrative was written by the local stub backend from the data below.",
+        "",
+        "## Results Analysis",
+        *(f"- {line}" for line in lines),
+        "",
+        "## Conclusion",
+        "No analysis is performed by the stub backend.",
+    ])
+
+
+BACKENDS = {
+    'gemini': _gemini,
+    'stub': _stub,
+}
+
+
+def narrative_backend():
+    backend = getattr(settings, 'REPORT_NARRATIVE_BACKEND', 'gemini')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(f"REPORT_NARRATIVE_BACKEND must be one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def narrative_model():
+    """Model name stored with (and keying) narratives of the configured backend."""
+    backend = narrative_backend()
+    return NARRATIVE_MODEL if backend == 'gemini' else backend
+
+
+def narrative_available():
+    """Whether narratives can be generated (stub backend, or library installed and API key set)."""
+    if narrative_backend() != 'gemini':
+        return True
+    api_key = get_gemini_api_key()
+    return bool(gemini.installed() and api_key and api_key != 'YOUR_API_KEY_HERE')
+
+
+def narrative_failed(narrative):
+    """True if ``narrative`` is not the narrative of the current results (worth retrying)."""
+    return narrative.startswith((NARRATIVE_ERROR, NARRATIVE_STALE))
+
+
+def _write(prompt, summary):
+    backend = BACKENDS[narrative_backend()]
+    timeout = getattr(settings, 'REPORT_NARRATIVE_TIMEOUT', None)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='narrative')
+    try:
+        future = executor.submit(backend, prompt, summary)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            # The call cannot be cancelled; its answer is dropped
+            raise TimeoutError(f"no answer within {timeout} seconds") from None
+    finally:
+        executor.shutdown(wait=False)
+
+
+def generate_narrative_report(election_data, regenerate=False):
+    """
+    Factual, unbiased narrative of an election's results.
+
+    Returns the stored narrative of these results if there is one (unless
+    ``regenerate``), otherwise writes and stores a new one.
+    """
+    election = election_data['election']
+    summary = data_summary(election_data)
+    key = narrative_key(summary)
+
+    if not regenerate:
+        stored = ReportNarrative.objects.filter(key=key).values_list('text', flat=True).first()
+        if stored is not None:
+            return stored
+
+    try:
+        text = _write(build_prompt(summary), summary)
+    except NarrativeUnavailable as e:
+        return f"{NARRATIVE_UNAVAILABLE}: {e}"
+    except Exception as e:
+        logger.error(f"Error generating narrative: {e}", category="REPORT")
+        earlier = ReportNarrative.objects.filter(election=election).first()
+        if earlier is None or regenerate:
+            return f"{NARRATIVE_ERROR}: {e}"
+        as_of = timezone.localtime(earlier.updated_at).strftime('%Y-%m-%d %H:%M')
+        return f"{NARRATIVE_STALE} (as of {as_of}); the AI service did not respond.\n\n{earlier.text}"
+
+    ReportNarrative.objects.update_or_create(key=key, defaults={
+        'election': election,
+        'model': narrative_model(),
+        'prompt_version': NARRATIVE_PROMPT_VERSION,
+        'text': text,
+    })
+    return text
@@ -0,0 +1,486 @@
+"""
+PDF report builders.
+
+Each builder has the signature ``build(params, output, progress)``: it
+writes a PDF for ``params`` (the ``ReportJob.params`` mapping) to the binary
+file object ``output`` and reports how far it got through
+``progress(phase, done=None, total=None)``. Builders run in the report
+worker, never inside a web request.
+
+A builder returns ``False`` when its output must not be reused for later
+identical requests (e.g. generating the narrative failed). Bump
+``artifacts.REPORT_TEMPLATE_VERSION`` whenever the layout of a report
+changes.
+
+This module imports ReportLab, so it is only imported by the code that
+builds reports (``jobs.run_job``), never when the URLconf loads.
+"""
+import re
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus.doctemplate import ActionFlowable, BaseDocTemplate, PageTemplate
+from reportlab.platypus.frames import Frame
+
+from apps.accounts.demographics import voter_demographics
+from apps.administration.filters import filter_audit_logs
+from apps.administration.models import AuditLog, AuditLogArchive
+from .narratives import generate_narrative_report, narrative_failed
+from .utils import candidate_summary, get_election_data, generate_charts
+
+# Audit entries fetched per query round trip and laid out per table
+AUDIT_REPORT_CHUNK_ROWS = 1000
+
+
+class ReportError(Exception):
+    """The report cannot be built from the given parameters."""
+
+
+def _title_styles():
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            name='CenterTitle',
+            parent=styles['Heading1'],
+            alignment=TA_CENTER,
+            spaceAfter=20))
+    return styles
+
+
+def _generated_at(styles):
+    return Paragraph(
+        f"<b>Date Generated:</b> {timezone.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal'])
+
+
+def build_election_report(params, output, progress):
+    """Turnout, AI narrative and per-position results with charts for one election."""
+    progress('collecting data')
+    data = get_election_data(params['election_id'])
+    if not data:
+        raise ReportError("Election not found")
+
+    election = data['election']
+    total = len(data['results'])
+
+    progress('rendering charts', done=0, total=total)
+    charts = generate_charts(data)
+    progress('writing narrative')
+    narrative = generate_narrative_report(data)
+
+    progress('laying out')
+    doc = SimpleDocTemplate(output, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+
+    styles = _title_styles()
+    styles.add(
+        ParagraphStyle(
+            name='Justify',
+            parent=styles['Normal'],
+            alignment=TA_JUSTIFY,
+            spaceAfter=12,
+            leading=14))
+    styles.add(
+        ParagraphStyle(
+            name='Disclaimer',
+            parent=styles['Normal'],
+            textColor=colors.gray,
+            fontSize=8,
+            spaceAfter=12))
+
+    story = []
+
+    # Title
+    story.append(Paragraph(f"Election Report: {election.name}", styles['CenterTitle']))
+
+    # Meta Info
+    story.append(
+        Paragraph(f"<b>Status:</b> {election.status}", styles['Normal']))
+    story.append(_generated_at(styles))
+    story.append(Spacer(1, 20))
+
+    # Turnout Section
+    story.append(Paragraph("Turnout Statistics", styles['Heading2']))
+    data_table = [
+        ['Eligible Voters', str(data['eligible_voters'])],
+        ['Ballots Cast', str(data['ballots_cast'])],
+        ['Turnout Percentage', f"{data['turnout_percentage']}%"]
+    ]
+    t = Table(data_table, colWidths=[3 * inch, 2 * inch], hAlign='LEFT')
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BOX', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    story.append(t)
+    story.append(Spacer(1, 24))
+
+    # AI Narrative Section
+    story.append(
+        Paragraph(
+            "AI-Generated Narrative Analysis",
+            styles['Heading2']))
+
+    # Simple markdown-to-reportlab formatting
+    # Replace bold **text** with <b>text</b>
+    formatted_narrative = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', narrative)
+
+    for line in formatted_narrative.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('#'):
+            # Handle headers
+            header_level = len(line.split()[0])  # Count #s
+            text = line.lstrip('#').strip()
+            if header_level == 1:
+                story.append(Paragraph(text, styles['Heading2']))
+            elif header_level == 2:
+                story.append(Paragraph(text, styles['Heading3']))
+            else:
+                story.append(Paragraph(text, styles['Heading4']))
+        elif line.startswith('- '):
+            # Bullet points
+            story.append(Paragraph(f"• {line[2:]}", styles['Justify']))
+        else:
+            story.append(Paragraph(line, styles['Justify']))
+
+    story.append(Spacer(1, 24))
+    story.append(PageBreak())
+
+    # Results & Charts Section
+    story.append(
+        Paragraph(
+            "Detailed Results & Visualizations",
+            styles['Heading2']))
+
+    for done, (position, chart) in enumerate(charts.items(), 1):
+        story.append(Paragraph(f"Position: {position}", styles['Heading3']))
+        story.append(chart)
+        story.append(Spacer(1, 12))
+
+        # Add table of results for this position
+        candidates = data['results'][position]
+        res_data = [['Candidate', 'Party', 'Votes', '%']]
+        for c in candidates:
+            res_data.append([
+                c['name'],
+                c['party'],
+                str(c['votes']),
+                f"{c['percentage']:.1f}%"
+            ])
+
+        t = Table(
+            res_data,
+            colWidths=[
+                2.5 * inch,
+                1.5 * inch,
+                1 * inch,
+                1 * inch])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.navy),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.whitesmoke),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(t)
+        story.append(Spacer(1, 24))
+        progress('laying out', done=done, total=total)
+
+    doc.build(story)
+    return not narrative_failed(narrative)
+
+
+def build_voter_demographics_report(params, output, progress):
+    """Registration summary and breakdowns by course and year level."""
+    progress('collecting data')
+    doc = SimpleDocTemplate(output, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+
+    styles = _title_styles()
+
+    story = []
+
+    # Title
+    story.append(
+        Paragraph(
+            "Voter Demographics & Registration Report",
+            styles['CenterTitle']))
+    story.append(_generated_at(styles))
+    story.append(Spacer(1, 20))
+
+    # Summary Stats
+    demographics = voter_demographics()
+    summary = demographics['summary']
+
+    story.append(Paragraph("Registration Summary", styles['Heading2']))
+
+    summary_data = [
+        ['Metric', 'Count'],
+        ['Total Registered Students', str(summary['total'])],
+        ['Verified Accounts', str(summary['verified'])],
+        ['Pending Verifications', str(summary['pending'])],
+        ['Eligible to Vote', str(summary['eligible'])]
+    ]
+
+    t = Table(summary_data, colWidths=[3 * inch, 2 * inch], hAlign='LEFT')
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    story.append(t)
+    story.append(Spacer(1, 20))
+
+    # Breakdown by Course
+    story.append(Paragraph("Breakdown by Course", styles['Heading2']))
+
+    course_data = [['Course', 'Total', 'Verified', 'Pending']]
+    for course in demographics['by_course']:
+        course_data.append(
+            [course['label'], str(course['total']), str(course['verified']), str(course['pending'])])
+
+    t_course = Table(
+        course_data,
+        colWidths=[
+            3.5 * inch,
+            1 * inch,
+            1 * inch,
+            1 * inch],
+        hAlign='LEFT')
+    t_course.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.navy),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey])
+    ]))
+    story.append(t_course)
+    story.append(Spacer(1, 20))
+
+    # Breakdown by Year Level
+    story.append(Paragraph("Breakdown by Year Level", styles['Heading2']))
+
+    year_data = [['Year Level', 'Total', 'Verified', 'Pending']]
+    for year in demographics['by_year_level']:
+        year_data.append([year['label'], str(year['total']), str(year['verified']), str(year['pending'])])
+
+    t_year = Table(
+        year_data,
+        colWidths=[
+            3.5 * inch,
+            1 * inch,
+            1 * inch,
+            1 * inch],
+        hAlign='LEFT')
+    t_year.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.navy),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey])
+    ]))
+    story.append(t_year)
+
+    progress('laying out')
+    doc.build(story)
+
+
+def build_audit_log_report(params, output, progress):
+    """
+    Audit log entries matching ``params`` (the audit log filters: action,
+    user, date range), newest first; ``params['source'] == 'archive'``
+    reports on the archived entries instead of the live log. Entries are
+    read in chunks and laid out as one table per chunk, so any number of
+    them can be reported.
+    """
+    progress('collecting data')
+    archived = params.get('source') == 'archive'
+    model = AuditLogArchive if archived else AuditLog
+    log_qs, filters = filter_audit_logs(model.objects.all(), params)
+    total = log_qs.count()
+    rows = log_qs.order_by('-timestamp', '-pk').values_list(
+        'timestamp', 'user__username', 'action', 'details').iterator(chunk_size=AUDIT_REPORT_CHUNK_ROWS)
+
+    doc = ChunkedDocTemplate(output, "System Audit & Security Log",
+                             rightMargin=50, leftMargin=50, pageCompression=1)
+    styles = _title_styles()
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.navy),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+
+    def chunks():
+        # Title
+        header = [
+            Paragraph("System Audit & Security Log", styles['CenterTitle']),
+            _generated_at(styles),
+        ]
+        if archived:
+            header.append(Paragraph("<b>Source:</b> archived entries", styles['Normal']))
+        active = [f"{key.replace('_', ' ')}: {value}" for key, value in filters.items() if value]
+        if active:
+            header.append(Paragraph(f"<b>Filters:</b> {escape(', '.join(active))}", styles['Normal']))
+        header.append(Paragraph(f"<b>Entries:</b> {total}", styles['Normal']))
+        header.append(Spacer(1, 20))
+        yield header
+
+        done = 0
+        while True:
+            batch = list(islice(rows, AUDIT_REPORT_CHUNK_ROWS))
+            if not batch:
+                break
+            data = [['Time', 'User', 'Action', 'Details']]
+            for timestamp, username, action, details in batch:
+                data.append([
+                    timezone.localtime(timestamp).strftime('%Y-%m-%d %H:%M'),
+                    username or "System",
+                    action,
+                    # Wrap details text
+                    Paragraph(escape(details), styles['Normal']),
+                ])
+            t = Table(data, colWidths=[1.2 * inch, 1 * inch, 1.5 * inch, 3.5 * inch], repeatRows=1)
+            t.setStyle(table_style)
+            yield [t]
+            done += len(batch)
+            progress('laying out', done=done, total=total)
+
+        if not total:
+            yield [Paragraph("No audit entries match the filters.", styles['Normal'])]
+
+    doc.build_chunks(chunks())
+
+
+class _Section(ActionFlowable):
+    """Sets the running header of the pages that follow."""
+
+    def __init__(self, title):
+        super().__init__()
+        self.title = title
+
+    def apply(self, doc):
+        doc.section = self.title
+
+
+class ChunkedDocTemplate(BaseDocTemplate):
+    """
+    Letter-size document with a running header and page numbers, laid out
+    from an iterable of flowable chunks. Only the chunk being laid out is
+    held in memory, so very long reports (e.g. multi-year archives) do not
+    build their whole story first.
+    """
+
+    def __init__(self, output, title, **kwargs):
+        options = dict(pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=54)
+        options.update(kwargs)
+        super().__init__(output, **options)
+        self.title_text = title
+        self.section = ''
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='body')
+        self.addPageTemplates([PageTemplate(id='page', frames=[frame], onPage=self._decorate_page)])
+
+    def _decorate_page(self, canvas, doc):
+        width, height = self.pagesize
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(colors.grey)
+        canvas.drawString(self.leftMargin, height - 40, self.section)
+        canvas.drawRightString(width - self.rightMargin, 30, f"{self.title_text} - Page {doc.page}")
+        canvas.restoreState()
+
+    def build_chunks(self, chunks):
+        """Like ``build()``, taking the flowables one chunk (list) at a time."""
+        self._startBuild()
+        self.canv._doctemplate = self
+        try:
+            for chunk in chunks:
+                flowables = list(chunk)
+                while flowables:
+                    self.clean_hanging()
+                    self.handle_flowable(flowables)
+        finally:
+            del self.canv._doctemplate
+        self._endBuild()
+
+
+def build_candidate_summary_report(params, output, progress):
+    """Candidates of every election (or of ``params['election_id']``), grouped by position."""
+    progress('collecting data')
+    elections, groups = candidate_summary(params.get('election_id'))
+    if params.get('election_id') is not None and not elections:
+        raise ReportError("Election not found")
+
+    doc = ChunkedDocTemplate(output, "Official Candidate List")
+    styles = _title_styles()
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+
+    def chunks():
+        # Title
+        yield [
+            Paragraph("Official Candidate List", styles['CenterTitle']),
+            _generated_at(styles),
+            Spacer(1, 20),
+        ]
+
+        for done, (election, positions) in enumerate(groups):
+            progress('laying out', done=done, total=len(elections))
+            chunk = [_Section(f"Election: {election.name}")]
+            if done:
+                chunk.append(PageBreak())
+            chunk += [
+                Paragraph(f"Election: {election.name}", styles['Heading2']),
+                Paragraph(f"Status: {election.status}", styles['Normal']),
+                Spacer(1, 10),
+            ]
+            if not positions:
+                chunk += [Paragraph("No candidates registered.", styles['Normal']), Spacer(1, 20)]
+            yield chunk
+
+            for position, candidates in positions:
+                c_data = [['Name', 'Party', 'Platform Summary']]
+                for c in candidates:
+                    platform = Paragraph(
+                        c['platform'] + "..." if c['platform'] else "No biography provided.", styles['Normal'])
+                    c_data.append([c['name'], c['party'], platform])
+
+                t = Table(c_data, colWidths=[2 * inch, 1.5 * inch, 3 * inch], repeatRows=1)
+                t.setStyle(table_style)
+                yield [Paragraph(f"Position: {position}", styles['Heading3']), t, Spacer(1, 12)]
+
+    doc.build_chunks(chunks())
+    progress('laying out', done=len(elections), total=len(elections))
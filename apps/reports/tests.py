@@ -1,7 +1,32 @@
-from django.test import TestCase, Client
+import io
+import json
+import sys
+import tempfile
+import threading
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
+from django.urls import reverse
 from django.utils import timezone
 
+from apps.accounts.demographics import EXPORT_FIELDS, voter_demographics
+from apps.accounts.models import StudentProfile
+from apps.administration.models import AuditLog, AuditLogArchive
+from apps.elections.models import Candidate, Election, ElectionSnapshot, Position, Vote, VoterReceipt
+from apps.reports import artifacts, charts, jobs, narratives, pdf
+from apps.reports.models import ReportArtifact, ReportJob, ReportNarrative
+from apps.reports.utils import candidate_summary, get_election_data
+
 
 class DecoratorTest(TestCase):
     def setUp(self):
@@ -43,3 +68,595 @@ class DecoratorTest(TestCase):
         response = self.client.get('/reports/')
         self.assertEqual(response.status_code, 302)
         self.assertIn('/administration/verify-password/', response.url)
+
+
+class ReportTestCase(TestCase):
+    """Logged-in admin in sudo mode, a closed election and a private artifact store."""
+
+    def setUp(self):
+        cache.clear()
+        artifact_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(artifact_dir.cleanup)
+        self.enterContext(override_settings(REPORT_ARTIFACT_DIR=artifact_dir.name))
+
+        self.user = User.objects.create_user(username='admin', password='password', is_staff=True)
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['last_password_verified_at'] = timezone.now().timestamp()
+        session.save()
+
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name='Council', start_time=now - timedelta(days=2), end_time=now - timedelta(days=1))
+        position = Position.objects.create(name='President', order_on_ballot=1)
+        profile = StudentProfile.objects.create(
+            user=User.objects.create_user(username='cand', first_name='Ana', last_name='Cruz'),
+            student_id='C1', year_level=4)
+        self.candidate = Candidate.objects.create(student_profile=profile, position=position, election=self.election)
+        Vote.objects.create(election=self.election, candidate=self.candidate, position=position, ballot_id=uuid.uuid4())
+
+
+@override_settings(REPORT_JOBS_IN_PROCESS=False)
+class ReportJobTests(ReportTestCase):
+    def request_report(self, kind='ELECTION', **data):
+        return self.client.post(reverse('reports:request_report'), {'kind': kind, **data})
+
+    def test_request_queues_job_without_building_it(self):
+        response = self.request_report(election_id=self.election.pk)
+
+        job = ReportJob.objects.get()
+        self.assertRedirects(response, f"{reverse('reports:hub')}?job={job.pk}")
+        self.assertEqual((job.status, job.params, job.created_by), (ReportJob.Status.PENDING,
+                         {'election_id': self.election.pk}, self.user))
+
+        # Asking again while it is queued does not add a second job
+        self.request_report(election_id=self.election.pk)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_worker_builds_artifact_for_download(self):
+        self.request_report(election_id=self.election.pk)
+        self.request_report('VOTER_DEMOGRAPHICS')
+        call_command('run_report_worker', once=True, stdout=StringIO())
+
+        for job in ReportJob.objects.all():
+            self.assertEqual(job.status, ReportJob.Status.COMPLETED, job.error)
+            status = self.client.get(reverse('reports:report_job_status', args=[job.pk])).json()
+            self.assertTrue(status['finished'])
+
+            response = self.client.get(status['download_url'])
+            self.assertEqual(response['Content-Type'], 'application/pdf')
+            self.assertIn(job.filename, response['Content-Disposition'])
+            self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_in_process_jobs_run_after_commit(self):
+        with override_settings(REPORT_JOBS_IN_PROCESS=True), patch.object(jobs, 'RUN_IN_THREAD', False), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.request_report('CANDIDATE_SUMMARY')
+        self.assertEqual(ReportJob.objects.get().status, ReportJob.Status.COMPLETED)
+
+    def test_failed_job_records_error(self):
+        job = jobs.request_report(ReportJob.Kind.ELECTION, {'election_id': 0}, user=self.user)
+        job = jobs.run_report_job(job.pk)
+        self.assertEqual((job.status, job.error), (ReportJob.Status.FAILED, 'Election not found'))
+        self.assertEqual([p for p in Path(settings.REPORT_ARTIFACT_DIR).rglob('*') if p.is_file()], [])
+
+    def test_job_is_claimed_once(self):
+        job = jobs.request_report(ReportJob.Kind.AUDIT_LOG, {}, user=self.user)
+        self.assertEqual(jobs.claim_next(), job.pk)
+        self.assertIsNone(jobs.claim_next())
+        self.assertIsNone(jobs.run_report_job(job.pk))
+
+    def test_stale_running_job_is_requeued(self):
+        job = jobs.request_report(ReportJob.Kind.AUDIT_LOG, {}, user=self.user)
+        jobs.claim(job.pk)
+        ReportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(minutes=30))
+        self.assertEqual(jobs.requeue_stale(600), 1)
+        self.assertEqual(ReportJob.objects.get().status, ReportJob.Status.PENDING)
+
+    def test_other_admins_jobs_are_hidden(self):
+        other = User.objects.create_user(username='other', is_staff=True)
+        job = jobs.request_report(ReportJob.Kind.AUDIT_LOG, {}, user=other)
+        response = self.client.get(reverse('reports:report_job_status', args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REPORT_JOBS_IN_PROCESS=True)
+class ReportArtifactStoreTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.enterContext(patch.object(jobs, 'RUN_IN_THREAD', False))
+
+    def request(self, kind='ELECTION', **params):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.request_report(kind, params, user=self.user)
+        job.refresh_from_db()
+        return job
+
+    def test_identical_request_is_served_from_store(self):
+        first = self.request(election_id=self.election.pk)
+        self.assertEqual(first.status, ReportJob.Status.COMPLETED, first.error)
+
+        with patch.dict(jobs.BUILDERS, {ReportJob.Kind.ELECTION: None}):
+            second = self.request(election_id=self.election.pk)
+        self.assertEqual((second.status, second.phase), (ReportJob.Status.COMPLETED, 'stored'))
+        self.assertEqual(second.artifact, first.artifact)
+        # The election has closed, so its report is kept permanently
+        self.assertTrue(first.artifact.permanent)
+
+        response = self.client.get(reverse('reports:report_job_download', args=[second.pk]))
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_changed_tally_builds_new_artifact(self):
+        first = self.request(election_id=self.election.pk)
+        voter = StudentProfile.objects.create(
+            user=User.objects.create_user(username='voter'), student_id='V1', year_level=1)
+        ballot_id = uuid.uuid4()
+        with self.captureOnCommitCallbacks(execute=True):
+            VoterReceipt.objects.create(voter=voter, election=self.election, ballot_id=ballot_id, encrypted_choices='x')
+            Vote.objects.create(election=self.election, candidate=self.candidate,
+                                position=self.candidate.position, ballot_id=ballot_id)
+        second = self.request(election_id=self.election.pk)
+
+        self.assertNotEqual(second.artifact, first.artifact)
+        # The older report of the same election is no longer pinned
+        first.artifact.refresh_from_db()
+        self.assertFalse(first.artifact.permanent)
+
+    def test_failed_narrative_is_not_reused(self):
+        with patch('apps.reports.pdf.generate_narrative_report', return_value='Error generating narrative: timeout'):
+            first = self.request(election_id=self.election.pk)
+        self.assertFalse(first.artifact.reusable)
+        self.assertEqual(self.request(election_id=self.election.pk).phase, 'done')
+
+    def test_least_recently_used_artifacts_are_evicted(self):
+        audit_report = self.request('AUDIT_LOG')
+        demographics = self.request('VOTER_DEMOGRAPHICS')
+        election = self.request(election_id=self.election.pk)
+        ReportArtifact.objects.filter(pk=audit_report.artifact_id).update(
+            last_accessed_at=timezone.now() - timedelta(hours=1))
+
+        evicted = artifacts.evict(max_bytes=demographics.artifact.size)
+
+        self.assertEqual(evicted, 1)
+        self.assertEqual(set(ReportArtifact.objects.values_list('kind', flat=True)), {'VOTER_DEMOGRAPHICS', 'ELECTION'})
+        self.assertFalse((Path(settings.REPORT_ARTIFACT_DIR) / audit_report.artifact_path).exists())
+        response = self.client.get(reverse('reports:report_job_download', args=[audit_report.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(ReportArtifact.objects.get(pk=election.artifact_id).permanent)
+
+    @override_settings(REPORT_ARTIFACT_ACCEL_REDIRECT='/protected/reports/')
+    def test_download_handed_to_nginx(self):
+        job = self.request('VOTER_DEMOGRAPHICS')
+        response = self.client.get(reverse('reports:report_job_download', args=[job.pk]))
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/reports/{job.artifact.path}')
+        self.assertEqual(response.content, b'')
+
+
+class ChartTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.results = {
+            f'Position {p}': [{'name': f'Candidate {c}', 'votes': p * c} for c in range(1, 4)]
+            for p in range(1, 4)
+        }
+
+    def test_charts_are_png_bytes_cached_per_position(self):
+        rendered = charts.render_charts(self.results, workers=0)
+        self.assertEqual(list(rendered), list(self.results))
+        self.assertTrue(all(png.startswith(b'\x89PNG') for png in rendered.values()))
+
+        # Only the position whose votes changed is drawn again
+        self.results['Position 2'][0]['votes'] += 1
+        with patch.object(charts, 'render_chart', return_value=b'\x89PNG new') as render:
+            again = charts.render_charts(self.results, workers=0)
+        render.assert_called_once()
+        self.assertEqual(render.call_args.args[0], 'Position 2')
+        self.assertEqual(again['Position 1'], rendered['Position 1'])
+        self.assertEqual(again['Position 2'], b'\x89PNG new')
+
+    def test_style_is_part_of_the_key(self):
+        names, votes = ['A', 'B'], [1, 2]
+        self.assertNotEqual(
+            charts.chart_key('President', names, votes),
+            charts.chart_key('President', names, votes, {**charts.CHART_STYLE, 'color': '#000000'}))
+
+    def test_pool_renders_the_same_charts(self):
+        self.addCleanup(charts._shutdown_pool)
+        pooled = charts.render_charts(self.results, workers=2)
+        cache.clear()
+        self.assertEqual(pooled, charts.render_charts(self.results, workers=0))
+
+    def test_failed_chart_is_left_out(self):
+        with patch.object(charts, 'render_chart', side_effect=[b'\x89PNG', ValueError('bad'), b'\x89PNG']):
+            rendered = charts.render_charts(self.results, workers=0)
+        self.assertEqual(list(rendered), ['Position 1', 'Position 3'])
+
+    def test_benchmark_command(self):
+        self.addCleanup(charts._shutdown_pool)
+        out = StringIO()
+        call_command('benchmark_charts', positions=12, candidates=3, workers=2, stdout=out)
+        self.assertIn('12 positions', out.getvalue())
+        self.assertIn('cached', out.getvalue())
+
+
+class VectorChartTests(ReportTestCase):
+    def build(self):
+        output = io.BytesIO()
+        pdf.build_election_report({'election_id': self.election.pk}, output, lambda *args, **kwargs: None)
+        return output.getvalue()
+
+    def test_vector_report_needs_no_matplotlib(self):
+        blocked = {name: None for name in sys.modules if name.partition('.')[0] == 'matplotlib'}
+        with patch.dict(sys.modules, {**blocked, 'matplotlib': None}):
+            report = self.build()
+        self.assertTrue(report.startswith(b'%PDF'))
+
+    def test_vector_report_is_smaller_than_png_report(self):
+        vector = self.build()
+        with override_settings(REPORT_CHART_BACKEND='matplotlib'):
+            png = self.build()
+        self.assertLess(len(vector), len(png))
+
+    def test_failed_vector_chart_falls_back_to_png(self):
+        results = {'President': [{'name': 'Ana Cruz', 'votes': 3}], 'Secretary': [{'name': 'Ben Uy', 'votes': 0}]}
+        with patch.object(charts, 'vector_chart', side_effect=[ValueError('bad'), charts.vector_chart(
+                'Secretary', ['Ben Uy'], [0])]):
+            flowables = charts.chart_flowables(results, backend='reportlab')
+        self.assertEqual(list(flowables), ['President', 'Secretary'])
+        self.assertEqual(type(flowables['President']).__name__, 'Image')
+        self.assertEqual(type(flowables['Secretary']).__name__, 'Drawing')
+
+    def test_backend_is_part_of_the_report_key(self):
+        params = {'election_id': self.election.pk}
+        with override_settings(REPORT_CHART_BACKEND='matplotlib'):
+            png_key = artifacts.report_key(ReportJob.Kind.ELECTION, params)
+        self.assertNotEqual(artifacts.report_key(ReportJob.Kind.ELECTION, params), png_key)
+
+
+@override_settings(REPORT_NARRATIVE_BACKEND='stub', REPORT_NARRATIVE_TIMEOUT=5)
+class NarrativeCacheTests(ReportTestCase):
+    def data(self):
+        cache.clear()
+        return get_election_data(self.election.pk)
+
+    def test_same_results_are_narrated_once(self):
+        first = narratives.generate_narrative_report(self.data())
+        self.assertIn('Ana Cruz', first)
+        with patch.dict(narratives.BACKENDS, {'stub': Mock(side_effect=AssertionError)}):
+            self.assertEqual(narratives.generate_narrative_report(self.data()), first)
+        self.assertEqual(ReportNarrative.objects.get().election, self.election)
+
+    def test_key_covers_results_model_and_prompt_version(self):
+        summary = narratives.data_summary(self.data())
+        key = narratives.narrative_key(summary)
+        self.assertNotEqual(key, narratives.narrative_key(summary.replace('1 votes', '2 votes')))
+        self.assertNotEqual(key, narratives.narrative_key(summary, model='gemini-2.5-pro'))
+        self.assertNotEqual(key, narratives.narrative_key(summary, prompt_version=narratives.NARRATIVE_PROMPT_VERSION + 1))
+
+    @override_settings(REPORT_NARRATIVE_TIMEOUT=0.05)
+    def test_slow_backend_falls_back_to_earlier_narrative(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        slow = Mock(side_effect=lambda prompt, summary: release.wait(5) and 'late')
+
+        with patch.dict(narratives.BACKENDS, {'stub': slow}):
+            self.assertTrue(narratives.generate_narrative_report(self.data()).startswith(narratives.NARRATIVE_ERROR))
+
+        earlier = narratives.generate_narrative_report(self.data())
+        Vote.objects.create(election=self.election, candidate=self.candidate,
+                            position=self.candidate.position, ballot_id=uuid.uuid4())
+        with patch.dict(narratives.BACKENDS, {'stub': slow}):
+            fallback = narratives.generate_narrative_report(self.data())
+        self.assertTrue(fallback.startswith(narratives.NARRATIVE_STALE))
+        self.assertTrue(fallback.endswith(earlier))
+        self.assertTrue(narratives.narrative_failed(fallback))
+        self.assertEqual(ReportNarrative.objects.count(), 1)
+
+    def test_admin_regenerates_and_drops_stored_reports(self):
+        with patch.object(jobs, 'RUN_IN_THREAD', False), self.captureOnCommitCallbacks(execute=True):
+            job = jobs.request_report(ReportJob.Kind.ELECTION, {'election_id': self.election.pk}, user=self.user)
+        job.refresh_from_db()
+        narrative = ReportNarrative.objects.get()
+        self.user.is_superuser = True
+        self.user.save()
+
+        with patch.dict(narratives.BACKENDS, {'stub': Mock(return_value='Fresh narrative')}):
+            response = self.client.post(reverse('admin:reports_reportnarrative_changelist'), {
+                'action': 'regenerate', '_selected_action': [narrative.pk]})
+        self.assertEqual(response.status_code, 302)
+        narrative.refresh_from_db()
+        self.assertEqual(narrative.text, 'Fresh narrative')
+        self.assertFalse(ReportArtifact.objects.filter(pk=job.artifact_id).exists())
+
+
+class DemographicsTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        Status = StudentProfile.VerificationStatus
+        for i, (course, year, status, eligible) in enumerate([
+            ('BSIT', 1, Status.VERIFIED, True),
+            ('BSIT', 1, Status.PENDING, False),
+            ('BSIT', 2, Status.REJECTED, False),
+            ('BSBA', 2, Status.VERIFIED, True),
+        ]):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'student{i}'), student_id=f'S{i}',
+                course=course, year_level=year, verification_status=status, is_eligible_to_vote=eligible)
+        cache.clear()
+
+    def test_one_grouped_query(self):
+        eligible = StudentProfile.objects.filter(is_eligible_to_vote=True).count()
+        with self.assertNumQueries(1):
+            demographics = voter_demographics()
+        self.assertEqual(demographics['summary'], {
+            'total': 5, 'verified': 3, 'pending': 1, 'rejected': 1, 'eligible': eligible})
+
+        by_course = {item['course']: item for item in demographics['by_course']}
+        self.assertLessEqual({'BSCS', 'BSIT', 'BSBA', 'BSHM'}, set(by_course))
+        self.assertEqual((by_course['BSIT']['total'], by_course['BSIT']['pending']), (3, 1))
+        self.assertEqual(by_course['BSHM']['total'], 0)
+        year_two = next(item for item in demographics['by_year_level'] if item['year_level'] == 2)
+        self.assertEqual((year_two['label'], year_two['total'], year_two['rejected']), ('2nd Year', 2, 1))
+
+        # Cached until a voter changes
+        with self.assertNumQueries(0):
+            voter_demographics()
+
+    def test_csv_and_json_export(self):
+        response = self.client.get(reverse('reports:demographics_export', args=['csv']))
+        lines = response.content.decode().splitlines()
+        self.assertEqual(lines[0].split(','), list(EXPORT_FIELDS))
+        self.assertIn('BSIT,Bachelor of Science in Information Technology,1,1st Year,2,1,1,0,1', lines)
+
+        data = self.client.get(reverse('reports:demographics_export', args=['json'])).json()
+        self.assertEqual(data['summary']['total'], 5)
+        self.assertEqual(len(data['rows']), len(lines) - 1)
+
+        response = self.client.get(reverse('reports:demographics_export', args=['xml']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_pdf_uses_the_cached_aggregate(self):
+        voter_demographics()
+        output = io.BytesIO()
+        with self.assertNumQueries(0):
+            pdf.build_voter_demographics_report({}, output, lambda *args, **kwargs: None)
+        self.assertTrue(output.getvalue().startswith(b'%PDF'))
+
+
+class CandidateSummaryTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.other = Election.objects.create(
+            name='Senate', start_time=now - timedelta(days=30), end_time=now - timedelta(days=29))
+        self.empty = Election.objects.create(
+            name='By-election', start_time=now - timedelta(days=60), end_time=now - timedelta(days=59))
+        for order, name in enumerate(['Governor', 'Auditor', 'Secretary'], 2):
+            position = Position.objects.create(name=name, order_on_ballot=order)
+            for i in range(2):
+                profile = StudentProfile.objects.create(
+                    user=User.objects.create_user(username=f'{name}{i}', first_name=name, last_name=str(i)),
+                    student_id=f'{name}{i}', year_level=3)
+                Candidate.objects.create(student_profile=profile, position=position, election=self.other,
+                                         biography='x' * 500 if i else '')
+
+    def test_grouped_from_one_candidate_query(self):
+        with self.assertNumQueries(2):
+            elections, groups = candidate_summary()
+            groups = list(groups)
+        self.assertEqual([election.name for election, _ in groups], ['Council', 'Senate', 'By-election'])
+        senate = dict(groups[1][1])
+        self.assertEqual(list(senate), ['Governor', 'Auditor', 'Secretary'])
+        self.assertEqual([c['name'] for c in senate['Auditor']], ['Auditor 0', 'Auditor 1'])
+        self.assertEqual(senate['Auditor'][0]['party'], 'Independent')
+        self.assertEqual(len(senate['Auditor'][1]['platform']), 200)
+        self.assertEqual(groups[2][1], [])
+
+    def test_election_filter(self):
+        elections, groups = candidate_summary(self.other.pk)
+        self.assertEqual([election for election, _ in groups], [self.other])
+
+        with self.captureOnCommitCallbacks(execute=True), patch.object(jobs, 'RUN_IN_THREAD', False):
+            self.client.post(reverse('reports:request_report'), {'kind': 'CANDIDATE_SUMMARY', 'election_id': self.other.pk})
+        job = ReportJob.objects.get()
+        self.assertEqual(job.params, {'election_id': self.other.pk})
+        self.assertEqual(job.filename, f'candidate_summary_report_{self.other.pk}.pdf')
+
+    def test_pdf_is_laid_out_in_chunks(self):
+        output = io.BytesIO()
+        with patch.object(pdf.ChunkedDocTemplate, 'build', side_effect=AssertionError):
+            pdf.build_candidate_summary_report({}, output, lambda *args, **kwargs: None)
+        self.assertTrue(output.getvalue().startswith(b'%PDF'))
+
+        with self.assertRaises(pdf.ReportError):
+            pdf.build_candidate_summary_report({'election_id': 0}, io.BytesIO(), lambda *args, **kwargs: None)
+
+
+class AuditReportTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        start = timezone.make_aware(datetime(2025, 3, 1, 12))
+        AuditLog.objects.bulk_create(
+            AuditLog(user=self.user, action='LOGIN' if i % 5 else 'VOTE_CAST',
+                     details=f'entry {i} <b>', timestamp=start + timedelta(hours=i))
+            for i in range(250))
+
+    def build(self, params):
+        calls = []
+        output = io.BytesIO()
+        with patch.object(pdf, 'AUDIT_REPORT_CHUNK_ROWS', 100):
+            pdf.build_audit_log_report(params, output, lambda phase, done=None, total=None: calls.append((done, total)))
+        self.assertTrue(output.getvalue().startswith(b'%PDF'))
+        return calls
+
+    def test_whole_log_is_laid_out_in_chunks(self):
+        calls = self.build({})
+        self.assertEqual([call for call in calls if call[0] is not None], [(100, 250), (200, 250), (250, 250)])
+
+    def test_filters(self):
+        calls = self.build({'action': 'VOTE_CAST', 'date_from': '2025-03-02', 'date_to': '2025-03-03'})
+        # Every fifth entry among hours 12-59 after the first one
+        self.assertEqual(calls[-1], (9, 9))
+
+    def test_archived_entries(self):
+        AuditLogArchive.objects.bulk_create(
+            AuditLogArchive(id=10_000 + i, action='LOGIN', details=f'old {i}',
+                            timestamp=timezone.make_aware(datetime(2024, 1, 1, 12)) + timedelta(hours=i))
+            for i in range(30))
+        calls = self.build({'source': 'archive'})
+        self.assertEqual(calls[-1], (30, 30))
+
+        self.client.post(reverse('reports:request_report'), {'kind': 'AUDIT_LOG', 'source': 'archive'})
+        self.assertEqual(ReportJob.objects.get().params, {'source': 'archive'})
+
+    def test_hub_passes_filters_to_the_job(self):
+        url = reverse('reports:request_report')
+        self.client.post(url, {'kind': 'AUDIT_LOG', 'date_from': '2025-03-02', 'action': '', 'user': ' '})
+        self.assertEqual(ReportJob.objects.get().params, {'date_from': '2025-03-02'})
+
+        self.client.post(url, {'kind': 'AUDIT_LOG', 'date_to': '03/02/2025'})
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_hub_rejects_impossible_dates(self):
+        response = self.client.post(reverse('reports:request_report'), {'kind': 'AUDIT_LOG', 'date_from': '2024-02-30'})
+        self.assertRedirects(response, reverse('reports:hub'), fetch_redirect_response=False)
+        self.assertFalse(ReportJob.objects.exists())
+
+
+@override_settings(REPORT_CHART_BACKEND='reportlab')
+class ReportBenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / 'reports.json'
+
+    def benchmark(self, **options):
+        out = StringIO()
+        call_command('benchmark_reports', voters=30, positions=2, candidates=3, audit_entries=40,
+                     baseline=str(self.baseline), force=True, stdout=out, **options)
+        return out.getvalue()
+
+    def test_baseline_is_written_and_compared(self):
+        self.benchmark(save_baseline=True)
+        baseline = json.loads(self.baseline.read_text())
+        self.assertEqual(baseline['size']['voters'], 30)
+        self.assertEqual(
+            list(baseline['reports']), ['election', 'voter_demographics', 'candidate_summary', 'audit_log'])
+        self.assertEqual(list(baseline['reports']['election']),
+                         ['data', 'charts', 'narrative', 'pdf', 'total'])
+        self.assertGreater(baseline['reports']['election']['data']['queries'], 0)
+
+        # Seeded data is removed again
+        self.assertFalse(Election.objects.exists())
+        self.assertFalse(StudentProfile.objects.exists())
+        self.assertFalse(AuditLog.objects.filter(action='BENCHMARK').exists())
+
+        self.assertIn('queries', self.benchmark())
+
+    def test_regression_against_baseline(self):
+        self.benchmark(save_baseline=True)
+        baseline = json.loads(self.baseline.read_text())
+        baseline['reports']['election']['data']['queries'] -= 1
+        self.baseline.write_text(json.dumps(baseline))
+
+        with self.assertRaisesMessage(CommandError, 'election/data'):
+            self.benchmark(fail_on_regression=True)
+
+    def test_refuses_to_run_without_debug(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_reports', stdout=StringIO())
+
+
+class ResultsBundleTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        vice = Position.objects.create(name='Vice President', order_on_ballot=2)
+        profile = StudentProfile.objects.create(
+            user=User.objects.create_user(username='vice', first_name='Ben', last_name='Reyes'),
+            student_id='C2', year_level=3, course='BSIT')
+        self.vice = Candidate.objects.create(student_profile=profile, position=vice, election=self.election)
+        # Two more ballots: one for both candidates, one for the vice president only
+        for i, chosen in enumerate([[self.candidate, self.vice], [self.vice]]):
+            ballot_id = uuid.uuid4()
+            voter = StudentProfile.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'), student_id=f'V{i}', year_level=1, course='BSCS')
+            with self.captureOnCommitCallbacks(execute=True):
+                VoterReceipt.objects.create(voter=voter, election=self.election, ballot_id=ballot_id)
+            for candidate in chosen:
+                Vote.objects.create(election=self.election, candidate=candidate,
+                                    position=candidate.position, ballot_id=ballot_id)
+
+    def download(self):
+        response = self.client.get(reverse('reports:results_bundle'), {'election': self.election.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn(f'election_{self.election.pk}_results.zip', response['Content-Disposition'])
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_bundle(self):
+        import numpy
+
+        archive = self.download()
+        schema = json.loads(archive.read('schema.json'))
+        self.assertEqual(schema['election']['id'], self.election.pk)
+        self.assertEqual(schema['tables']['candidates']['rows'], 2)
+
+        rows = archive.read('candidates.csv').decode().splitlines()
+        self.assertEqual(rows[0], 'position_id,position,order_on_ballot,candidate_id,name,partylist,votes,share,is_winner')
+        self.assertTrue(rows[1].endswith('Ana Cruz,,2,1.0,true'))
+        self.assertTrue(rows[2].endswith('Ben Reyes,,2,1.0,true'))
+
+        def array(path):
+            return numpy.load(io.BytesIO(archive.read(path)), allow_pickle=False)
+
+        columns = {c['name']: c for c in schema['tables']['candidates']['columns']}
+        self.assertEqual(array(columns['votes']['array']).tolist(), [2, 2])
+        self.assertEqual(array(columns['name']['array']).tolist(), ['Ana Cruz', 'Ben Reyes'])
+        self.assertEqual(array(columns['is_winner']['array']).dtype, numpy.bool_)
+
+        # One ballot chose both; each also has a ballot of their own
+        self.assertEqual(array('npy/incidence.npy').tolist(), [[2, 1], [1, 2]])
+
+        turnout = {c['name']: c for c in schema['tables']['turnout']['columns']}
+        self.assertEqual(array(turnout['cumulative_ballots']['array']).tolist()[-1], 2)
+        participation = archive.read('participation.csv').decode()
+        self.assertIn('course,BSCS,Bachelor of Science in Computer Science,2,2,1.0', participation)
+
+    def test_pair_counts_are_kept_in_snapshot(self):
+        from apps.elections.services import get_candidate_pairs
+
+        a, b = self.candidate.pk, self.vice.pk
+        pairs = get_candidate_pairs(self.election)
+        self.assertEqual(pairs, [[a, a, 2], [a, b, 1], [b, b, 2]])
+        self.assertEqual(ElectionSnapshot.objects.get(election=self.election).candidate_pairs, pairs)
+        # Later bundles read the snapshot row instead of the votes
+        with self.assertNumQueries(1):
+            self.assertEqual(get_candidate_pairs(self.election), pairs)
+
+    def test_comparison_snapshot_leaves_pair_counts_to_bundle(self):
+        from apps.elections.services import get_candidate_pairs, get_comparative_stats
+
+        get_comparative_stats()
+        snapshot = ElectionSnapshot.objects.get(election=self.election)
+        self.assertIsNone(snapshot.candidate_pairs)
+        pairs = get_candidate_pairs(self.election)
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.candidate_pairs, pairs)
+
+    def test_pair_count_query_uses_ballot_index(self):
+        votes = Vote.objects.filter(election_id__in=[self.election.pk], ballot_id__isnull=False).order_by(
+            'election_id', 'ballot_id')
+        self.assertIn('vote_election_ballot_idx', votes.explain())
+
+    def test_unknown_election(self):
+        response = self.client.get(reverse('reports:results_bundle'), {'election': 999})
+        self.assertEqual(response.status_code, 404)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bundle.zip'
+            call_command('export_results_bundle', self.election.pk, output=str(path), stdout=StringIO())
+            with zipfile.ZipFile(path) as archive:
+                self.assertIn('schema.json', archive.namelist())
+                self.assertIn('npy/incidence.npy', archive.namelist())
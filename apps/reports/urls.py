@@ -5,16 +5,19 @@ app_name = 'reports'
 
 urlpatterns = [
     path('', views.reports_hub, name='hub'),
-    path('election/<int:election_id>/pdf/',
-         views.generate_election_report,
-         name='generate_election_report'),
-    path('voters/demographics/pdf/',
-         views.generate_voter_demographics_report,
-         name='generate_voter_demographics_report'),
-    path('audit-log/pdf/',
-         views.generate_audit_log_report,
-         name='generate_audit_log_report'),
-    path('candidates/summary/pdf/',
-         views.generate_candidate_summary_report,
-         name='generate_candidate_summary_report'),
+    path('jobs/',
+         views.request_report,
+         name='request_report'),
+    path('jobs/<int:pk>/',
+         views.report_job_status,
+         name='report_job_status'),
+    path('jobs/<int:pk>/download/',
+         views.report_job_download,
+         name='report_job_download'),
+    path('demographics/export/<str:fmt>/',
+         views.demographics_export,
+         name='demographics_export'),
+    path('results/bundle/',
+         views.results_bundle,
+         name='results_bundle'),
 ]
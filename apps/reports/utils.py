@@ -1,27 +1,39 @@
-import io
-import base64
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models.functions import Substr
+
 from apps.elections.models import Election, Vote, VoterReceipt, Candidate, Position
 from apps.accounts.models import StudentProfile
-from apps.chatbot.services import get_gemini_api_key, GEMINI_AVAILABLE
-from apps.core.logging import logger
+from apps.core.cache import CANDIDATES, VOTERS, election_tally, versioned_key
+from apps.core.services.single_flight import single_flight
+from .charts import chart_flowables
+
+# Seconds computed report data stays cached
+REPORT_DATA_TTL = 60
 
-if GEMINI_AVAILABLE:
-    import google.generativeai as genai
-else:
-    genai = None
+# Characters of a candidate's biography shown in the candidate summary
+PLATFORM_CHARS = 200
+
+CANDIDATE_SUMMARY_CHUNK_SIZE = 2000
 
 
 def get_election_data(election_id):
     """
     Fetches comprehensive data for a specific election.
+    Concurrent requests for the same election share one computation.
     """
     try:
         election = Election.objects.get(pk=election_id)
     except Election.DoesNotExist:
         return None
 
+    key, _ = versioned_key(
+        'report:election-data', [VOTERS, CANDIDATES, election_tally(election.pk)], election.pk)
+    return single_flight(key, lambda: _compute_election_data(election), REPORT_DATA_TTL)
+
+
+def _compute_election_data(election):
     # Turnout Stats
     eligible_voters = StudentProfile.objects.filter(
         is_eligible_to_vote=True).count()
@@ -68,128 +80,56 @@ def get_election_data(election_id):
 
 def generate_charts(election_data):
     """
-    Generates bar charts for each position using matplotlib (OO interface).
-    Returns a dictionary of {position_name: base64_image_string}.
+    Bar charts for each position of an election.
+    Returns a dictionary of {position_name: flowable}; see ``charts``.
     """
-    charts = {}
-    results = election_data['results']
+    return chart_flowables(election_data['results'])
 
-    for position, candidates in results.items():
-        if not candidates:
-            continue
-
-        try:
-            names = [c['name'] for c in candidates]
-            votes = [c['votes'] for c in candidates]
-
-            # Create figure using OO interface (no pyplot)
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-
-            # Plot
-            bars = ax.bar(names, votes, color='#2563eb')
-
-            # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width() / 2., height,
-                        f'{int(height)}',
-                        ha='center', va='bottom')
-
-            ax.set_title(f'Results for {position}', fontsize=14, pad=20)
-            ax.set_ylabel('Votes Cast')
-            ax.set_xlabel('Candidates')
-            ax.grid(True, axis='y', linestyle='--', alpha=0.7)
-
-            # Rotate x-axis labels if many candidates
-            if len(names) > 3:
-                fig.autofmt_xdate(rotation=45)
-
-            fig.tight_layout()
-
-            # Save to buffer
-            buffer = io.BytesIO()
-            canvas.print_png(buffer)
-            buffer.seek(0)
-            image_png = buffer.getvalue()
-            buffer.close()
-
-            # Encode
-            graphic = base64.b64encode(image_png).decode('utf-8')
-            charts[position] = graphic
-
-        except Exception as e:
-            logger.error(
-                f"Error generating chart for {position}: {
-                    str(e)}", category="REPORT")
-            continue
 
-    return charts
-
-
-def generate_narrative_report(election_data):
-    """
-    Uses Gemini API to generate a factual, unbiased narrative report.
+def candidate_summary(election_id=None):
     """
-    if not GEMINI_AVAILABLE or not genai:
-        return "AI Narrative generation unavailable: Google Generative AI library not installed."
-
-    api_key = get_gemini_api_key()
-    if not api_key or api_key == 'YOUR_API_KEY_HERE':
-        return "AI Narrative generation unavailable: API Key not configured."
-
-    election = election_data['election']
-    results = election_data['results']
-
-    # Build data string for the prompt
-    data_summary = f"""
-    ELECTION: {election.name}
-    STATUS: {election.status}
-    TURNOUT: {election_data['ballots_cast']} out of {election_data['eligible_voters']} eligible voters ({election_data['turnout_percentage']}%)
-
-    RESULTS BY POSITION:
+    Candidates for the candidate summary report, of every election or only
+    of ``election_id``. Returns ``(elections, groups)``: the elections in
+    report order and an iterator of ``(election, [(position_name,
+    [candidate dicts])])``, with an empty list for elections without
+    candidates. Candidates come from one ordered query, read in chunks and
+    grouped as they arrive, whatever the number of elections and positions.
     """
-
-    for position, candidates in results.items():
-        data_summary += f"\nPOSITION: {position}\n"
-        for i, c in enumerate(candidates, 1):
-            data_summary += f"{i}. {
-                c['name']} ({
-                c['party']}): {
-                c['votes']} votes ({
-                c['percentage']:.1f}%)\n"
-
-    # Construct the prompt
-    disclaimer = (
-        "**DISCLAIMER: This narrative report was generated by AI based "
-        "on the official election data provided.**"
+    elections = Election.objects.order_by('-start_time', 'pk')
+    candidates = Candidate.objects.order_by(
+        '-election__start_time', 'election_id', 'position__order_on_ballot', 'position_id', 'pk')
+    if election_id is not None:
+        elections = elections.filter(pk=election_id)
+        candidates = candidates.filter(election_id=election_id)
+
+    rows = (
+        candidates
+        .annotate(platform=Substr('biography', 1, PLATFORM_CHARS))
+        .values_list('election_id', 'position_id', 'position__name',
+                     'student_profile__user__first_name', 'student_profile__user__last_name',
+                     'partylist__name', 'platform')
+        .iterator(chunk_size=CANDIDATE_SUMMARY_CHUNK_SIZE)
     )
-
-    prompt = f"""
-    You are an impartial election analyst for VoteWise. Write a formal, factual, and unbiased narrative report for the election described below.
-
-    DATA:
-    {data_summary}
-
-    INSTRUCTIONS:
-    1. Start with an "Executive Summary" section summarizing the overall turnout and key outcomes.
-    2. Provide a "Results Analysis" section breaking down the results by position. Highlight the winners and the margins of victory. Mention if races were close or decisive.
-    3. Include a "Conclusion" section wrapping up the report.
-    4. TONE: Professional, objective, data-driven. Avoid emotional language or bias.
-    5. FORMAT: Use Markdown formatting (headers, bullet points).
-    6. DISCLAIMER: You MUST begin the report with the following exact disclaimer in bold: "{disclaimer}"
-
-    Do not include any information not present in the data provided.
-    """
-
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        logger.error(
-            f"Error generating narrative: {
-                str(e)}", category="REPORT")
-        return f"Error generating narrative: {str(e)}"
+    elections = list(elections)
+    return elections, _group_candidates(elections, rows)
+
+
+def _group_candidates(elections, rows):
+    # Both are in the same order, so candidates are merged into elections
+    by_election = groupby(rows, key=itemgetter(0))
+    current = next(by_election, None)
+    for election in elections:
+        positions = []
+        if current is not None and current[0] == election.pk:
+            for _, group in groupby(current[1], key=itemgetter(1)):
+                group = list(group)
+                positions.append((group[0][2], [
+                    {
+                        'name': f"{first} {last}".strip(),
+                        'party': party or "Independent",
+                        'platform': platform,
+                    }
+                    for _, _, _, first, last, party, platform in group
+                ]))
+            current = next(by_election, None)
+        yield election, positions
@@ -33,3 +33,12 @@ tmp_upload_dir = None
 
 # Reload on code changes (disable in production)
 reload = os.getenv('GUNICORN_RELOAD', 'False') == 'True'
+
+
+# Server hooks
+def worker_exit(server, worker):
+    """Write audit entries still queued in the exiting worker."""
+    import sys
+    audit = sys.modules.get('apps.administration.audit')
+    if audit is not None:
+        audit.flush()
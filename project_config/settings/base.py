@@ -164,3 +164,46 @@ EMAIL_HOST_USER = ''
 EMAIL_HOST_PASSWORD = ''
 DEFAULT_FROM_EMAIL = 'VoteWise <noreply@votewise.local>'
 
+
+# Audit Log Writer (apps.administration.audit)
+# Entries are written inline unless AUDIT_LOG_ASYNC is enabled, in which case
+# a background thread batches them; failed batches are spooled to disk.
+AUDIT_LOG_ASYNC = False
+AUDIT_LOG_BATCH_SIZE = 100
+AUDIT_LOG_FLUSH_INTERVAL = 2  # seconds
+AUDIT_LOG_SPOOL_DIR = os.path.join(BASE_DIR, 'logs', 'audit_spool')
+# manage.py prune_audit_log moves older entries to the archive table and,
+# when AUDIT_LOG_ARCHIVE_RETENTION_DAYS is set, deletes old archived ones
+AUDIT_LOG_RETENTION_DAYS = 180
+AUDIT_LOG_ARCHIVE_RETENTION_DAYS = None  # keep archived entries forever
+
+
+# Voter Imports (apps.administration.jobs)
+# Uploaded registrar files are kept here until their background job finishes;
+# interrupted imports are resumed from them by manage.py run_background_jobs
+VOTER_IMPORT_DIR = os.path.join(BASE_DIR, 'private', 'imports')
+
+
+# Report Jobs (apps.reports.jobs)
+# PDFs are built by manage.py run_report_worker; with REPORT_JOBS_IN_PROCESS
+# a job runs in a thread of the web process instead (no worker needed).
+# Artifacts are served only through the reports views, never as media.
+REPORT_JOBS_IN_PROCESS = True
+REPORT_ARTIFACT_DIR = os.path.join(BASE_DIR, 'private', 'reports')
+# Reports are stored by a hash of their inputs and reused for identical
+# requests; least recently downloaded ones are evicted beyond this size
+# (reports of closed elections are kept regardless)
+REPORT_ARTIFACT_MAX_BYTES = 512 * 1024 * 1024
+# Internal nginx location aliasing REPORT_ARTIFACT_DIR; when set, downloads
+# are handed to nginx with X-Accel-Redirect instead of streamed by Django
+REPORT_ARTIFACT_ACCEL_REDIRECT = None
+# Narratives of election results are stored and reused for identical
+# results (apps.reports.narratives); 'stub' writes them without the API.
+# A slower answer falls back to the election's last stored narrative.
+REPORT_NARRATIVE_BACKEND = 'gemini'
+REPORT_NARRATIVE_TIMEOUT = 30
+# 'reportlab' draws vector charts into the PDF; 'matplotlib' embeds PNGs
+REPORT_CHART_BACKEND = 'reportlab'
+# Processes rendering the matplotlib charts of an election report in parallel
+# (apps.reports.charts); 0 or 1 renders them in the building process
+REPORT_CHART_WORKERS = min(4, os.cpu_count() or 1)
@@ -142,13 +142,33 @@ ADMINS = [
 
 MANAGERS = ADMINS
 
-# Cache configuration (optional - uncomment if using Redis)
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-#         'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'),
-#     }
-# }
+# Cache configuration
+# A shared cache lets gunicorn workers share cached dashboard/report data and
+# coalesce identical expensive computations (single-flight locks). Without
+# REDIS_URL each worker falls back to its own in-memory cache.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+
+# Audit entries are batched off the request path (see apps.administration.audit)
+AUDIT_LOG_ASYNC = os.getenv('AUDIT_LOG_ASYNC', 'True') == 'True'
+
+# Must be on the same host as manage.py run_background_jobs
+VOTER_IMPORT_DIR = os.getenv('VOTER_IMPORT_DIR', VOTER_IMPORT_DIR)
+
+# Reports are built by the votewise-reports worker service
+REPORT_JOBS_IN_PROCESS = os.getenv('REPORT_JOBS_IN_PROCESS', 'False') == 'True'
+REPORT_ARTIFACT_DIR = os.getenv('REPORT_ARTIFACT_DIR', REPORT_ARTIFACT_DIR)
+REPORT_ARTIFACT_MAX_BYTES = int(os.getenv('REPORT_ARTIFACT_MAX_BYTES', REPORT_ARTIFACT_MAX_BYTES))
+REPORT_NARRATIVE_TIMEOUT = int(os.getenv('REPORT_NARRATIVE_TIMEOUT', REPORT_NARRATIVE_TIMEOUT))
+REPORT_CHART_BACKEND = os.getenv('REPORT_CHART_BACKEND', REPORT_CHART_BACKEND)
+REPORT_CHART_WORKERS = int(os.getenv('REPORT_CHART_WORKERS', REPORT_CHART_WORKERS))
+# Matches the internal location in deploy/nginx.conf
+REPORT_ARTIFACT_ACCEL_REDIRECT = os.getenv('REPORT_ARTIFACT_ACCEL_REDIRECT', '/protected/reports/')
 
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'